@@ -8,11 +8,15 @@ import json
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import time
-from huggingface_hub import InferenceClient
 
 class TitanicAICopilot:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, data_version: Optional[str] = None, cube=None):
         self.df = df
+        self.data_version = data_version
+        if cube is None:
+            from survival_cube import SurvivalCube
+            cube = SurvivalCube.from_frame(df)
+        self.cube = cube
         self.current_context = "dashboard"
         self.conversation_history = []
         self.hf_token = os.getenv('HUGGINGFACE_TOKEN')
@@ -20,6 +24,7 @@ class TitanicAICopilot:
         # Initialize Hugging Face client if token exists
         if self.hf_token:
             print(f"✅ HuggingFace token available: {self.hf_token[:10]}...")
+            from huggingface_hub import InferenceClient
             self.hf_client = InferenceClient(api_key=self.hf_token)
             self.hf_enabled = True
         else:
@@ -35,6 +40,12 @@ class TitanicAICopilot:
     
     def setup_knowledge_base(self):
         """Calculate REAL statistics from your dataset"""
+        # Counts and survival rates come from the precomputed survival cube
+        sex_counts = self.cube.counts_by('Sex')
+        class_counts = self.cube.counts_by('Pclass')
+        class_rates = self.cube.rates('Pclass')
+        sex_rates = self.cube.rates('Sex')
+        
         # Overall stats
         self.stats = {
             'overall': {
@@ -42,21 +53,18 @@ class TitanicAICopilot:
                 'survival_rate': float(self.df['Survived'].mean() * 100),
                 'average_age': float(self.df['Age'].mean()),
                 'average_fare': float(self.df['Fare'].mean()),
-                'male_count': int(len(self.df[self.df['Sex'] == 'male'])),
-                'female_count': int(len(self.df[self.df['Sex'] == 'female'])),
-                'first_class': int(len(self.df[self.df['Pclass'] == 1])),
-                'second_class': int(len(self.df[self.df['Pclass'] == 2])),
-                'third_class': int(len(self.df[self.df['Pclass'] == 3]))
+                'male_count': sex_counts.get('male', 0),
+                'female_count': sex_counts.get('female', 0),
+                'first_class': class_counts.get(1, 0),
+                'second_class': class_counts.get(2, 0),
+                'third_class': class_counts.get(3, 0)
             },
             'survival_by': {
                 'class': {
-                    1: float(self.df[self.df['Pclass'] == 1]['Survived'].mean() * 100),
-                    2: float(self.df[self.df['Pclass'] == 2]['Survived'].mean() * 100),
-                    3: float(self.df[self.df['Pclass'] == 3]['Survived'].mean() * 100)
+                    pclass: float(class_rates.get(pclass, np.nan) * 100) for pclass in (1, 2, 3)
                 },
                 'gender': {
-                    'male': float(self.df[self.df['Sex'] == 'male']['Survived'].mean() * 100),
-                    'female': float(self.df[self.df['Sex'] == 'female']['Survived'].mean() * 100)
+                    sex: float(sex_rates.get(sex, np.nan) * 100) for sex in ('male', 'female')
                 }
             },
             'model_info': {
@@ -81,21 +89,21 @@ class TitanicAICopilot:
         except:
             self.stats['age_groups'] = {}
         
-        # Family stats
-        self.df['FamilySize'] = self.df['SibSp'] + self.df['Parch'] + 1
+        # Family stats: travelling alone is FamilySize == 1
+        family_counts, family_survived, family_labelled = self.cube.rollup(['FamilySize'])
+        alone = np.array(self.cube.labels['FamilySize']) == 1
         self.stats['family'] = {
-            'alone_survival': float(self.df[self.df['FamilySize'] == 1]['Survived'].mean() * 100),
-            'with_family_survival': float(self.df[self.df['FamilySize'] > 1]['Survived'].mean() * 100),
-            'alone_count': int(len(self.df[self.df['FamilySize'] == 1]))
+            'alone_survival': float(family_survived[alone].sum() / family_labelled[alone].sum() * 100),
+            'with_family_survival': float(family_survived[~alone].sum() / family_labelled[~alone].sum() * 100),
+            'alone_count': int(family_counts[alone].sum())
         }
         
         # Calculate survival by embarked
-        if 'Embarked' in self.df.columns:
-            embarked_stats = {}
-            for port in ['C', 'Q', 'S']:
-                if port in self.df['Embarked'].values:
-                    embarked_stats[port] = float(self.df[self.df['Embarked'] == port]['Survived'].mean() * 100)
-            self.stats['survival_by']['embarked'] = embarked_stats
+        if 'Embarked' in self.cube.dimensions:
+            embarked_rates = self.cube.rates('Embarked')
+            self.stats['survival_by']['embarked'] = {
+                port: float(embarked_rates[port] * 100) for port in ['C', 'Q', 'S'] if port in embarked_rates
+            }
     
     def setup_app_guide(self):
         """Guide for navigating the app"""
@@ -2,135 +2,283 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
+import multiprocessing
+import itertools
+import shutil
+import tempfile
 from flask import Flask, jsonify, request
-import pandas as pd
-import numpy as np
 from flask_cors import CORS
-from sklearn.ensemble import RandomForestClassifier
-from supabase_client import get_supabase
+from data_sources import get_data_source, CSVSource, PASSENGER_TABLE
+from snapshot import source_fingerprint, load_or_build
+import data_cleaning
+from data_cleaning import clean_titanic_data, compact_frame, memory_report
 from copilot_routes import copilot_bp, init_copilot
-import os
+from model_registry import ModelRegistry, validate_training_spec
+from training_jobs import TrainingJobQueue, ModelNotReady, MODEL_WAIT_SECONDS
+from dataset_store import DatasetStore, DeltaSync
+from warmup import WarmUp, STARTUP_MODE
+from response_cache import ResponseCache
+from compression import choose_encoding, compress_stream
+from survival_cube import SurvivalCube, CUBE_METRICS
+from comoments import CoMomentAccumulator
+from binning import BinningIndex
+from quantile_sketch import SummarySketch, summary_mode
+from json_provider import FrameJSONProvider
+from row_blocks import DataPages, decode_cursor
+from data_index import DataIndex, DataQuery
+from data_export import EXPORT_FORMATS, export_stream
+from predictor import SurvivalPredictor, PASSENGER_DEFAULTS, REQUIRED_FIELDS, PREDICT_MAX_BATCH
+from bulk_scoring import (MANIFEST_FORMATS, RESULT_FORMATS, read_manifest, check_manifest_columns,
+                          score_manifest, encode_results)
+from predict_batcher import PredictBatcher
+from prediction_table import PREDICT_LOOKUP, PredictionTables
+from response_formats import FORMATS, FormatNotAvailable, negotiate_format, columnar, records_frame, arrow_stream
 
 
 app = Flask(__name__)
+# jsonify() serializes frames, Series and NumPy values column-wise (NaN as null)
+app.json = FrameJSONProvider(app)
 CORS(app)
 
-# Initialize Supabase client
-supabase = get_supabase()
-
-# Load and clean the dataset
-#df = pd.read_csv('train.csv')
+# Tables come from Supabase, CSV, Parquet or SQLite depending on DATA_SOURCE
+data_source = get_data_source()
+# train.csv next to the app is the fallback whenever the configured source is unavailable
+fallback_source = CSVSource()
 
-def load_data_from_supabase():
-    """Load Titanic data from Supabase instead of CSV"""
+def load_passenger_data():
+    """Load the raw Titanic passengers from the configured data source"""
     try:
-        print("📥 Loading data from Supabase...")
+        print(f"📥 Loading data from {data_source.name}...")
         
-        # Fetch all data from Supabase
-        response = supabase.table('Project_1').select('*').execute()
+        df = data_source.load_table(PASSENGER_TABLE)
         
-        if not response.data:
-            raise Exception("No data found in Supabase")
+        if df.empty:
+            raise Exception(f"No data found in {data_source.name}")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(response.data)
-        print(f"✅ Successfully loaded {len(df)} records from Supabase")
+        print(f"✅ Successfully loaded {len(df)} records from {data_source.name}")
         
         return df
     
     except Exception as e:
-        print(f"❌ Error loading data from Supabase: {e}")
-        # Fallback to local CSV if Supabase fails
+        print(f"❌ Error loading data from {data_source.name}: {e}")
+        # Fallback to local CSV if the source fails
         print("🔄 Falling back to local CSV...")
-        return pd.read_csv('train.csv')
+        return fallback_source.load_table(PASSENGER_TABLE)
+
+def dataset_source_hash():
+    """Identify the current source data without downloading it"""
+    try:
+        return f'{data_source.name}:' + data_source.fingerprint(PASSENGER_TABLE)
+    except Exception as e:
+        print(f"⚠️ {data_source.name} fingerprint unavailable, keying snapshot on train.csv: {e}")
+        return f'{fallback_source.name}:' + fallback_source.fingerprint(PASSENGER_TABLE)
+
+def build_cleaned_data(source_hash):
+    """Download (or read) the source data and clean it"""
+    if source_hash.startswith(f'{data_source.name}:'):
+        raw_df = load_passenger_data()
+    else:
+        raw_df = fallback_source.load_table(PASSENGER_TABLE)
+    cleaned = clean_titanic_data(raw_df)
+    if 'id' in raw_df.columns:
+        # Remember the newest row so the delta sync can continue from there
+        cleaned.attrs['watermark'] = int(raw_df['id'].max())
+    return cleaned
+
+def fetch_passenger_delta(watermark):
+    """Rows of the passenger table added after the watermark"""
+    return data_source.load_after(PASSENGER_TABLE, 'id', watermark)
+
+# Register copilot blueprint
+app.register_blueprint(copilot_bp)
 
-# Load data from Supabase
-df = load_data_from_supabase()
+# Trained models are stored per data version and reused across requests/restarts
+model_registry = ModelRegistry()
+training_jobs = TrainingJobQueue(model_registry)
+# Concurrent small predict requests are scored together in one predict_proba call
+predict_batcher = PredictBatcher()
+# Precomputed prediction grids of the registered models (PREDICT_LOOKUP=true)
+prediction_tables = PredictionTables(model_registry.store_dir)
+
+# Serialized aggregate responses, valid until the next dataset version is published
+response_cache = ResponseCache()
+
+# Set by the warm-up once the dataset is loaded
+dataset_store = None
+delta_sync = None
+
+def serialize_rows(df):
+    """One compact JSON object (bytes) per row of ``df``, as jsonify would write the record"""
+    return app.json.dumps_rows(df)
+
+def survival_cube(version):
+    """Counts/survivors cube of a dataset version (built once per version)"""
+    return version.derived('survival_cube', SurvivalCube.from_frame)
+
+def comoments(version):
+    """Co-moment accumulator of a dataset version, extended from the previous version after a delta sync"""
+    return version.derived('comoments', CoMomentAccumulator.from_frame, lambda acc, rows: acc.update(rows))
+
+def binning_index(version):
+    """Bin codes and group statistics of the analysed features for a dataset version"""
+    return version.derived('binning_index', BinningIndex.from_frame)
+
+def summary_sketch(version):
+    """Sketch-based describe() of a dataset version, extended from the previous version after a delta sync"""
+    return version.derived('summary_sketch', SummarySketch.from_frame, lambda sketch, rows: sketch.update(rows))
+
+def data_pages(version):
+    """Rows of a dataset version serialized once for /api/data and /api/head, extended after a delta sync"""
+    return version.derived('data_pages', lambda df: DataPages.from_frame(df, serialize_rows), lambda pages, rows: pages.extend(rows))
+
+def data_index(version):
+    """Bitmap and sorted indexes behind the /api/data filters of a dataset version"""
+    return version.derived('data_index', DataIndex.from_frame)
+
+def on_dataset_published(version):
+    """Rebuild the derived state for a newly published dataset version"""
+    response_cache.invalidate(version.version)
+    init_copilot(version.df, version.version, survival_cube(version))
+    comoments(version)
+    binning_index(version)
+    data_pages(version)
+    data_index(version)
+    if summary_mode(len(version.df)) == 'sketch':
+        summary_sketch(version)
+    
+    # Train the default model for the new version in the background so requests stay fast
+    if model_registry.get(ModelRegistry.artifact_key(version.version)) is None:
+        training_jobs.submit(version.df, version.version)
 
-def clean_titanic_data(df):
-    """Clean the Titanic dataset with proper type handling for Supabase data"""
-    clean_df = df.copy()
+def warm_up_app(state):
+    """Load the dataset and build everything derived from it"""
+    global dataset_store, delta_sync
     
-    print(f"🔧 Data types before cleaning: {clean_df.dtypes}")
+    # Clean the data, or warm start from the columnar snapshot when the source is unchanged
+    with state.phase('load_dataset'):
+        source_hash = dataset_source_hash()
+        cleaned_df = load_or_build(
+            f'{source_hash}-{source_fingerprint(data_cleaning)}',
+            lambda: compact_frame(build_cleaned_data(source_hash))
+        )
     
-    # 1. Convert ALL data types that should be numeric (Supabase might have different types than CSV)
-    numeric_columns = ['Age', 'Fare', 'SibSp', 'Parch', 'Pclass', 'Survived', 'PassengerId']
+    # Every request reads one immutable dataset version; new rows are published as a new version
+    store = DatasetStore(cleaned_df, watermark=cleaned_df.attrs.get('watermark'), prepare=compact_frame)
     
-    for col in numeric_columns:
-        if col in clean_df.columns:
-            # Convert to string first, then to numeric to handle any data type issues
-            clean_df[col] = pd.to_numeric(clean_df[col].astype(str), errors='coerce')
-            print(f"   Converted {col} from {df[col].dtype} to {clean_df[col].dtype}")
+    # Aggregates derived once per version (cube for roll-ups, co-moments for correlations,
+    # binning index for the feature analysis, row blocks and indexes for the data pages)
+    with state.phase('aggregates'):
+        cube = survival_cube(store.current())
+        comoments(store.current())
+        binning_index(store.current())
+        data_pages(store.current())
+        data_index(store.current())
+        if summary_mode(len(store.current().df)) == 'sketch':
+            summary_sketch(store.current())
     
-    # 2. Handle missing values (without inplace to avoid warnings)
-    if 'Age' in clean_df.columns:
-        clean_df['Age'] = clean_df['Age'].fillna(clean_df['Age'].median())
-    if 'Embarked' in clean_df.columns:
-        clean_df['Embarked'] = clean_df['Embarked'].fillna(clean_df['Embarked'].mode()[0] if not clean_df['Embarked'].mode().empty else 'S')
-    if 'Fare' in clean_df.columns:
-        clean_df['Fare'] = clean_df['Fare'].fillna(clean_df['Fare'].median())
+    # Initialize AI Copilot
+    with state.phase('copilot'):
+        init_copilot(store.current().df, store.current().version, cube)
     
-    # 3. Extract titles from Names
-    if 'Name' in clean_df.columns:
-        clean_df['Title'] = clean_df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
-        
-        title_mapping = {
-            'Mr': 'Mr', 'Miss': 'Miss', 'Mrs': 'Mrs', 'Master': 'Master', 
-            'Dr': 'Officer', 'Rev': 'Officer', 'Col': 'Officer', 'Major': 'Officer',
-            'Mlle': 'Miss', 'Ms': 'Miss', 'Lady': 'Royalty', 'Countess': 'Royalty',
-            'Don': 'Royalty', 'Dona': 'Royalty', 'Mme': 'Mrs', 'Sir': 'Royalty', 
-            'Jonkheer': 'Royalty', 'Capt': 'Officer'
-        }
-        clean_df['Title'] = clean_df['Title'].map(title_mapping)
-        clean_df['Title'] = clean_df['Title'].fillna('Other')
-    
-    # 4. Family features (with proper type conversion)
-    if 'SibSp' in clean_df.columns and 'Parch' in clean_df.columns:
-        # Ensure numeric types - FIXED: Convert to string first, then to numeric
-        clean_df['SibSp'] = pd.to_numeric(clean_df['SibSp'].astype(str), errors='coerce').fillna(0)
-        clean_df['Parch'] = pd.to_numeric(clean_df['Parch'].astype(str), errors='coerce').fillna(0)
-        
-        clean_df['FamilySize'] = clean_df['SibSp'] + clean_df['Parch'] + 1
-        clean_df['IsAlone'] = (clean_df['FamilySize'] == 1).astype(int)
+    store.subscribe(on_dataset_published)
     
-    # 5. Drop columns that might cause issues
-    columns_to_drop = ['Cabin', 'Ticket', 'Name', 'id', 'created_at']
-    clean_df = clean_df.drop(columns=[col for col in columns_to_drop if col in clean_df.columns])
+    # Pull new passenger rows in the background (only possible when the source has row ids)
+    delta_sync = DeltaSync(store, fetch_passenger_delta, clean_titanic_data)
+    if store.current().watermark is not None:
+        delta_sync.start()
     
-    print(f"✅ Data cleaning complete. Final shape: {clean_df.shape}")
-    print(f"🔧 Data types after cleaning: {clean_df.dtypes}")
-    return clean_df
-# Clean the data
-cleaned_df = clean_titanic_data(df)
-# Initialize AI Copilot
-init_copilot(cleaned_df)  # Add this line
+    dataset_store = store
 
-# Register copilot blueprint
-app.register_blueprint(copilot_bp)
+warmup = WarmUp()
+# Spawned training processes re-import the main module; only the server itself warms up
+if multiprocessing.current_process().name == 'MainProcess':
+    warmup.start(warm_up_app, background=STARTUP_MODE == 'background')
+
+# Endpoints that answer before the dataset is loaded
+WARMUP_EXEMPT_ENDPOINTS = {'ready', 'test', 'copilot.get_tour'}
 
-def convert_to_serializable(obj):
-    """Convert numpy/pandas types to JSON-serializable types"""
-    if pd.isna(obj):
+@app.before_request
+def require_warm_app():
+    """Answer 503 until the background warm-up has loaded the dataset"""
+    if warmup.ready or request.method == 'OPTIONS' or request.endpoint in WARMUP_EXEMPT_ENDPOINTS:
         return None
-    elif isinstance(obj, (np.integer, np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64, np.float32)):
-        return float(obj)
-    elif isinstance(obj, (bool, np.bool_)):
-        return bool(obj)
-    elif isinstance(obj, pd.Timestamp):
-        return obj.isoformat()
-    elif isinstance(obj, (list, tuple)):
-        return [convert_to_serializable(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {key: convert_to_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
+
+    return jsonify({
+        'error': 'Dataset is still loading, retry shortly',
+        'startup': warmup.info()
+    }), 503
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the dataset and copilot are loaded, 503 before"""
+    return jsonify(warmup.info()), 200 if warmup.ready else 503
+
+def rows_response(rows, **fields):
+    """JSON response with the pre-serialized ``rows`` as 'data' next to ``fields``"""
+    body = b'{"data":[' + rows + b']'
+    if fields:
+        body += b',' + app.json.dumps(fields, separators=(',', ':')).encode()[1:]
     else:
-        return obj
+        body += b'}'
+    return app.response_class(body + b'\n', mimetype='application/json')
+
+def frame_body(df, data_format, **fields):
+    """``df`` serialized as columnar JSON or an Arrow IPC stream, with ``fields`` next to it
+    (in the schema metadata for Arrow)"""
+    if data_format == 'arrow':
+        return arrow_stream(df, fields)
+    return app.json.dumps({**columnar(df), **fields}, separators=(',', ':')).encode() + b'\n'
+
+def frame_response(df, data_format, **fields):
+    response = app.response_class(frame_body(df, data_format, **fields), mimetype=FORMATS[data_format])
+    response.vary.add('Accept')
+    return response
+
+def cached_json(name, build):
+    """Serve ``build(dataset)`` from the response cache of the current dataset version.
+
+    Sets a strong ETag and answers a matching If-None-Match with 304. Bodies are sent
+    gzip/brotli compressed when the client accepts it; each variant is compressed once
+    and kept next to the cached body.
+    """
+    return cached_response(name, lambda dataset: jsonify(build(dataset)).get_data())
+
+def cached_response(name, build, mimetype='application/json'):
+    """Like cached_json, for a ``build(dataset)`` that returns the serialized body itself"""
+    dataset = dataset_store.current()
+    entry = response_cache.get_or_build(name, dataset.version, lambda: build(dataset))
+    encoding = choose_encoding(request)
+    body, etag = entry.variant(encoding)
+    response = app.response_class(body, mimetype=mimetype)
+    if body is not entry.body:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate, since a sync can publish new data
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def training_response(job):
+    """202 for a request whose model is still being trained by a background job"""
+    return jsonify({
+        'status': 'training',
+        'job_id': job['job_id'],
+        'status_url': f"/api/regression/jobs/{job['job_id']}"
+    }), 202
+
+def model_response(artifact):
+    """Build the /api/regression/survival payload from a stored model artifact"""
+    response_data = dict(artifact['metrics'])
+    response_data.update({
+        'model_version': artifact['key'],
+        'data_version': artifact['data_version'],
+        'trained_at': artifact['created_at'],
+        'status': 'real_model_success'
+    })
+    return response_data
 
 def save_prediction_to_supabase(passenger_data, prediction, probability, actual=None):
-    """Save prediction results to Supabase"""
+    """Save prediction results to the predictions table"""
     try:
         data = {
             'passenger_data': passenger_data,
@@ -141,15 +289,15 @@ def save_prediction_to_supabase(passenger_data, prediction, probability, actual=
             'model_type': 'Random Forest'
         }
         
-        result = supabase.table('predictions').insert(data).execute()
-        print(f"✅ Prediction saved to Supabase: {prediction}")
+        result = data_source.insert('predictions', data)
+        print(f"✅ Prediction saved to {data_source.name}: {prediction}")
         return result
     except Exception as e:
-        print(f"❌ Error saving prediction to Supabase: {e}")
+        print(f"❌ Error saving prediction to {data_source.name}: {e}")
         return None
 
 def save_model_run_to_supabase(accuracy, train_samples, test_samples, feature_count):
-    """Save model run details to Supabase"""
+    """Save model run details to the model_logs table"""
     try:
         data = {
             'accuracy': accuracy,
@@ -159,48 +307,50 @@ def save_model_run_to_supabase(accuracy, train_samples, test_samples, feature_co
             'model_type': 'Random Forest'
         }
         
-        result = supabase.table('model_logs').insert(data).execute()
-        print(f"✅ Model run saved to Supabase: {accuracy:.3f} accuracy")
+        result = data_source.insert('model_logs', data)
+        print(f"✅ Model run saved to {data_source.name}: {accuracy:.3f} accuracy")
         return result
     except Exception as e:
-        print(f"❌ Error saving model run to Supabase: {e}")
+        print(f"❌ Error saving model run to {data_source.name}: {e}")
         return None
 
+# Display names for /api/supabase/health (the routes keep their names for the frontend)
+DATABASE_NAMES = {'supabase': 'Supabase', 'csv': 'CSV', 'parquet': 'Parquet', 'sqlite': 'SQLite'}
+
 @app.route('/api/supabase/predictions', methods=['GET'])
 def get_supabase_predictions():
-    """Get all predictions from Supabase"""
+    """Get all predictions, newest first"""
     try:
-        result = supabase.table('predictions').select('*').order('created_at', desc=True).execute()
+        predictions = data_source.select('predictions', order_by='created_at', desc=True)
         return jsonify({
-            'predictions': result.data,
-            'count': len(result.data)
+            'predictions': predictions,
+            'count': len(predictions)
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/supabase/model-runs', methods=['GET'])
 def get_supabase_model_runs():
-    """Get all model runs from Supabase"""
+    """Get all model runs, newest first"""
     try:
-        result = supabase.table('model_logs').select('*').order('created_at', desc=True).execute()
+        model_runs = data_source.select('model_logs', order_by='created_at', desc=True)
         return jsonify({
-            'model_runs': result.data,
-            'count': len(result.data)
+            'model_runs': model_runs,
+            'count': len(model_runs)
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/supabase/health', methods=['GET'])
 def supabase_health_check():
-    """Check Supabase connection and data"""
+    """Check the data source connection and data"""
     try:
-        # Use your actual table name 'Project_1' instead of 'titanic_passengers'
-        response = supabase.table('Project_1').select('PassengerId', count='exact').limit(1).execute()
+        total_passengers = data_source.count(PASSENGER_TABLE)
         return jsonify({
             'status': 'connected',
-            'database': 'Supabase',
-            'total_passengers': response.count,
-            'message': 'Successfully connected to Supabase'
+            'database': DATABASE_NAMES.get(data_source.name, data_source.name),
+            'total_passengers': total_passengers,
+            'message': f'Successfully connected to {DATABASE_NAMES.get(data_source.name, data_source.name)}'
         })
     except Exception as e:
         return jsonify({
@@ -211,263 +361,298 @@ def supabase_health_check():
 # Basic endpoints
 @app.route('/api/test', methods=['GET'])
 def test():
-    return jsonify({"message": "Flask API is working!", "data_shape": list(cleaned_df.shape)})
+    # Answers during warm-up too, so it shows when the server itself is up
+    data_shape = list(dataset_store.current().df.shape) if dataset_store else None
+    return jsonify({"message": "Flask API is working!", "data_shape": data_shape})
 
 @app.route('/api/head', methods=['GET'])
 def head():
-    """Get first 20 rows of CLEANED data"""
-    data = cleaned_df.head(20).to_dict('records')
-    serializable_data = [convert_to_serializable(record) for record in data]
-    return jsonify(serializable_data)
+    """Get first 20 rows of CLEANED data (rows, columnar JSON or Arrow, see negotiate_format)"""
+    try:
+        data_format = negotiate_format(request)
+        dataset = dataset_store.current()
+        if data_format != 'json':
+            return frame_response(dataset.df.iloc[:20], data_format)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FormatNotAvailable as e:
+        return jsonify({'error': str(e)}), 406
+    
+    pages = data_pages(dataset)
+    return app.response_class(b'[' + pages.page(0, 20) + b']\n', mimetype='application/json')
 
 @app.route('/api/info', methods=['GET'])
 def info():
     """Get info about CLEANED dataset"""
-    info = {
+    return cached_json('info', lambda dataset: build_info(dataset.df))
+
+def build_info(cleaned_df):
+    return {
         "columns": list(cleaned_df.columns),
         "shape": list(cleaned_df.shape),
-        "missing_values": convert_to_serializable(cleaned_df.isnull().sum().to_dict()),
+        "missing_values": cleaned_df.isnull().sum(),
         "data_types": cleaned_df.dtypes.astype(str).to_dict()
     }
-    return jsonify(info)
 
 # EDA endpoints
 @app.route('/api/summary', methods=['GET'])
 def summary():
-    """Get statistical summary of numerical columns"""
-    summary_dict = cleaned_df.describe().to_dict()
-    serializable_summary = convert_to_serializable(summary_dict)
-    return jsonify(serializable_summary)
+    """Get statistical summary of numerical columns.
+
+    Large datasets are summarised from quantile sketches (exact count/mean/std/min/max,
+    approximate percentiles); ?mode=exact|sketch overrides SUMMARY_MODE.
+    """
+    try:
+        mode = summary_mode(len(dataset_store.current().df), request.args.get('mode'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if mode == 'sketch':
+        response = cached_json('summary:sketch', lambda dataset: summary_sketch(dataset).describe())
+    else:
+        response = cached_json('summary', lambda dataset: build_summary(dataset.df))
+    response.headers['X-Summary-Mode'] = mode
+    return response
+
+def build_summary(cleaned_df):
+    return cleaned_df.describe().to_dict()
 
 @app.route('/api/survival_rates', methods=['GET'])
 def survival_rates():
     """Get survival rates by different categories"""
-    survival_by_class = cleaned_df.groupby('Pclass')['Survived'].mean().to_dict()
-    survival_by_sex = cleaned_df.groupby('Sex')['Survived'].mean().to_dict()
-    survival_by_embarked = cleaned_df.groupby('Embarked')['Survived'].mean().to_dict()
-    survival_by_title = cleaned_df.groupby('Title')['Survived'].mean().to_dict()
+    return cached_json('survival_rates', lambda dataset: build_survival_rates(survival_cube(dataset)))
+
+def build_survival_rates(cube):
+    survival_by_class = cube.rates('Pclass')
+    survival_by_sex = cube.rates('Sex')
+    survival_by_embarked = cube.rates('Embarked')
+    survival_by_title = cube.rates('Title')
     
-    return jsonify({
-        'by_class': convert_to_serializable(survival_by_class),
-        'by_sex': convert_to_serializable(survival_by_sex),
-        'by_embarked': convert_to_serializable(survival_by_embarked),
-        'by_title': convert_to_serializable(survival_by_title)
-    })
+    return {
+        'by_class': survival_by_class,
+        'by_sex': survival_by_sex,
+        'by_embarked': survival_by_embarked,
+        'by_title': survival_by_title
+    }
 
 @app.route('/api/correlation', methods=['GET'])
 def correlation():
     """Get correlation matrix for numerical features"""
-    numerical_df = cleaned_df.select_dtypes(include=[np.number])
-    corr_dict = numerical_df.corr().to_dict()
-    serializable_corr = convert_to_serializable(corr_dict)
-    return jsonify(serializable_corr)
+    return cached_json('correlation', lambda dataset: build_correlation(comoments(dataset)))
+
+def build_correlation(accumulator):
+    # Derived from the running co-moments in O(k²), without rescanning the rows
+    return accumulator.correlation().to_dict()
+
+@app.route('/api/aggregate', methods=['GET'])
+def aggregate():
+    """Any survival roll-up from the cube, e.g. ?by=Pclass,Sex&metric=rate"""
+    by = [name.strip() for name in request.args.get('by', '').split(',') if name.strip()]
+    metrics = [name.strip() for name in request.args.get('metric', 'rate').split(',') if name.strip()]
+    if not by:
+        return jsonify({'error': "Query parameter 'by' is required, e.g. by=Pclass,Sex"}), 400
+    
+    cube = survival_cube(dataset_store.current())
+    try:
+        # Validate first so bad requests never enter the response cache
+        cube.validate(by, metrics)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'dimensions': cube.dimensions, 'metrics': CUBE_METRICS}), 400
+    
+    try:
+        data_format = negotiate_format(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    cache_key = 'aggregate:' + ','.join(by) + ':' + ','.join(metrics)
+    
+    def build_columns(dataset):
+        groups = records_frame(survival_cube(dataset).aggregate(by, metrics), by + metrics)
+        return frame_body(groups, data_format, by=by, metric=metrics, data_version=dataset.version)
+    
+    try:
+        if data_format == 'json':
+            response = cached_json(cache_key, lambda dataset: {
+                'by': by,
+                'metric': metrics,
+                'groups': survival_cube(dataset).aggregate(by, metrics),
+                'data_version': dataset.version
+            })
+        else:
+            response = cached_response(f'{cache_key}:{data_format}', build_columns, FORMATS[data_format])
+    except FormatNotAvailable as e:
+        return jsonify({'error': str(e)}), 406
+    response.vary.add('Accept')
+    return response
+
+@app.route('/api/aggregate/dimensions', methods=['GET'])
+def aggregate_dimensions():
+    """Dimensions, labels and metrics available to /api/aggregate"""
+    dataset = dataset_store.current()
+    return jsonify({**survival_cube(dataset).info(), 'data_version': dataset.version})
 
 # Data endpoints with pagination
 @app.route('/api/data', methods=['GET'])
 def get_all_data():
-    """Get all cleaned data with optional pagination"""
-    page = request.args.get('page', 1, type=int)
+    """Get all cleaned data with optional pagination.
+
+    ?page=&per_page= pages by row position; ?cursor= (empty for the first page) walks the
+    rows by PassengerId and returns next_cursor. Both slice rows serialized once per
+    dataset version, so deep pages cost the same as the first. ?format=columns|arrow (or
+    the matching Accept type) returns the page column-oriented instead.
+
+    Filters (Sex=female&Pclass=1,2&Age>=18), ?sort=-Fare and ?q= search are resolved
+    from the version's DataIndex; total_records then counts the matching rows.
+    """
+    dataset = dataset_store.current()
+    pages = data_pages(dataset)
     per_page = request.args.get('per_page', 10, type=int)
+    if per_page < 1:
+        return jsonify({'error': 'per_page must be at least 1'}), 400
     
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    
-    paginated_data = cleaned_df.iloc[start_idx:end_idx]
+    try:
+        data_format = negotiate_format(request)
+        query = DataQuery.parse(request.query_string.decode(), dataset.df.columns)
+        
+        if 'cursor' in request.args:
+            if query.sort is not None:
+                raise ValueError(f'Cursor pages are ordered by {pages.key}; use page= together with sort')
+            after = decode_cursor(request.args['cursor'])
+            if query:
+                matches = data_index(dataset).positions(query, order_by=pages.key)
+                start_idx, end_idx, next_cursor = pages.key_range(after, per_page, pages.position_keys[matches])
+                selected, total = matches[start_idx:end_idx], len(matches)
+            else:
+                start_idx, end_idx, next_cursor = pages.key_range(after, per_page)
+                selected, total = pages.positions(start_idx, end_idx), len(pages)
+            fields = {
+                'next_cursor': next_cursor,
+                'order_by': pages.key,
+                'per_page': per_page,
+                'total_records': total
+            }
+            if data_format != 'json':
+                return frame_response(dataset.df.iloc[selected], data_format, **fields)
+            if query:
+                return rows_response(pages.by_position.take(selected), **fields)
+            return rows_response(pages.by_key.slice(start_idx, end_idx), **fields)
+        
+        page = request.args.get('page', 1, type=int)
+        if page < 1:
+            return jsonify({'error': 'page must be at least 1'}), 400
+        
+        matches = data_index(dataset).positions(query) if query else None
+        total = len(pages) if matches is None else len(matches)
+        start_idx = (page - 1) * per_page
+        end_idx = min(start_idx + per_page, total)
+        selected = slice(start_idx, end_idx) if matches is None else matches[start_idx:end_idx]
+        fields = {
+            'total_records': total,
+            'page': page,
+            'per_page': per_page,
+            'total_pages': (total + per_page - 1) // per_page
+        }
+        if data_format != 'json':
+            return frame_response(dataset.df.iloc[selected], data_format, **fields)
+        if matches is not None:
+            return rows_response(pages.by_position.take(selected), **fields)
+        return rows_response(pages.page(start_idx, end_idx), **fields)
     
-    data_records = []
-    for record in paginated_data.to_dict('records'):
-        serializable_record = convert_to_serializable(record)
-        data_records.append(serializable_record)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FormatNotAvailable as e:
+        return jsonify({'error': str(e)}), 406
+
+@app.route('/api/data/export', methods=['GET'])
+def export_data():
+    """Stream the cleaned data as ?format=ndjson|csv|parquet, with the same filters, sort and q as /api/data"""
+    dataset = dataset_store.current()
+    export_format = request.args.get('format', 'ndjson')
+    try:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}', expected one of {', '.join(EXPORT_FORMATS)}")
+        query = DataQuery.parse(request.query_string.decode(), dataset.df.columns)
+        positions = data_index(dataset).positions(query) if query else None
+        # The generator keeps this version's frame, so a publish mid-download cannot mix versions
+        stream = export_stream(dataset.df, export_format, data_pages(dataset).by_position, positions)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FormatNotAvailable as e:
+        return jsonify({'error': str(e)}), 406
     
-    return jsonify({
-        'data': data_records,
-        'total_records': len(cleaned_df),
-        'page': page,
-        'per_page': per_page,
-        'total_pages': (len(cleaned_df) + per_page - 1) // per_page
-    })
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    # Compressed chunk by chunk as the export streams (parquet pages are compressed already)
+    encoding = choose_encoding(request) if export_format != 'parquet' else None
+    if encoding is not None:
+        stream = compress_stream(stream, encoding)
+    response = app.response_class(stream, mimetype=mimetype)
+    if encoding is not None:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Content-Disposition'] = f'attachment; filename=titanic-{dataset.version}.{extension}'
+    response.headers['X-Data-Version'] = dataset.version
+    return response
+
+@app.route('/api/data/columns', methods=['GET'])
+def data_columns():
+    """Columns /api/data can filter and sort by, with the values of the bitmap columns"""
+    dataset = dataset_store.current()
+    index = data_index(dataset)
+    return jsonify({**index.columns(), 'values': index.labels, 'data_version': dataset.version})
+
+@app.route('/api/memory', methods=['GET'])
+def memory():
+    """Per-column memory used by the served dataset"""
+    dataset = dataset_store.current()
+    report = memory_report(dataset.df)
+    report['data_version'] = dataset.version
+    return jsonify(report)
 
 @app.route('/api/data/count', methods=['GET'])
 def data_count():
     """Get total record count"""
+    dataset = dataset_store.current()
+    cleaned_df = dataset.df
     return jsonify({'total_records': len(cleaned_df)})
 
-@app.route('/api/regression/survival', methods=['GET'])
-def survival_regression():
-    """Perform Logistic Regression with ENGINEERED FEATURES"""
+@app.route('/api/data/version', methods=['GET'])
+def data_version():
+    """Current dataset version and the state of the delta sync"""
+    return jsonify({
+        'dataset': dataset_store.current().info(),
+        'sync_enabled': dataset_store.current().watermark is not None,
+        'last_sync': delta_sync.last_run,
+        'response_cache': response_cache.stats()
+    })
+
+@app.route('/api/data/sync', methods=['POST'])
+def sync_data():
+    """Pull new passenger rows now instead of waiting for the background sync"""
     try:
-        from sklearn.linear_model import LogisticRegression
-        from sklearn.model_selection import train_test_split
-        from sklearn.metrics import accuracy_score
-        from sklearn.preprocessing import LabelEncoder
-        from sklearn.preprocessing import StandardScaler
-        from sklearn.ensemble import RandomForestClassifier
-        from sklearn.model_selection import cross_val_score, StratifiedKFold
-        print("🚀 RUNNING REAL MODEL WITH ENGINEERED FEATURES")
-
-        # DEBUG: Check data types before starting
-        print(f"🔍 DEBUG: cleaned_df dtypes: {cleaned_df.dtypes}")
-        print(f"🔍 DEBUG: Survived column type: {cleaned_df['Survived'].dtype}")
-        print(f"🔍 DEBUG: Sample Survived values: {cleaned_df['Survived'].head()}")        
-        # Prepare features and target
-        features_df = cleaned_df.copy()
-
-        # FORCE CONVERT CRITICAL COLUMNS TO NUMERIC (double safety)
-        critical_numeric_cols = ['Survived', 'Pclass', 'Age', 'SibSp', 'Parch', 'Fare']
-        for col in critical_numeric_cols:
-            if col in features_df.columns:
-                features_df[col] = pd.to_numeric(features_df[col], errors='coerce')
-        
-        # Remove any rows with NaN in Survived (target variable)
-        features_df = features_df.dropna(subset=['Survived'])
-
-        # Encode categorical variables
-        le_sex = LabelEncoder()
-        le_embarked = LabelEncoder()
-        le_title = LabelEncoder()
-
-        features_df['FamilySize'] = features_df['SibSp'] + features_df['Parch'] + 1
-        features_df['IsAlone'] = (features_df['FamilySize'] == 1).astype(int)
-        features_df['IsChild'] = (features_df['Age'] < 12).astype(int)
-        features_df['IsFemale'] = (features_df['Sex'] == 'female').astype(int)
-        features_df['IsRich'] = ((features_df['Pclass'] == 1) & (features_df['Fare'] > 50)).astype(int)
-        features_df['Sex_encoded'] = le_sex.fit_transform(features_df['Sex'])
-        features_df['Embarked_encoded'] = le_embarked.fit_transform(features_df['Embarked'].fillna('S'))
-        features_df['Title_encoded'] = le_title.fit_transform(features_df['Title'])
-
-        # Simple but effective feature set
-        feature_columns = [
-            'Pclass', 'Age', 'SibSp', 'Parch', 'Fare',
-            'Sex_encoded', 'Embarked_encoded', 'Title_encoded',
-            'FamilySize', 'IsAlone', 'IsChild', 'IsFemale', 'IsRich' # Additional engineered features
-        ]
-        scaler = StandardScaler()
-
-
-        X = features_df[feature_columns]
-        y = features_df['Survived']
+        if dataset_store.current().watermark is None:
+            return jsonify({'error': 'Delta sync needs a source with row ids (no watermark available)'}), 400
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-
-        # Train model
-        #model = LogisticRegression(random_state=42, max_iter=1000)
-        model = RandomForestClassifier(
-            n_estimators=200,       # More trees
-            max_depth=10,           # Deeper trees
-            min_samples_split=3,    # More flexible splitting
-            min_samples_leaf=1,     # More flexible leaves
-            max_features='sqrt',    # Better feature selection
-            random_state=42
-        )    
-        # # Option B: Balanced approach  
-        # model = RandomForestClassifier(
-        #     n_estimators=200,
-        #     max_depth=8,
-        #     min_samples_split=5,
-        #     min_samples_leaf=2,
-        #     max_features=0.7,
-        #     random_state=42
-        # )
-        # CROSS-VALIDATION
-        print("📊 RUNNING 5-FOLD CROSS-VALIDATION...")
-        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-        cv_scores = cross_val_score(model, X_train, y_train, cv=cv, scoring='accuracy')
-        
-        cv_mean = cv_scores.mean()
-        cv_std = cv_scores.std()
-        
-        print(f"🎯 CROSS-VALIDATION RESULTS:")
-        print(f"   Fold Scores: {[f'{score:.3f}' for score in cv_scores]}")
-        print(f"   Mean CV Accuracy: {cv_mean:.3f} (+/- {cv_std * 2:.3f})")
-        print(f"   Range: {cv_scores.min():.3f} - {cv_scores.max():.3f}")
-        model.fit(X_train, y_train)
-        def predict_survival_probability(passenger_features):
-            scaled_features = scaler.transform([passenger_features])
-            return model.predict_proba(scaled_features)[0][1]
-        # Make predictions
-        # y_pred = model.predict_survival_probability(X_test)
-        y_pred = model.predict(X_test)
-        
-        # Calculate metrics
-        accuracy = accuracy_score(y_test, y_pred)
-        print(f"🎯 REAL MODEL ACCURACY: {accuracy:.3f} ({accuracy*100:.1f}%)")
-        
-        # Calculate accuracies
-        # test_accuracy = accuracy_score(y_test, y_pred)
-        train_accuracy = accuracy_score(y_train, model.predict(X_train))
-        overfitting_gap = train_accuracy - accuracy
-        
-        print(f"🎯 FINAL RESULTS:")
-        print(f"   Test Accuracy: {accuracy:.3f}")
-        print(f"   Train Accuracy: {train_accuracy:.3f}")
-        print(f"   Overfitting Gap: {overfitting_gap:.3f} (ideal: < 0.05)")
-        # Feature importance - CONVERT TO NATIVE PYTHON TYPES
-        feature_importance = {}
-        # for col, coef in zip(feature_columns, model.coef_[0]):
-        #     feature_importance[col] = float(coef)  # Convert numpy to native float
-        for col, importance in zip(feature_columns, model.feature_importances_):
-            feature_importance[col] = float(importance)        
-        # Sample predictions with PROPER SERIALIZATION
-        sample_indices = X_test.index[:6]
-        sample_predictions = []
-        
-        for idx in sample_indices:
-            # Convert passenger data to serializable format
-            passenger_data = {}
-            for col, value in cleaned_df.loc[idx].items():
-                passenger_data[col] = convert_to_serializable(value)
-            
-            # Get prediction
-            prediction = int(model.predict([X.loc[idx]])[0])
-            probability = float(model.predict_proba([X.loc[idx]])[0][1])  # Convert to native float
-            
-            sample_predictions.append({
-                'passenger_data': passenger_data,
-                'predicted_survival': prediction,
-                'actual_survival': int(y.loc[idx]),
-                'survival_probability': round(probability, 3),
-                'correct': bool(prediction == y.loc[idx])  # Convert numpy bool to Python bool
-            })
+        version = delta_sync.sync_once()
+        return jsonify({
+            'updated': version is not None,
+            'dataset': dataset_store.current().info(),
+            'last_sync': delta_sync.last_run
+        })
+    except Exception as e:
+        print(f"❌ Delta sync failed: {e}")
+        return jsonify({'error': f'Delta sync failed: {str(e)}'}), 500
 
-        # # Save model run to Supabase
-        # model_run = save_model_run_to_supabase(
-        #     accuracy=float(accuracy),
-        #     train_samples=int(len(X_train)),
-        #     test_samples=int(len(X_test)),
-        #     feature_count=int(len(feature_columns))
-        # )
-        
-        # # Save sample predictions to Supabase
-        # for pred in sample_predictions:
-        #     save_prediction_to_supabase(
-        #         passenger_data=pred['passenger_data'],
-        #         prediction=pred['predicted_survival'],
-        #         probability=pred['survival_probability'],
-        #         actual=pred['actual_survival']
-        #     )
-                
-        # Prepare final response with ALL NATIVE TYPES
-        response_data = {
-            'model_performance': {
-                'accuracy': float(accuracy),  # Convert to native float
-                'training_samples': int(len(X_train)),
-                'testing_samples': int(len(X_test)),
-                'model_type': 'Random Forest Classifier',
-                'feature_count': int(len(feature_columns))
-            },
-            'feature_importance': feature_importance,
-            'sample_predictions': sample_predictions,
-            'coefficients': feature_importance,
-            'status': 'real_model_success'
-        }
-        
-        print("✅ SUCCESS: Real model completed without errors")
-        return jsonify(response_data)
+@app.route('/api/regression/survival', methods=['GET'])
+def survival_regression():
+    """Serve the registered Random Forest trained on the ENGINEERED FEATURES"""
+    dataset = dataset_store.current()
+    cleaned_df = dataset.df
+    try:
+        artifact = training_jobs.get_or_submit(cleaned_df, dataset.version)
+        return jsonify(model_response(artifact))
         
+    except ModelNotReady as e:
+        return training_response(e.job)
     except Exception as e:
         print(f"❌ REAL MODEL FAILED: {e}")
         import traceback
@@ -479,148 +664,315 @@ def survival_regression():
             'status': 'error'
         }), 500
 
-@app.route('/api/regression/feature_analysis', methods=['GET'])
-def feature_analysis():
-    """Analyze feature relationships with survival - PROPERLY GROUPED"""
+@app.route('/api/regression/retrain', methods=['POST'])
+def retrain_survival_model():
+    """Retrain the survival model, optionally with other hyperparameters or features.
+
+    Training runs as a background job; the response waits for it up to MODEL_WAIT_SECONDS
+    and answers 202 with the job when it takes longer.
+    """
+    dataset = dataset_store.current()
+    cleaned_df = dataset.df
     try:
-        analysis = {}
+        data = request.get_json(silent=True) or {}
+        params = data.get('params')
+        feature_columns = data.get('features')
         
-        # Define how to group each feature meaningfully
-        features_to_analyze = {
-            'Pclass': 'categorical',      # Already categorical (1, 2, 3)
-            'Sex': 'categorical',         # Already categorical (male, female)
-            'Age': 'binned',              # Needs binning (0-10, 10-20, etc.)
-            'SibSp': 'discrete',          # Limited values (0, 1, 2, 3+)
-            'Parch': 'discrete',          # Limited values (0, 1, 2, 3+)
-            'Fare': 'binned',             # Needs binning (0-10, 10-50, etc.)
-            'Embarked': 'categorical',    # Already categorical (C, Q, S)
-            'Title': 'categorical',       # Already categorical
-            'FamilySize': 'discrete'      # Limited values (1, 2, 3, 4+)
-        }
+        try:
+            validate_training_spec(params, feature_columns)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'status': 'error'}), 400
         
-        for feature, feature_type in features_to_analyze.items():
-            try:
-                if feature_type == 'categorical':
-                    # Use actual categories
-                    survival_data = cleaned_df.groupby(feature)['Survived'].mean().to_dict()
-                    
-                    analysis[feature] = {
-                        'survival_by_group': convert_to_serializable(survival_data),
-                        'correlation_with_survival': 'N/A',
-                        'mean_survival': 'N/A',
-                        'feature_type': 'categorical'
-                    }
-                    
-                elif feature_type == 'discrete':
-                    # Use actual values (these have limited unique values)
-                    survival_data = cleaned_df.groupby(feature)['Survived'].mean().to_dict()
-                    
-                    analysis[feature] = {
-                        'survival_by_group': convert_to_serializable(survival_data),
-                        'correlation_with_survival': float(cleaned_df[feature].corr(cleaned_df['Survived'])),
-                        'mean_survival': {
-                            'survived': float(cleaned_df[cleaned_df['Survived'] == 1][feature].mean()),
-                            'died': float(cleaned_df[cleaned_df['Survived'] == 0][feature].mean())
-                        },
-                        'feature_type': 'discrete'
-                    }
-                    
-                elif feature_type == 'binned':
-                    # Create meaningful bins for continuous features
-                    if feature == 'Age':
-                        # Age groups: Children, Young Adults, Adults, Seniors
-                        bins = [0, 12, 18, 35, 60, 100]
-                        labels = ['Child (0-12)', 'Teen (13-18)', 'Young Adult (19-35)', 'Adult (36-60)', 'Senior (60+)']
-                        cleaned_df['Age_group'] = pd.cut(cleaned_df['Age'], bins=bins, labels=labels)
-                        survival_data = cleaned_df.groupby('Age_group')['Survived'].mean().to_dict()
-                        
-                    elif feature == 'Fare':
-                        # Fare groups: Low, Medium, High, Luxury
-                        bins = [0, 10, 30, 100, 600]
-                        labels = ['Low (0-10)', 'Medium (10-30)', 'High (30-100)', 'Luxury (100+)']
-                        cleaned_df['Fare_group'] = pd.cut(cleaned_df['Fare'], bins=bins, labels=labels)
-                        survival_data = cleaned_df.groupby('Fare_group')['Survived'].mean().to_dict()
-                    
-                    analysis[feature] = {
-                        'survival_by_group': convert_to_serializable(survival_data),
-                        'correlation_with_survival': float(cleaned_df[feature].corr(cleaned_df['Survived'])),
-                        'mean_survival': {
-                            'survived': float(cleaned_df[cleaned_df['Survived'] == 1][feature].mean()),
-                            'died': float(cleaned_df[cleaned_df['Survived'] == 0][feature].mean())
-                        },
-                        'feature_type': 'continuous'
-                    }
-                    
-            except Exception as e:
-                print(f"Error with feature {feature}: {e}")
-                # Fallback: use simple grouping
-                survival_data = cleaned_df.groupby(feature)['Survived'].mean().to_dict()
-                analysis[feature] = {
-                    'survival_by_group': convert_to_serializable(survival_data),
-                    'correlation_with_survival': 'Error',
-                    'mean_survival': 'Error',
-                    'feature_type': 'error'
-                }
+        job = training_jobs.wait(training_jobs.submit(cleaned_df, dataset.version, params, feature_columns), MODEL_WAIT_SECONDS)
+        if job['status'] == 'failed':
+            raise RuntimeError(job['error'])
+        if job['status'] != 'completed':
+            return training_response(job)
+        return jsonify(model_response(model_registry.get(job['model_version'])))
         
-        return jsonify(analysis)
+    except Exception as e:
+        print(f"❌ Retraining failed: {e}")
+        return jsonify({
+            'error': f'Model training failed: {str(e)}',
+            'status': 'error'
+        }), 500
+
+@app.route('/api/regression/models', methods=['GET'])
+def list_models():
+    """List the stored model artifacts"""
+    try:
+        artifacts = model_registry.list_artifacts()
+        return jsonify({
+            'models': artifacts,
+            'count': len(artifacts),
+            'data_version': dataset_store.current().version
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/regression/jobs', methods=['POST'])
+def submit_training_job():
+    """Queue a background training job and return its id"""
+    dataset = dataset_store.current()
+    cleaned_df = dataset.df
+    try:
+        data = request.get_json(silent=True) or {}
+        params = data.get('params')
+        feature_columns = data.get('features')
+        
+        try:
+            validate_training_spec(params, feature_columns)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'status': 'error'}), 400
+        
+        job_id = training_jobs.submit(cleaned_df, dataset.version, params, feature_columns)
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/regression/jobs/{job_id}'
+        }), 202
         
+    except Exception as e:
+        print(f"❌ Could not queue training job: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/regression/jobs', methods=['GET'])
+def list_training_jobs():
+    """List training jobs with their status"""
+    jobs = training_jobs.list_jobs()
+    return jsonify({'jobs': jobs, 'count': len(jobs)})
+
+@app.route('/api/regression/jobs/<job_id>', methods=['GET'])
+def training_job_status(job_id):
+    """Progress, per-phase timings and (once finished) the result of a training job"""
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job {job_id}'}), 404
+    
+    if job['status'] == 'completed':
+        artifact = model_registry.get(job['model_version'])
+        job['result'] = model_response(artifact) if artifact else None
+    
+    return jsonify(job)
+
+@app.route('/api/regression/feature_analysis', methods=['GET'])
+def feature_analysis():
+    """Analyze feature relationships with survival - PROPERLY GROUPED"""
+    try:
+        return cached_json('feature_analysis', build_feature_analysis)
     except Exception as e:
         print(f"Feature analysis error: {e}")
         return jsonify({'error': f'Feature analysis failed: {str(e)}'}), 500
 
+def build_feature_analysis(dataset):
+    # Group statistics come from the version's binning index and correlations from its
+    # co-moments; the shared frame is only read, never given extra columns
+    index = binning_index(dataset)
+    correlations = comoments(dataset).correlation()['Survived']
+    analysis = {}
+    
+    # Define how to group each feature meaningfully
+    features_to_analyze = {
+        'Pclass': 'categorical',      # Already categorical (1, 2, 3)
+        'Sex': 'categorical',         # Already categorical (male, female)
+        'Age': 'binned',              # Binned (Child, Teen, Young Adult, Adult, Senior)
+        'SibSp': 'discrete',          # Limited values (0, 1, 2, 3+)
+        'Parch': 'discrete',          # Limited values (0, 1, 2, 3+)
+        'Fare': 'binned',             # Binned (Low, Medium, High, Luxury)
+        'Embarked': 'categorical',    # Already categorical (C, Q, S)
+        'Title': 'categorical',       # Already categorical
+        'FamilySize': 'discrete'      # Limited values (1, 2, 3, 4+)
+    }
+    
+    for feature, feature_type in features_to_analyze.items():
+        try:
+            if feature_type == 'categorical':
+                analysis[feature] = {
+                    'survival_by_group': index.survival_by_group(feature),
+                    'correlation_with_survival': 'N/A',
+                    'mean_survival': 'N/A',
+                    'feature_type': 'categorical'
+                }
+            else:
+                # Every band is listed for binned features, empty ones with a null rate
+                survival_data = index.survival_by_group(feature, observed=feature_type != 'binned')
+                analysis[feature] = {
+                    'survival_by_group': survival_data,
+                    'correlation_with_survival': float(correlations[feature]),
+                    'mean_survival': index.mean_survival(feature),
+                    'feature_type': 'discrete' if feature_type == 'discrete' else 'continuous'
+                }
+                
+        except Exception as e:
+            print(f"Error with feature {feature}: {e}")
+            analysis[feature] = {
+                'survival_by_group': {},
+                'correlation_with_survival': 'Error',
+                'mean_survival': 'Error',
+                'feature_type': 'error'
+            }
+    
+    return analysis
+
+def survival_predictor(dataset):
+    """Predictor backed by the registered default model of a dataset version.
+
+    A missing model is trained by a background job (joining the one already running);
+    raises ModelNotReady when it is not done within MODEL_WAIT_SECONDS.
+    """
+    predictor = SurvivalPredictor(training_jobs.get_or_submit(dataset.df, dataset.version))
+    if PREDICT_LOOKUP:
+        # None until the model's table is built; the model scores everything meanwhile
+        predictor.table = prediction_tables.get(predictor)
+    return predictor
+
+def prediction_confidence(probability):
+    return 'high' if abs(probability - 0.5) > 0.3 else 'medium'
+
 @app.route('/api/regression/predict', methods=['GET', 'POST'])  # Allow both GET and POST
 def predict_survival():
-    """Predict survival for custom input (mock version)"""
+    """Predict survival with the registered Random Forest.
+
+    POST one passenger object, a list of passengers or {"passengers": [...]}; a batch is
+    scored with a single vectorized predict_proba call, and small concurrent requests are
+    coalesced into one by the predict batcher.
+    """
+    if request.method == 'GET':
+        # Return instructions for POST request
+        return jsonify({
+            'message': 'Send a POST request with one passenger, or a list of passengers to score them in one batch',
+            'example_post_data': {
+                'Sex': 'female',
+                'Pclass': 1,
+                'Age': 25,
+                'Fare': 100
+            },
+            'required_fields': list(REQUIRED_FIELDS),
+            'defaults': PASSENGER_DEFAULTS,
+            'max_batch': PREDICT_MAX_BATCH,
+            'batching': predict_batcher.stats(),
+            'lookup': prediction_tables.stats()
+        })
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, dict) and 'passengers' in data:
+        data = data['passengers']
+    single = isinstance(data, dict)
+    passengers = [data] if single else data
+    if not isinstance(passengers, list):
+        return jsonify({'error': 'Send a passenger object or a list of passengers as JSON'}), 400
+    if len(passengers) > PREDICT_MAX_BATCH:
+        return jsonify({'error': f'At most {PREDICT_MAX_BATCH} passengers per request'}), 413
+    
     try:
-        if request.method == 'GET':
-            # Return instructions for POST request
-            return jsonify({
-                'message': 'Send a POST request with passenger data',
-                'example_post_data': {
-                    'Sex': 'female',
-                    'Pclass': 1,
-                    'Age': 25,
-                    'Fare': 100
-                }
-            })
-        
-        # Handle POST request
-        data = request.json
-        
-        # Mock prediction based on input rules
-        survival_prob = 0.5
-        
-        if data.get('Sex') == 'female':
-            survival_prob += 0.3
-        if data.get('Pclass') == 1:
-            survival_prob += 0.2
-        if data.get('Age', 30) < 16:
-            survival_prob += 0.1
-        if data.get('Fare', 0) > 50:
-            survival_prob += 0.1
-            
-        survival_prob = max(0.1, min(0.9, survival_prob))
-        prediction = 1 if survival_prob > 0.5 else 0
-        
+        predictor = survival_predictor(dataset_store.current())
+        labels, probabilities = predict_batcher.predict_passengers(predictor, passengers)
+    except ModelNotReady as e:
+        return training_response(e.job)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"❌ Prediction failed: {e}")
+        return jsonify({'error': f'Prediction failed: {str(e)}'}), 500
+    
+    model_info = {'model_version': predictor.key, 'data_version': predictor.data_version}
+    if single:
+        probability = float(probabilities[0])
         return jsonify({
-            'prediction': prediction,
-            'survival_probability': round(survival_prob, 3),
-            'confidence': 'high' if abs(survival_prob - 0.5) > 0.3 else 'medium',
-            'factors_considered': ['Sex', 'Pclass', 'Age', 'Fare'],
-            'note': 'This is a rule-based mock prediction'
+            'prediction': int(labels[0]),
+            'survival_probability': round(probability, 3),
+            'confidence': prediction_confidence(probability),
+            'factors_considered': predictor.feature_columns,
+            **model_info
         })
+    
+    return jsonify({
+        'predictions': labels,
+        'survival_probabilities': probabilities.round(3),
+        'count': len(labels),
+        **model_info
+    })
+
+def manifest_upload():
+    """(file, format) of an uploaded manifest: a multipart 'file' field or the raw request body.
+
+    The upload is spooled to a temporary file owned by the response stream: Parquet needs a
+    seekable file, and Flask closes the request's own files before the stream is consumed.
+    """
+    file = tempfile.TemporaryFile()
+    upload = request.files.get('file')
+    if upload is not None:
+        name, mimetype = upload.filename or '', upload.mimetype or ''
+        shutil.copyfileobj(upload.stream, file)
+    else:
+        name, mimetype = '', request.mimetype or ''
+        shutil.copyfileobj(request.stream, file)
+    file.seek(0)
+    
+    manifest_format = request.args.get('input')
+    if manifest_format is None:
+        manifest_format = 'parquet' if name.endswith('.parquet') or 'parquet' in mimetype else 'csv'
+    return file, manifest_format
+
+@app.route('/api/regression/score', methods=['POST'])
+def score_manifest_upload():
+    """Score an uploaded CSV/Parquet passenger manifest and stream the predictions back.
+
+    Raw manifests (Name, Age, Fare, ... as in train.csv) are cleaned chunk by chunk like
+    the training data. ?format=ndjson|csv picks the result format; SCORE_WORKERS > 1
+    scores the chunks in parallel.
+    """
+    result_format = request.args.get('format', 'ndjson')
+    if result_format not in RESULT_FORMATS:
+        return jsonify({'error': f"Unknown result format '{result_format}', expected one of {', '.join(RESULT_FORMATS)}"}), 400
+    
+    try:
+        file, manifest_format = manifest_upload()
+        if manifest_format not in MANIFEST_FORMATS:
+            raise ValueError(f"Unknown manifest format '{manifest_format}', expected one of {', '.join(MANIFEST_FORMATS)}")
+        if manifest_format == 'parquet':
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                return jsonify({'error': 'Parquet manifests need pyarrow installed'}), 406
+        
+        # Read the first chunk now, so an unreadable file or missing columns still answer 400
+        # (read_manifest closes the file once it is read to the end or dropped)
+        chunks = read_manifest(file, manifest_format)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError('The manifest has no rows')
+        check_manifest_columns(first)
+    except ValueError as e:
+        return jsonify({'error': f'Could not read the manifest: {str(e)}'}), 400
+    
+    try:
+        predictor = survival_predictor(dataset_store.current())
+    except ModelNotReady as e:
+        chunks.close()
+        return training_response(e.job)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        chunks.close()
+        print(f"❌ Bulk scoring failed: {e}")
+        return jsonify({'error': f'Model unavailable: {str(e)}'}), 500
+    
+    results = score_manifest(itertools.chain([first], chunks), predictor, store_dir=model_registry.store_dir)
+    response = app.response_class(encode_results(results, result_format, serialize_rows), mimetype=RESULT_FORMATS[result_format])
+    response.headers['X-Model-Version'] = predictor.key
+    return response
 
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({
+    return cached_json('health', lambda dataset: build_health(dataset.df))
+
+def build_health(cleaned_df):
+    return {
         'status': 'healthy',
         'dataset_size': list(cleaned_df.shape),
         'columns': list(cleaned_df.columns),
-        'missing_values': convert_to_serializable(cleaned_df.isnull().sum().to_dict())
-    })
+        'missing_values': cleaned_df.isnull().sum()
+    }
 
 if __name__ == '__main__':
     # app.run(debug=True, port=5000)
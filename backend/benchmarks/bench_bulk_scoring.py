@@ -0,0 +1,69 @@
+# bench_bulk_scoring.py
+"""Throughput and memory of bulk manifest scoring behind /api/regression/score.
+
+Writes train.csv scaled up to the requested number of rows as a CSV manifest, then
+scores it chunk by chunk (read, clean, validate, predict, encode NDJSON) in the
+request thread and with a pool of worker processes. Reports rows per second and the
+peak traced memory of the request process, which stays flat as the file grows.
+
+Usage (from backend/):
+    python benchmarks/bench_bulk_scoring.py [rows ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from flask import Flask
+
+from bulk_scoring import encode_results, read_manifest, score_manifest
+from data_cleaning import clean_titanic_data
+from json_provider import FrameJSONProvider
+from model_registry import ModelRegistry, dataset_fingerprint
+from predictor import SurvivalPredictor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def score_file(path, predictor, workers, store_dir, serialize_rows):
+    with open(path, 'rb') as file:
+        results = score_manifest(read_manifest(file, 'csv'), predictor, workers=workers, store_dir=store_dir)
+        return sum(len(chunk) for chunk in encode_results(results, 'ndjson', serialize_rows))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    raw = pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))
+    store_dir = tempfile.mkdtemp()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cleaned = clean_titanic_data(raw)
+        predictor = SurvivalPredictor(ModelRegistry(store_dir).get_or_train(cleaned, dataset_fingerprint(cleaned)))
+    serialize_rows = FrameJSONProvider(Flask(__name__)).dumps_rows
+
+    worker_counts = sorted({1, 2, os.cpu_count() or 1})
+    print(f"{'rows':>9} {'workers':>7} {'time':>9} {'rows/s':>10} {'peak memory':>12} {'output':>10}")
+    for size in sizes:
+        path = os.path.join(store_dir, f'manifest-{size}.csv')
+        pd.concat([raw] * (size // len(raw) + 1), ignore_index=True)[:size].to_csv(path, index=False)
+        for workers in worker_counts:
+            start = time.perf_counter()
+            output = score_file(path, predictor, workers, store_dir, serialize_rows)
+            elapsed = time.perf_counter() - start
+
+            # Memory in a separate pass: tracemalloc slows the timed one down
+            tracemalloc.start()
+            score_file(path, predictor, workers, store_dir, serialize_rows)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{size:>9,} {workers:>7} {elapsed:>8.2f}s {size / elapsed:>10,.0f} "
+                  f"{peak / 2**20:>10.1f}MB {output / 2**20:>8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
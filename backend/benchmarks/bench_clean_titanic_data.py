@@ -0,0 +1,99 @@
+# bench_clean_titanic_data.py
+"""Compare the schema-driven cleaner with the previous string-round-trip cleaner.
+
+Reports wall time and peak traced memory on train.csv scaled up, both as read from
+CSV (already numeric) and as delivered by Supabase (numbers as strings).
+
+Usage (from backend/):
+    python benchmarks/bench_clean_titanic_data.py [scale ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from data_cleaning import clean_titanic_data
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_clean_titanic_data(df):
+    """The previous cleaner, kept here as the benchmark baseline"""
+    clean_df = df.copy()
+    print(f"🔧 Data types before cleaning: {clean_df.dtypes}")
+    numeric_columns = ['Age', 'Fare', 'SibSp', 'Parch', 'Pclass', 'Survived', 'PassengerId']
+    for col in numeric_columns:
+        if col in clean_df.columns:
+            clean_df[col] = pd.to_numeric(clean_df[col].astype(str), errors='coerce')
+            print(f"   Converted {col} from {df[col].dtype} to {clean_df[col].dtype}")
+    if 'Age' in clean_df.columns:
+        clean_df['Age'] = clean_df['Age'].fillna(clean_df['Age'].median())
+    if 'Embarked' in clean_df.columns:
+        clean_df['Embarked'] = clean_df['Embarked'].fillna(clean_df['Embarked'].mode()[0] if not clean_df['Embarked'].mode().empty else 'S')
+    if 'Fare' in clean_df.columns:
+        clean_df['Fare'] = clean_df['Fare'].fillna(clean_df['Fare'].median())
+    if 'Name' in clean_df.columns:
+        clean_df['Title'] = clean_df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
+        title_mapping = {
+            'Mr': 'Mr', 'Miss': 'Miss', 'Mrs': 'Mrs', 'Master': 'Master',
+            'Dr': 'Officer', 'Rev': 'Officer', 'Col': 'Officer', 'Major': 'Officer',
+            'Mlle': 'Miss', 'Ms': 'Miss', 'Lady': 'Royalty', 'Countess': 'Royalty',
+            'Don': 'Royalty', 'Dona': 'Royalty', 'Mme': 'Mrs', 'Sir': 'Royalty',
+            'Jonkheer': 'Royalty', 'Capt': 'Officer'
+        }
+        clean_df['Title'] = clean_df['Title'].map(title_mapping)
+        clean_df['Title'] = clean_df['Title'].fillna('Other')
+    if 'SibSp' in clean_df.columns and 'Parch' in clean_df.columns:
+        clean_df['SibSp'] = pd.to_numeric(clean_df['SibSp'].astype(str), errors='coerce').fillna(0)
+        clean_df['Parch'] = pd.to_numeric(clean_df['Parch'].astype(str), errors='coerce').fillna(0)
+        clean_df['FamilySize'] = clean_df['SibSp'] + clean_df['Parch'] + 1
+        clean_df['IsAlone'] = (clean_df['FamilySize'] == 1).astype(int)
+    columns_to_drop = ['Cabin', 'Ticket', 'Name', 'id', 'created_at']
+    clean_df = clean_df.drop(columns=[col for col in columns_to_drop if col in clean_df.columns])
+    print(f"✅ Data cleaning complete. Final shape: {clean_df.shape}")
+    print(f"🔧 Data types after cleaning: {clean_df.dtypes}")
+    return clean_df
+
+
+def measure(fn, df):
+    """Wall time of a plain run, then peak traced memory of a second run (tracing slows it down)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn(df)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        fn(df)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    base = pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))
+
+    print(f"{'rows':>10} {'input':>9} | {'legacy s':>9} {'legacy MB':>10} | {'schema s':>9} {'schema MB':>10}")
+    for scale in scales:
+        csv_df = pd.concat([base] * scale, ignore_index=True)
+        # Supabase rows arrive as JSON, so numbers may come through as strings
+        supabase_df = csv_df.astype(object).where(csv_df.notna(), None)
+        for col in ['Age', 'Fare', 'SibSp', 'Parch', 'Pclass', 'Survived', 'PassengerId']:
+            supabase_df[col] = supabase_df[col].map(lambda v: None if v is None else str(v))
+
+        for label, df in (('csv', csv_df), ('supabase', supabase_df)):
+            old, old_s, old_peak = measure(legacy_clean_titanic_data, df)
+            new, new_s, new_peak = measure(clean_titanic_data, df)
+            pd.testing.assert_frame_equal(old, new, check_dtype=label == 'csv')
+            print(f"{len(df):>10} {label:>9} | {old_s:>9.3f} {old_peak / 2**20:>10.1f} | "
+                  f"{new_s:>9.3f} {new_peak / 2**20:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
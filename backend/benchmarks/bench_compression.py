@@ -0,0 +1,64 @@
+# bench_compression.py
+"""Bytes on the wire and CPU per request of the pre-compressed response cache.
+
+For response bodies of growing size (the correlation matrix and row JSON of train.csv
+scaled up) it reports the identity, gzip and brotli sizes, the cost of compressing the
+body on every request (what turning on plain compression would do) and the cost of
+serving the variant kept in the cache.
+
+Usage (from backend/):
+    python benchmarks/bench_compression.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from flask import Flask
+
+from compression import STREAM_LEVELS, available_encodings, compress
+from data_cleaning import clean_titanic_data, compact_frame
+from json_provider import FrameJSONProvider
+from response_cache import CachedResponse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = compact_frame(clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+    provider = FrameJSONProvider(Flask(__name__))
+
+    bodies = {
+        'correlation': provider.dumps(base.select_dtypes('number').corr().to_dict()).encode(),
+        'rows x891': provider.dumps({'data': base}).encode(),
+        'rows x8910': provider.dumps({'data': pd.concat([base] * 10, ignore_index=True)}).encode(),
+    }
+
+    print(f"{'body':<12} {'encoding':>8} {'bytes':>11} {'ratio':>6} {'per request':>12} {'cached':>9}")
+    for name, body in bodies.items():
+        print(f"{name:<12} {'identity':>8} {len(body):>11,}")
+        for encoding in available_encodings():
+            entry = CachedResponse(body)
+            compressed, _ = entry.variant(encoding)
+            per_request = best_of(lambda: compress(body, encoding, STREAM_LEVELS[encoding]), 5)
+            cached = best_of(lambda: entry.variant(encoding), 1000)
+            print(f"{'':<12} {encoding:>8} {len(compressed):>11,} {len(body) / len(compressed):>5.1f}x "
+                  f"{per_request * 1e3:>10.2f}ms {cached * 1e6:>7.2f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# bench_data_index.py
+"""Compare /api/data filters on a boolean mask of the frame with the bitmap/sorted DataIndex.
+
+For train.csv scaled up it resolves a few filter/sort queries both ways and reports
+the best time of each, plus the one-off index build time.
+
+Usage (from backend/):
+    python benchmarks/bench_data_index.py [scale ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_titanic_data, compact_frame
+from data_index import DataIndex, DataQuery
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = {
+    'Sex=female&Pclass=1': lambda df: df[(df['Sex'] == 'female') & (df['Pclass'] == 1)],
+    'Sex=female&Pclass=1&Age>=18&sort=-Fare': lambda df: df[
+        (df['Sex'] == 'female') & (df['Pclass'] == 1) & (df['Age'] >= 18)
+    ].sort_values('Fare', ascending=False, kind='stable'),
+    'Embarked=C,Q&SibSp>=1&Fare>50': lambda df: df[
+        df['Embarked'].isin(['C', 'Q']) & (df['SibSp'] >= 1) & (df['Fare'] > 50)
+    ],
+}
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or [1, 100, 1000]
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = compact_frame(clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+
+    print(f"{'rows':>8} {'query':<42} {'mask scan':>10} {'index':>10} {'matches':>9}")
+    for scale in scales:
+        df = compact_frame(pd.concat([base] * scale, ignore_index=True))
+        df['PassengerId'] = np.arange(1, len(df) + 1, dtype=np.int32)
+        with contextlib.redirect_stdout(io.StringIO()):
+            build, index = best_of(lambda: DataIndex.from_frame(df), 1)
+        repeat = 10 if scale < 1000 else 3
+
+        for text, scan in QUERIES.items():
+            query = DataQuery.parse(text)
+            scanned, expected = best_of(lambda: scan(df).index.to_numpy(), repeat)
+            indexed, positions = best_of(lambda: index.positions(query), repeat)
+            assert np.array_equal(positions, expected), text
+            print(f"{len(df):>8} {text:<42} {scanned * 1e3:>8.2f}ms {indexed * 1e3:>8.2f}ms {len(positions):>9}")
+        print(f"{len(df):>8} {'(index build)':<42} {'':>10} {build * 1e3:>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# bench_data_pages.py
+"""Compare serializing each /api/data page per request with slicing pre-serialized row blocks.
+
+For train.csv scaled up it reports, for the first and the last page at two page sizes,
+the per-request cost of iloc + to_dict + JSON encoding and of slicing the row blocks
+(offset pages and cursor pages), plus the one-off cost of serializing the blocks.
+
+Usage (from backend/):
+    python benchmarks/bench_data_pages.py [scale ...]
+"""
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from data_cleaning import clean_titanic_data, compact_frame
+from row_blocks import DataPages
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def to_json(record):
+    record = {key: None if isinstance(value, float) and math.isnan(value) else value for key, value in record.items()}
+    return json.dumps(record, sort_keys=True, separators=(',', ':'), default=int).encode()
+
+
+def serialize(df):
+    return [to_json(record) for record in df.to_dict('records')]
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = compact_frame(clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+
+    print(f"{'rows':>8} {'per_page':>8} {'page':>6} {'per request':>12} {'row blocks':>11} {'cursor':>9} {'build':>8}")
+    for scale in scales:
+        df = pd.concat([base] * scale, ignore_index=True)
+        df['PassengerId'] = range(1, len(df) + 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            pages = DataPages.from_frame(df, serialize)
+            build = time.perf_counter() - start
+
+        for per_page in (10, 1000):
+            last = (len(df) - 1) // per_page
+            for page in (0, last):
+                start_idx = page * per_page
+                stop_idx = min(start_idx + per_page, len(df))
+                naive = best_of(lambda: b','.join(serialize(df.iloc[start_idx:stop_idx])), 5)
+                sliced = best_of(lambda: pages.page(start_idx, stop_idx), 50)
+                after = None if page == 0 else int(df['PassengerId'].iloc[start_idx - 1])
+                cursor = best_of(lambda: pages.after(after, per_page), 50)
+                print(f"{len(df):>8} {per_page:>8} {page + 1:>6} {naive * 1e3:>10.3f}ms {sliced * 1e6:>9.1f}us "
+                      f"{cursor * 1e6:>7.1f}us {build:>7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# bench_export.py
+"""Throughput and peak memory of the streamed /api/data/export formats.
+
+For train.csv scaled up it drains export_stream() for every format (the chunks are
+dropped as a socket would send them) and reports rows/s, MB/s and the peak memory
+allocated while streaming, which should follow the chunk size and not the row count.
+ndjson is cut from the row blocks the app already keeps per dataset version.
+
+Usage (from backend/):
+    python benchmarks/bench_export.py [scale ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from flask import Flask
+
+from data_cleaning import clean_titanic_data, compact_frame
+from data_export import EXPORT_FORMATS, EXPORT_CHUNK_ROWS, export_stream
+from json_provider import FrameJSONProvider
+from row_blocks import RowBlock
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def drain(stream):
+    total = 0
+    for chunk in stream:
+        total += len(chunk)
+    return total
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or [10, 100, 500]
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = compact_frame(clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+    provider = FrameJSONProvider(Flask(__name__))
+
+    print(f"chunks of {EXPORT_CHUNK_ROWS} rows")
+    print(f"{'rows':>8} {'format':>8} {'bytes':>14} {'rows/s':>12} {'MB/s':>8} {'peak memory':>12}")
+    for scale in scales:
+        df = compact_frame(pd.concat([base] * scale, ignore_index=True))
+        # Built once per dataset version by the app (see data_pages), not per export
+        rows = RowBlock.from_rows(provider.dumps_rows(df))
+        for export_format in EXPORT_FORMATS:
+            start = time.perf_counter()
+            total = drain(export_stream(df, export_format, rows))
+            seconds = time.perf_counter() - start
+
+            # Separate pass, tracemalloc slows the serialization down
+            tracemalloc.start()
+            drain(export_stream(df, export_format, rows))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{len(df):>8} {export_format:>8} {total:>14,} {len(df) / seconds:>12,.0f} "
+                  f"{total / seconds / 1e6:>8.1f} {peak / 1e6:>10.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
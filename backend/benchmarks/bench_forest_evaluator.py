@@ -0,0 +1,64 @@
+# bench_forest_evaluator.py
+"""Latency of the compiled forest evaluator against sklearn's predict_proba.
+
+Trains the default survival model on train.csv, flattens it into node arrays and scores
+feature matrices of 1 to 100k passengers both ways, checking that the probabilities are
+identical. Also reports the flattening time and the size of the arrays. The crossover
+where sklearn becomes faster is what FOREST_EVAL_MAX_ROWS is set from.
+
+Usage (from backend/):
+    python benchmarks/bench_forest_evaluator.py [batch size ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_titanic_data
+from forest_evaluator import CompiledForest
+from model_registry import prepare_features, train_survival_model
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100, 1000, 10_000, 100_000]
+    with contextlib.redirect_stdout(io.StringIO()):
+        cleaned = clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv')))
+        artifact = train_survival_model(cleaned)
+    model = artifact['model']
+    features = prepare_features(cleaned, artifact['encoders'])[0][artifact['feature_columns']]
+
+    start = time.perf_counter()
+    forest = CompiledForest.from_model(model)
+    print(f"flattened {len(model.estimators_)} trees ({len(forest.feature):,} nodes, depth {forest.depth}) "
+          f"in {(time.perf_counter() - start) * 1e3:.1f}ms, {forest.nbytes / 2**20:.1f}MB")
+
+    print(f"{'batch':>7} {'sklearn':>10} {'compiled':>10} {'speed-up':>9} {'identical':>10}")
+    for size in sizes:
+        batch = features.iloc[np.arange(size) % len(features)]
+        repeat = 50 if size <= 100 else 3
+        identical = np.array_equal(forest.predict_proba(batch), model.predict_proba(batch))
+        sklearn_time = best_of(lambda: model.predict_proba(batch), repeat)
+        compiled_time = best_of(lambda: forest.predict_proba(batch), repeat)
+        print(f"{size:>7} {sklearn_time * 1e3:>8.2f}ms {compiled_time * 1e3:>8.2f}ms "
+              f"{sklearn_time / compiled_time:>8.1f}x {str(identical):>10}")
+
+
+if __name__ == '__main__':
+    main()
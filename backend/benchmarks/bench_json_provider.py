@@ -0,0 +1,86 @@
+# bench_json_provider.py
+"""Compare the recursive convert_to_serializable helper with FrameJSONProvider.
+
+For train.csv scaled to 10k-1M rows it reports the time to serialize the frame as a
+list of records the old way (to_dict('records'), the helper on every record, then
+json.dumps) and through the column-wise provider, with rows per second for both.
+
+Usage (from backend/):
+    python benchmarks/bench_json_provider.py [rows ...]
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+
+from data_cleaning import clean_titanic_data, compact_frame
+from json_provider import FrameJSONProvider
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def convert_to_serializable(obj):
+    """The helper app.py used before FrameJSONProvider, kept here for comparison"""
+    if pd.isna(obj):
+        return None
+    elif isinstance(obj, (np.integer, np.int64, np.int32)):
+        return int(obj)
+    elif isinstance(obj, (np.floating, np.float64, np.float32)):
+        return float(obj)
+    elif isinstance(obj, (bool, np.bool_)):
+        return bool(obj)
+    elif isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    elif isinstance(obj, (list, tuple)):
+        return [convert_to_serializable(item) for item in obj]
+    elif isinstance(obj, dict):
+        return {key: convert_to_serializable(value) for key, value in obj.items()}
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    else:
+        return obj
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = compact_frame(clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+    provider = FrameJSONProvider(Flask(__name__))
+
+    def helper(df):
+        records = [convert_to_serializable(record) for record in df.to_dict('records')]
+        return json.dumps(records, sort_keys=True, separators=(',', ':'))
+
+    def column_wise(df):
+        return provider.dumps(df, separators=(',', ':'))
+
+    print(f"{'rows':>9} {'helper':>10} {'provider':>10} {'helper rows/s':>14} {'provider rows/s':>16} {'speed-up':>9}")
+    for size in sizes:
+        df = pd.concat([base] * (size // len(base) + 1), ignore_index=True).iloc[:size]
+        assert helper(df) == column_wise(df)
+        repeat = 3 if size <= 100_000 else 1
+
+        old = best_of(lambda: helper(df), repeat)
+        new = best_of(lambda: column_wise(df), repeat)
+        print(f"{size:>9} {old:>9.3f}s {new:>9.3f}s {size / old:>14,.0f} {size / new:>16,.0f} {old / new:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# bench_predict.py
+"""Throughput of the batch predict path behind /api/regression/predict.
+
+Trains the default survival model on train.csv, then scores batches of 1 to 100k
+passenger dicts (validation, feature engineering and one predict_proba call) and
+reports passengers per second. Up to 1000 passengers it also times scoring them one
+call per passenger, which is what the old single-passenger endpoint forced.
+
+Usage (from backend/):
+    python benchmarks/bench_predict.py [batch size ...]
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from data_cleaning import clean_titanic_data
+from model_registry import train_survival_model
+from predictor import SurvivalPredictor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100, 1000, 10_000, 100_000]
+    with contextlib.redirect_stdout(io.StringIO()):
+        cleaned = clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv')))
+        predictor = SurvivalPredictor(train_survival_model(cleaned))
+
+    # Passengers as a client would send them: plain JSON objects
+    fields = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked', 'Title']
+    records = json.loads(cleaned[fields].to_json(orient='records'))
+
+    print(f"{'batch':>7} {'batch call':>11} {'passengers/s':>13} {'one call each':>14} {'passengers/s':>13}")
+    for size in sizes:
+        batch = (records * (size // len(records) + 1))[:size]
+        repeat = 5 if size <= 10_000 else 2
+        batched = best_of(lambda: predictor.predict_passengers(batch), repeat)
+        line = f"{size:>7} {batched * 1e3:>9.1f}ms {size / batched:>13,.0f}"
+        if size <= 1000:
+            single = best_of(lambda: [predictor.predict_passengers([passenger]) for passenger in batch], 1)
+            line += f" {single * 1e3:>12.1f}ms {size / single:>13,.0f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# bench_predict_batching.py
+"""Latency and throughput of concurrent single-passenger predicts, batched vs unbatched.
+
+Trains the default survival model on train.csv, then runs N client threads that each
+send single-passenger predict calls back to back for a few seconds: once straight
+through SurvivalPredictor (one predict_proba per call, what the endpoint did before)
+and once through the PredictBatcher. Reports p50/p99 latency per call and calls per
+second for each concurrency level.
+
+Usage (from backend/):
+    python benchmarks/bench_predict_batching.py [clients ...]
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_titanic_data
+from model_registry import train_survival_model
+from predict_batcher import PredictBatcher
+from predictor import SurvivalPredictor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DURATION = 3.0
+
+
+def run_clients(predict, records, clients):
+    """Per-call latencies (seconds) and calls per second of ``clients`` closed-loop threads"""
+    latencies = [[] for _ in range(clients)]
+    stop = time.perf_counter() + DURATION
+
+    def client(n):
+        i = n
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            predict([records[i % len(records)]])
+            latencies[n].append(time.perf_counter() - start)
+            i += clients
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = np.concatenate([np.array(values) for values in latencies])
+    return latencies, len(latencies) / elapsed
+
+
+def main():
+    client_counts = [int(arg) for arg in sys.argv[1:]] or [1, 8, 32, 64]
+    with contextlib.redirect_stdout(io.StringIO()):
+        cleaned = clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv')))
+        predictor = SurvivalPredictor(train_survival_model(cleaned))
+
+    fields = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked', 'Title']
+    records = json.loads(cleaned[fields].to_json(orient='records'))
+    batcher = PredictBatcher()
+    paths = {
+        'unbatched': predictor.predict_passengers,
+        'batched': lambda passengers: batcher.predict_passengers(predictor, passengers),
+    }
+
+    print(f"{'clients':>7} {'path':>10} {'p50':>9} {'p99':>9} {'calls/s':>9} {'batch':>6}")
+    for clients in client_counts:
+        for name, predict in paths.items():
+            batches, requests = batcher.batches, batcher.requests
+            latencies, throughput = run_clients(predict, records, clients)
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+            mean_batch = ((batcher.requests - requests) / (batcher.batches - batches)
+                          if name == 'batched' and batcher.batches > batches else 1)
+            print(f"{clients:>7} {name:>10} {p50:>7.1f}ms {p99:>7.1f}ms {throughput:>9,.0f} {mean_batch:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# bench_prediction_table.py
+"""Build cost, memory, accuracy loss and speed of the precomputed prediction table.
+
+Trains the default survival model on train.csv and builds its PredictionTable with one
+thread and with every CPU. The table then scores the train.csv passengers and is
+compared to exact scoring: how many fall on the grid, how far the probabilities move
+and how many predicted labels flip. Finally it times batches of passengers through the
+table and through the model.
+
+Usage (from backend/):
+    python benchmarks/bench_prediction_table.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_titanic_data
+from model_registry import train_survival_model
+from prediction_table import PredictionTable
+from predictor import SurvivalPredictor, prepare_passengers
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):
+        cleaned = clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv')))
+        artifact = train_survival_model(cleaned)
+    exact = SurvivalPredictor(artifact)
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        table = PredictionTable.build(exact, workers=workers)
+        print(f"build with {workers} thread(s): {time.perf_counter() - start:.1f}s")
+    print(f"table: {table.probabilities.size:,} cells, {table.nbytes / 2**20:.1f}MB, shape {table.probabilities.shape}")
+
+    frame, _ = prepare_passengers(cleaned)
+    lookup = SurvivalPredictor(artifact, table)
+    exact_labels, exact_probabilities = exact.predict(frame)
+    labels, probabilities = lookup.predict(frame)
+    hit = table.lookup(frame, exact.encoders)[1]
+    difference = np.abs(probabilities - exact_probabilities)[hit]
+    print(f"train.csv: {hit.mean():.1%} on the grid; probability difference mean {difference.mean():.4f}, "
+          f"p99 {np.percentile(difference, 99):.4f}, max {difference.max():.4f}; "
+          f"labels flipped {np.mean(labels != exact_labels):.2%}")
+    if 'Survived' in cleaned.columns:
+        survived = cleaned['Survived'].to_numpy()
+        print(f"accuracy on train.csv: exact {np.mean(exact_labels == survived):.3f}, "
+              f"table {np.mean(labels == survived):.3f}")
+
+    on_grid = frame[hit].reset_index(drop=True)
+    print(f"{'batch':>7} {'model':>10} {'table':>10} {'speed-up':>9}")
+    for size in (1, 100, 10_000, 100_000):
+        batch = on_grid.iloc[np.arange(size) % len(on_grid)].reset_index(drop=True)
+        repeat = 20 if size <= 100 else 3
+        model_time = best_of(lambda: exact.predict(batch), repeat)
+        table_time = best_of(lambda: lookup.predict(batch), repeat)
+        print(f"{size:>7} {model_time * 1e3:>8.2f}ms {table_time * 1e3:>8.2f}ms {model_time / table_time:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
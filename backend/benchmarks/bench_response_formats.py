@@ -0,0 +1,61 @@
+# bench_response_formats.py
+"""Compare payload size and serialization time of the /api/data response formats.
+
+For train.csv scaled up it serializes the whole frame as row JSON (one object per row,
+as /api/data?format=json would for an uncached bulk pull), as columnar JSON and as an
+Arrow IPC stream, and reports bytes and the best time of each.
+
+Usage (from backend/):
+    python benchmarks/bench_response_formats.py [scale ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from flask import Flask
+
+from data_cleaning import clean_titanic_data, compact_frame
+from json_provider import FrameJSONProvider
+from response_formats import columnar, arrow_stream
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = compact_frame(clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+    provider = FrameJSONProvider(Flask(__name__))
+
+    formats = {
+        'rows': lambda df: provider.dumps({'data': df}, separators=(',', ':')).encode(),
+        'columns': lambda df: provider.dumps(columnar(df), separators=(',', ':')).encode(),
+        'arrow': arrow_stream,
+    }
+
+    print(f"{'rows':>8} {'format':>8} {'bytes':>12} {'time':>10}")
+    for scale in scales:
+        df = pd.concat([base] * scale, ignore_index=True)
+        df = compact_frame(df)
+        repeat = 5 if scale < 100 else 2
+        for name, serialize in formats.items():
+            seconds, body = best_of(lambda: serialize(df), repeat)
+            print(f"{len(df):>8} {name:>8} {len(body):>12,} {seconds * 1e3:>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# bench_startup.py
+"""Measure backend startup: module import time, time until the port accepts
+connections, time to first byte of /api/test and time until /api/ready is 200.
+
+Runs app.py in a subprocess for each startup mode, with a cold (empty) and a warm
+snapshot directory.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def import_time(env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import app'], cwd=BACKEND_DIR, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def get_status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def serve_timings(env, timeout=120):
+    port = free_port()
+    env = dict(env, PORT=str(port))
+    base = f'http://127.0.0.1:{port}'
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    timings = {}
+    try:
+        while time.perf_counter() - start < timeout:
+            if 'bind' not in timings:
+                try:
+                    socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                    timings['bind'] = time.perf_counter() - start
+                except OSError:
+                    time.sleep(0.01)
+                    continue
+            if 'first_byte' not in timings and get_status(f'{base}/api/test') == 200:
+                timings['first_byte'] = time.perf_counter() - start
+            if get_status(f'{base}/api/ready') == 200:
+                timings['ready'] = time.perf_counter() - start
+                break
+            time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+    return timings
+
+
+def main():
+    print(f"{'mode':>10} {'snapshot':>8} | {'import s':>8} {'bind s':>8} {'ttfb s':>8} {'ready s':>8}")
+    for mode in ('eager', 'background'):
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            env = dict(os.environ, STARTUP_MODE=mode, SNAPSHOT_DIR=snapshot_dir, SYNC_INTERVAL_SECONDS='0')
+            for snapshot in ('cold', 'warm'):
+                if snapshot == 'cold':
+                    imported = import_time(env)  # also writes the snapshot for the warm run
+                    for name in os.listdir(snapshot_dir):
+                        subprocess.run(['rm', '-rf', os.path.join(snapshot_dir, name)], check=True)
+                else:
+                    imported = import_time(env)
+                timings = serve_timings(env)
+                print(f"{mode:>10} {snapshot:>8} | {imported:>8.3f} {timings.get('bind', float('nan')):>8.3f} "
+                      f"{timings.get('first_byte', float('nan')):>8.3f} {timings.get('ready', float('nan')):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# bench_summary.py
+"""Compare the exact describe() summary with the sketch-based summary as the data grows.
+
+For train.csv scaled up to 1000x it reports the per-request cost of describe(), of
+answering from an existing SummarySketch, and of folding a fresh batch of 891 rows
+into it, plus the one-off build time and the worst percentile rank error.
+
+Usage (from backend/):
+    python benchmarks/bench_summary.py [scale ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_titanic_data, compact_frame
+from quantile_sketch import SummarySketch, DESCRIBE_PERCENTILES
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def rank_error(df, described):
+    """Worst distance, as a fraction of the rows, between a sketched percentile's rank and its target"""
+    worst = 0.0
+    for col, stats in described.items():
+        values = np.sort(df[col].to_numpy(dtype=np.float64))
+        for name, q in DESCRIBE_PERCENTILES.items():
+            low = np.searchsorted(values, stats[name], side='left') / len(values)
+            high = np.searchsorted(values, stats[name], side='right') / len(values)
+            worst = max(worst, low - q, q - high, 0.0)
+    return worst
+
+
+def main():
+    scales = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100, 1000]
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = compact_frame(clean_titanic_data(pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+
+    print(f"{'rows':>10} {'describe()':>12} {'sketch query':>13} {'+891 rows':>11} {'sketch build':>13} {'rank error':>11}")
+    for scale in scales:
+        df = pd.concat([base] * scale, ignore_index=True)
+        repeat = 5 if scale < 100 else 2
+
+        exact = best_of(lambda: df.describe().to_dict(), repeat)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            sketch = SummarySketch.from_frame(df)
+            build = time.perf_counter() - start
+        query = best_of(sketch.describe, 20)
+        update = best_of(lambda: sketch.update(base), 5)
+
+        print(f"{len(df):>10} {exact * 1e3:>10.2f}ms {query * 1e3:>11.3f}ms {update * 1e3:>9.2f}ms "
+              f"{build:>12.3f}s {rank_error(df, sketch.describe()):>11.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# bench_supabase_loader.py
+"""Benchmark the paged Supabase loader against a local PostgREST stand-in.
+
+Usage (from backend/):
+    python benchmarks/bench_supabase_loader.py [scale] [latency_ms]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from supabase_loader import PagedTableLoader
+from benchmarks.postgrest_stub import PostgrestStub
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def scaled_records(scale):
+    df = pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))
+    df = pd.concat([df] * scale, ignore_index=True)
+    df.insert(0, 'id', np.arange(1, len(df) + 1))
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.02
+    records = scaled_records(scale)
+    print(f"Table: {len(records)} rows, page limit 1000, {latency * 1000:.0f} ms per request")
+
+    with PostgrestStub({'Project_1': records}, latency=latency) as stub:
+        # Old behaviour: one unpaged select, silently truncated at the page limit
+        start = time.perf_counter()
+        single = PagedTableLoader(stub.url, 'key', 'Project_1', page_size=1000).fetch_page_after(None)
+        print(f"single select : {len(single):>8} rows  {time.perf_counter() - start:.3f}s")
+
+        for mode, workers in (('keyset', 1), ('range', 1), ('range', 4), ('range', 8)):
+            loader = PagedTableLoader(stub.url, 'key', 'Project_1', max_workers=workers)
+            if mode == 'keyset':
+                loader.count_rows = lambda: None
+            df = loader.load()
+            assert len(df) == len(records) and df['id'].is_monotonic_increasing
+            print(f"{mode:>6} x{workers:<6}: {loader.stats['rows']:>8} rows  {loader.stats['seconds']:.3f}s  "
+                  f"{loader.stats['rows_per_sec']:>10} rows/sec")
+
+
+if __name__ == '__main__':
+    main()
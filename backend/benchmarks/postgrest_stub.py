@@ -0,0 +1,93 @@
+# postgrest_stub.py
+"""Local stand-in for the Supabase REST API (PostgREST) serving in-memory tables.
+
+Supports the subset the backend uses: ``select``, ``order=<col>.asc|desc``,
+``limit``/``offset``, ``<col>=gt.<value>`` filters and ``Prefer: count=exact``.
+Responses are capped at ``max_rows`` just like a real PostgREST instance.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class PostgrestStub:
+    def __init__(self, tables, max_rows=1000, latency=0.0, host='127.0.0.1', port=0):
+        self.tables = tables  # {table_name: [record, ...]}
+        self.max_rows = max_rows
+        self.latency = latency
+        self.requests = 0
+        self._sorted = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, headers, body = stub.handle(self.path, self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f'http://{host}:{self.server.server_address[1]}'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def handle(self, path, headers):
+        parsed = urlparse(path)
+        parts = parsed.path.strip('/').split('/')
+        if len(parts) != 3 or parts[:2] != ['rest', 'v1'] or parts[2] not in self.tables:
+            return 404, {'Content-Type': 'application/json'}, b'{"message": "not found"}'
+
+        rows = self.tables[parts[2]]
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+        for col, expr in query.items():
+            if col in ('select', 'order', 'limit', 'offset'):
+                continue
+            op, _, value = expr.partition('.')
+            if op == 'gt':
+                rows = [row for row in rows if row.get(col) is not None and row[col] > type(row[col])(value)]
+
+        if 'order' in query:
+            col, _, direction = query['order'].partition('.')
+            if rows is self.tables[parts[2]]:
+                # Unfiltered scans reuse one sorted copy per ordering
+                cache_key = (parts[2], query['order'])
+                if cache_key not in self._sorted:
+                    self._sorted[cache_key] = sorted(rows, key=lambda row: row.get(col), reverse=direction == 'desc')
+                rows = self._sorted[cache_key]
+            else:
+                rows = sorted(rows, key=lambda row: row.get(col), reverse=direction == 'desc')
+
+        total = len(rows)
+        offset = int(query.get('offset', 0))
+        limit = min(int(query.get('limit', self.max_rows)), self.max_rows)
+        page = rows[offset:offset + limit]
+
+        select = query.get('select', '*')
+        if select != '*':
+            columns = select.split(',')
+            page = [{col: row.get(col) for col in columns} for row in page]
+
+        response_headers = {'Content-Type': 'application/json'}
+        if 'count=exact' in headers.get('Prefer', ''):
+            end = offset + len(page) - 1
+            response_headers['Content-Range'] = f'{offset}-{end}/{total}' if page else f'*/{total}'
+        return 200, response_headers, json.dumps(page).encode()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,115 @@
+# binning.py
+import time
+
+import numpy as np
+import pandas as pd
+
+from survival_cube import BANDED_DIMENSIONS, dimension_codes
+
+# Feature -> dimension used to group it (continuous features are grouped by their band)
+FEATURE_GROUPS = {
+    'Pclass': 'Pclass',
+    'Sex': 'Sex',
+    'Age': 'Age_group',
+    'SibSp': 'SibSp',
+    'Parch': 'Parch',
+    'Fare': 'Fare_group',
+    'Embarked': 'Embarked',
+    'Title': 'Title',
+    'FamilySize': 'FamilySize',
+}
+
+
+def _compact_codes(codes, groups):
+    """Store bin codes in the smallest signed integer type that holds them (-1 = no group)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if groups < np.iinfo(dtype).max:
+            return codes.astype(dtype)
+    return codes.astype(np.int64)
+
+
+class BinningIndex:
+    """Bin codes of every analysed feature, and the survival statistics that follow from them.
+
+    Built once per dataset version from read-only columns: nothing is written to the shared
+    frame. All per-group counts and survivor sums come from one bincount over the stacked
+    codes, and the survived/died feature means from one more.
+    """
+
+    def __init__(self, features, codes, labels, counts, survivors, labelled, mean_survived, mean_died):
+        self.features = features
+        self.codes = codes
+        self.labels = labels
+        self.counts = counts
+        self.survivors = survivors
+        # Passengers per group whose Survived is known: the denominator of the rates
+        self.labelled = labelled
+        self.mean_survived = mean_survived
+        self.mean_died = mean_died
+
+    @classmethod
+    def from_frame(cls, df, feature_groups=FEATURE_GROUPS):
+        start = time.perf_counter()
+        features = [
+            feature for feature, group in feature_groups.items()
+            if feature in df.columns and (group in df.columns or group in BANDED_DIMENSIONS)
+        ]
+        survived = df['Survived'].to_numpy(dtype=np.float64)
+        # Rows without a Survived value are left out of every survival statistic
+        known = ~np.isnan(survived)
+        rows = len(df)
+
+        codes, labels = {}, {}
+        for feature in features:
+            feature_codes, feature_labels = dimension_codes(df, feature_groups[feature])
+            codes[feature] = _compact_codes(feature_codes, len(feature_labels))
+            labels[feature] = feature_labels
+
+        # One pass for the group statistics of every feature: each feature's codes are shifted
+        # into its own range (plus one slot for "no group") and counted together
+        sizes = [len(labels[feature]) + 1 for feature in features]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        stacked = np.concatenate([
+            np.where(codes[feature] < 0, size - 1, codes[feature]) + offset
+            for feature, size, offset in zip(features, sizes, offsets)
+        ]) if features else np.zeros(0, dtype=np.int64)
+        known_rows = np.tile(known, len(features))
+        counts = np.bincount(stacked, minlength=sum(sizes))
+        labelled = np.bincount(stacked[known_rows], minlength=sum(sizes))
+        survivors = np.bincount(stacked[known_rows], weights=np.tile(survived, len(features))[known_rows], minlength=sum(sizes))
+
+        # One pass for the survived/died means of the numeric features
+        numeric = [feature for feature in features if pd.api.types.is_numeric_dtype(df[feature])]
+        values = np.concatenate([df[feature].to_numpy(dtype=np.float64) for feature in numeric]) if numeric else np.zeros(0)
+        slots = (np.repeat(np.arange(len(numeric)), rows) * 2 + np.nan_to_num(np.tile(survived, len(numeric)))).astype(np.int64)
+        present = ~np.isnan(values) & np.tile(known, len(numeric))
+        sums = np.bincount(slots[present], weights=values[present], minlength=2 * len(numeric))
+        totals = np.bincount(slots[present], minlength=2 * len(numeric))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / totals
+
+        index = cls(
+            features,
+            codes,
+            labels,
+            {f: counts[o:o + len(labels[f])] for f, o in zip(features, offsets)},
+            {f: survivors[o:o + len(labels[f])] for f, o in zip(features, offsets)},
+            {f: labelled[o:o + len(labels[f])] for f, o in zip(features, offsets)},
+            {f: float(means[2 * i + 1]) for i, f in enumerate(numeric)},
+            {f: float(means[2 * i]) for i, f in enumerate(numeric)},
+        )
+        print(f"🗂️ Binning index built for {len(features)} features in {time.perf_counter() - start:.3f}s")
+        return index
+
+    def survival_by_group(self, feature, observed=True):
+        """{group label: survival rate}; with observed=False empty groups are kept as NaN"""
+        counts = self.counts[feature]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates = self.survivors[feature] / self.labelled[feature]
+        return {
+            label: float(rates[i])
+            for i, label in enumerate(self.labels[feature]) if counts[i] or not observed
+        }
+
+    def mean_survival(self, feature):
+        return {'survived': self.mean_survived[feature], 'died': self.mean_died[feature]}
@@ -0,0 +1,121 @@
+# bulk_scoring.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_titanic_data
+from model_registry import ModelRegistry
+from predictor import NUMERIC_FIELDS, PASSENGER_DEFAULTS, REQUIRED_FIELDS, SurvivalPredictor, prepare_passengers
+
+# Manifest rows read, cleaned and scored at a time; memory stays bounded by a few chunks
+SCORE_CHUNK_ROWS = int(os.getenv('SCORE_CHUNK_ROWS', 10000))
+# Worker processes scoring chunks in parallel (1 scores in the request thread)
+SCORE_WORKERS = int(os.getenv('SCORE_WORKERS', 1))
+
+MANIFEST_FORMATS = ('csv', 'parquet')
+RESULT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+# Columns validated before cleaning, so errors quote the manifest's own values
+CHECKED_FIELDS = tuple(dict.fromkeys(REQUIRED_FIELDS + NUMERIC_FIELDS))
+
+
+def read_manifest(file, manifest_format, chunk_rows=SCORE_CHUNK_ROWS):
+    """Raw passenger frames of at most ``chunk_rows`` rows, read lazily from a CSV or Parquet file.
+
+    The file is closed once it has been read, or when the generator is closed early.
+    """
+    try:
+        if manifest_format == 'csv':
+            yield from pd.read_csv(file, chunksize=chunk_rows)
+        elif manifest_format == 'parquet':
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+        else:
+            raise ValueError(f"Unknown manifest format '{manifest_format}', expected one of {', '.join(MANIFEST_FORMATS)}")
+    finally:
+        file.close()
+
+
+def check_manifest_columns(chunk):
+    missing = [field for field in REQUIRED_FIELDS if field not in chunk.columns]
+    if missing:
+        raise ValueError(f"Manifest is missing the column(s) {', '.join(missing)}")
+
+
+def score_chunk(predictor, raw, first_row):
+    """Predictions for one raw manifest chunk.
+
+    The chunk goes through clean_titanic_data (Title from Name, numeric conversion) like
+    the training data. Missing values are filled with the training medians/modes first,
+    so the result never depends on how the file was chunked. Rows that cannot be scored
+    get a null prediction and an error.
+    """
+    raw = raw.reset_index(drop=True)
+    # Checked as sent: cleaning turns values like Pclass 'first' into NaN, which would
+    # then be reported as missing instead of naming the bad value
+    _, raw_errors = prepare_passengers(raw[[field for field in CHECKED_FIELDS if field in raw.columns]])
+    cleaned = clean_titanic_data(raw.fillna(PASSENGER_DEFAULTS), verbose=False)
+    frame, errors = prepare_passengers(cleaned)
+    errors = raw_errors.where(raw_errors.notna(), errors)
+    labels, probabilities, errors = predictor.score_rows(frame, errors)
+
+    result = pd.DataFrame({'row': np.arange(first_row, first_row + len(frame))})
+    if 'PassengerId' in cleaned.columns:
+        result['PassengerId'] = cleaned['PassengerId'].to_numpy()
+    result['prediction'] = pd.array(np.where(labels >= 0, labels, 0), dtype='Int8')
+    result.loc[labels < 0, 'prediction'] = pd.NA
+    result['survival_probability'] = probabilities.round(3)
+    result['error'] = errors.to_numpy()
+    return result
+
+
+_worker_predictor = None
+
+
+def _init_worker(store_dir, key):
+    """Worker-process initializer: load the model once from the registry instead of pickling it per chunk"""
+    global _worker_predictor
+    _worker_predictor = SurvivalPredictor(ModelRegistry(store_dir).get(key))
+
+
+def _score_in_worker(raw, first_row):
+    return score_chunk(_worker_predictor, raw, first_row)
+
+
+def score_manifest(chunks, predictor, workers=SCORE_WORKERS, store_dir=None):
+    """Result frames of every chunk, in file order.
+
+    With ``workers`` > 1 the chunks are scored in a process pool that loads the predictor's
+    artifact from ``store_dir``; at most two chunks per worker are in flight, so memory
+    stays bounded however large the file is.
+    """
+    row = 0
+    if workers <= 1:
+        for chunk in chunks:
+            yield score_chunk(predictor, chunk, row)
+            row += len(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store_dir, predictor.key)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_score_in_worker, chunk, row))
+            row += len(chunk)
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def encode_results(results, result_format, serialize_rows):
+    """Byte chunks of the scored results as NDJSON or CSV, one per scored chunk"""
+    header = True
+    for result in results:
+        if result_format == 'csv':
+            yield result.to_csv(index=False, header=header, lineterminator='\n').encode()
+            header = False
+        else:
+            yield b'\n'.join(serialize_rows(result)) + b'\n'
@@ -0,0 +1,130 @@
+# comoments.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Rows per partition when an accumulator is built from a large frame
+COMOMENT_CHUNK_ROWS = int(os.getenv('COMOMENT_CHUNK_ROWS', 250_000))
+COMOMENT_WORKERS = int(os.getenv('COMOMENT_WORKERS', 4))
+
+
+class CoMomentAccumulator:
+    """Running pairwise moments of the numeric columns, enough to derive their correlation matrix.
+
+    For every column pair (i, j) it keeps, over the rows where both are present:
+      n[i, j]     row count
+      mean[i, j]  mean of column i
+      m2[i, j]    sum of squared deviations of column i
+      c[i, j]     co-moment, sum of (x_i - mean_i) * (x_j - mean_j)
+    Accumulators of disjoint partitions merge exactly (Chan et al.), so new rows or chunks
+    are folded in without rescanning, and the matrix comes out in O(k²).
+    """
+
+    def __init__(self, columns, n, mean, m2, c):
+        self.columns = list(columns)
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.c = c
+
+    @classmethod
+    def empty(cls, columns):
+        k = len(columns)
+        zeros = lambda: np.zeros((k, k))
+        return cls(columns, zeros(), zeros(), zeros(), zeros())
+
+    @classmethod
+    def from_array(cls, values, columns):
+        """Accumulator of one partition (rows x columns, NaN for missing values)"""
+        values = np.asarray(values, dtype=np.float64)
+        rows, k = values.shape
+        valid = ~np.isnan(values)
+
+        if valid.all():
+            # Every pair sees every row: one centred matrix product covers all pairs
+            col_mean = values.mean(axis=0) if rows else np.zeros(k)
+            centered = values - col_mean
+            c = centered.T @ centered
+            n = np.full((k, k), float(rows))
+            mean = np.repeat(col_mean[:, None], k, axis=1)
+            m2 = np.repeat(np.diag(c)[:, None], k, axis=1)
+            return cls(columns, n, mean, m2, c)
+
+        # Missing values: each pair only uses the rows where both columns are present
+        acc = cls.empty(columns)
+        for i in range(k):
+            for j in range(i, k):
+                both = valid[:, i] & valid[:, j]
+                count = both.sum()
+                if not count:
+                    continue
+                x = values[both, i]
+                y = values[both, j]
+                dx = x - x.mean()
+                dy = y - y.mean()
+                acc.n[i, j] = acc.n[j, i] = count
+                acc.mean[i, j], acc.mean[j, i] = x.mean(), y.mean()
+                acc.m2[i, j], acc.m2[j, i] = dx @ dx, dy @ dy
+                acc.c[i, j] = acc.c[j, i] = dx @ dy
+        return acc
+
+    @classmethod
+    def from_frame(cls, df, columns=None, chunk_rows=COMOMENT_CHUNK_ROWS, max_workers=COMOMENT_WORKERS):
+        """Accumulate the numeric columns of ``df``, in parallel partitions when it is large"""
+        start = time.perf_counter()
+        columns = list(columns) if columns is not None else list(df.select_dtypes(include=[np.number]).columns)
+        values = df[columns].to_numpy(dtype=np.float64)
+
+        bounds = range(0, len(values), chunk_rows)
+        if len(bounds) <= 1:
+            acc = cls.from_array(values, columns)
+        else:
+            # NumPy releases the GIL in the matrix products, so threads overlap the partitions
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                parts = list(executor.map(lambda lo: cls.from_array(values[lo:lo + chunk_rows], columns), bounds))
+            acc = cls.merge_all(parts)
+
+        print(f"📐 Co-moments of {len(columns)} columns over {len(values)} rows "
+              f"({max(len(bounds), 1)} partitions) in {time.perf_counter() - start:.3f}s")
+        return acc
+
+    @staticmethod
+    def merge_all(parts):
+        acc = parts[0]
+        for part in parts[1:]:
+            acc = acc.merge(part)
+        return acc
+
+    def merge(self, other):
+        """Accumulator of both partitions (neither input is modified)"""
+        if other.columns != self.columns:
+            raise ValueError(f"Cannot merge co-moments of {other.columns} into {self.columns}")
+
+        n = self.n + other.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(n > 0, self.n * other.n / n, 0.0)
+            share = np.where(n > 0, other.n / n, 0.0)
+        delta = other.mean - self.mean
+
+        return CoMomentAccumulator(
+            self.columns,
+            n,
+            self.mean + delta * share,
+            self.m2 + other.m2 + delta * delta * weight,
+            # delta.T[i, j] is the mean shift of column j over the same pair of rows
+            self.c + other.c + delta * delta.T * weight
+        )
+
+    def update(self, df):
+        """Accumulator with the rows of ``df`` appended"""
+        return self.merge(CoMomentAccumulator.from_array(df[self.columns].to_numpy(dtype=np.float64), self.columns))
+
+    def correlation(self):
+        """Pearson correlation matrix (pairwise complete rows, like DataFrame.corr())"""
+        divisor = np.sqrt(self.m2 * self.m2.T)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.where(divisor > 0, self.c / divisor, np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
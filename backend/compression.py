@@ -0,0 +1,57 @@
+# compression.py
+import gzip
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    # Optional: without the brotli package only gzip is offered
+    brotli = None
+
+# Bodies smaller than this are sent as they are; compressing them costs more than it saves
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+
+# Cached bodies are compressed once per dataset version, so they get the strongest levels;
+# streams are compressed per request and use faster ones
+CACHED_LEVELS = {'br': 11, 'gzip': 9}
+STREAM_LEVELS = {'br': 5, 'gzip': 6}
+
+
+def available_encodings():
+    """Content codings this server can produce, preferred first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def choose_encoding(request):
+    """Best coding the client accepts (Accept-Encoding), or None for identity"""
+    return request.accept_encodings.best_match(available_encodings())
+
+
+def compress(body, encoding, level=None):
+    """``body`` compressed once with ``encoding`` ('br' or 'gzip')"""
+    level = CACHED_LEVELS[encoding] if level is None else level
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    # mtime=0 keeps the output (and so its ETag) the same for the same body
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding, level=None):
+    """Compress a stream of byte chunks incrementally, one compressed chunk out per chunk in"""
+    level = STREAM_LEVELS[encoding] if level is None else level
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            # flush() after every chunk so the client gets each one right away
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
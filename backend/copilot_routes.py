@@ -9,11 +9,11 @@ copilot_bp = Blueprint('copilot', __name__, url_prefix='/api/copilot')
 # Global copilot instance
 copilot = None
 
-def init_copilot(cleaned_df):
-    """Initialize copilot with data"""
+def init_copilot(cleaned_df, data_version=None, cube=None):
+    """Initialize copilot with data (re-run for every newly published dataset version)"""
     global copilot
     from ai_copilot import TitanicAICopilot
-    copilot = TitanicAICopilot(cleaned_df)
+    copilot = TitanicAICopilot(cleaned_df, data_version, cube)
     print("🚀 AI Copilot initialized with Hugging Face integration!")
 
 @copilot_bp.route('/chat', methods=['POST'])
@@ -208,6 +208,7 @@ def get_stats():
         
         return jsonify({
             'statistics': copilot.stats,
+            'data_version': copilot.data_version,
             'timestamp': datetime.now().isoformat()
         })
         
@@ -247,5 +248,6 @@ def copilot_health():
         'knowledge_base': 'loaded' if copilot else 'not loaded',
         'context': copilot.current_context if copilot else 'none',
         'dataset_size': len(copilot.df) if copilot else 0,
+        'data_version': copilot.data_version if copilot else None,
         'timestamp': datetime.now().isoformat()
     })
\ No newline at end of file
@@ -0,0 +1,197 @@
+# data_cleaning.py
+import numpy as np
+import pandas as pd
+
+# Declared schema of the raw passenger columns.
+#   dtype: 'numeric' columns are converted only when they do not already hold numbers
+#   fill:  'median', 'mode' or a constant used for missing values (None keeps them)
+#   serve: compact dtype used for the served frame (see compact_frame)
+COLUMN_SCHEMA = {
+    'PassengerId': {'dtype': 'numeric', 'fill': None, 'serve': 'int32'},
+    'Survived': {'dtype': 'numeric', 'fill': None, 'serve': 'int8'},
+    'Pclass': {'dtype': 'numeric', 'fill': None, 'serve': 'int8'},
+    'Sex': {'dtype': 'string', 'fill': None, 'serve': 'category'},
+    # Age and Fare stay float64: float32 would change /api/summary and /api/correlation
+    'Age': {'dtype': 'numeric', 'fill': 'median', 'serve': 'float64'},
+    'SibSp': {'dtype': 'numeric', 'fill': 0, 'serve': 'int8'},
+    'Parch': {'dtype': 'numeric', 'fill': 0, 'serve': 'int8'},
+    'Fare': {'dtype': 'numeric', 'fill': 'median', 'serve': 'float64'},
+    'Embarked': {'dtype': 'string', 'fill': 'mode', 'default': 'S', 'serve': 'category'},
+}
+
+# Compact dtypes of the derived features
+DERIVED_SERVING_DTYPES = {
+    'Title': 'category',
+    'FamilySize': 'int8',
+    'IsAlone': 'int8',
+}
+
+# Raw columns that are not served (Supabase adds id/created_at)
+DROPPED_COLUMNS = ['Cabin', 'Ticket', 'Name', 'id', 'created_at']
+
+TITLE_MAPPING = {
+    'Mr': 'Mr', 'Miss': 'Miss', 'Mrs': 'Mrs', 'Master': 'Master',
+    'Dr': 'Officer', 'Rev': 'Officer', 'Col': 'Officer', 'Major': 'Officer',
+    'Mlle': 'Miss', 'Ms': 'Miss', 'Lady': 'Royalty', 'Countess': 'Royalty',
+    'Don': 'Royalty', 'Dona': 'Royalty', 'Mme': 'Mrs', 'Sir': 'Royalty',
+    'Jonkheer': 'Royalty', 'Capt': 'Officer'
+}
+
+
+def _title(df):
+    titles = df['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
+    return titles.map(TITLE_MAPPING).fillna('Other')
+
+
+def _family_size(df):
+    return df['SibSp'] + df['Parch'] + 1
+
+
+def _is_alone(df):
+    return (df['FamilySize'] == 1).astype(int)
+
+
+# Derived features in build order: (name, required columns, builder)
+DERIVED_FEATURES = [
+    ('Title', ['Name'], _title),
+    ('FamilySize', ['SibSp', 'Parch'], _family_size),
+    ('IsAlone', ['FamilySize'], _is_alone),
+]
+
+
+def _fill_value(series, spec):
+    fill = spec.get('fill')
+    if fill == 'median':
+        return series.median()
+    if fill == 'mode':
+        mode = series.mode()
+        return mode.iloc[0] if not mode.empty else spec.get('default')
+    return fill
+
+
+def _builtin(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+def fill_values(df):
+    """Fill value of every COLUMN_SCHEMA column with a fill, computed from ``df``"""
+    return {
+        col: _builtin(_fill_value(df[col], spec))
+        for col, spec in COLUMN_SCHEMA.items()
+        if spec.get('fill') is not None and col in df.columns
+    }
+
+
+def clean_titanic_data(df, verbose=True, fill_values=None):
+    """Clean the Titanic dataset in one pass driven by COLUMN_SCHEMA.
+
+    Columns are only converted when their dtype is wrong (e.g. strings from Supabase),
+    and the caller's frame is never modified. ``verbose=False`` skips the progress
+    prints (bulk scoring cleans many small chunks).
+
+    Missing values get the median/mode of ``df`` unless ``fill_values`` ({column: value})
+    is given: a delta is filled like the dataset it is appended to, not from its own few
+    rows. The values used are kept in ``attrs['fill_values']``.
+    """
+    # Features derived from dropped columns (Title from Name) are computed before the drop
+    early_features = {
+        name: build(df) for name, required, build in DERIVED_FEATURES
+        if set(required) <= set(df.columns) and set(required) & set(DROPPED_COLUMNS)
+    }
+
+    # The drop is the only full copy, and it leaves the wide text columns behind
+    clean_df = df.drop(columns=[col for col in DROPPED_COLUMNS if col in df.columns])
+
+    converted = []
+    used_fills = {}
+    for col, spec in COLUMN_SCHEMA.items():
+        if col not in clean_df.columns:
+            continue
+        series = clean_df[col]
+        changed = False
+
+        if spec['dtype'] == 'numeric' and (not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)):
+            series = pd.to_numeric(series, errors='coerce')
+            converted.append(f'{col}:{series.dtype}')
+            changed = True
+
+        if spec.get('fill') is not None:
+            if fill_values is not None and col in fill_values:
+                fill = fill_values[col]
+            else:
+                fill = _builtin(_fill_value(series, spec))
+            used_fills[col] = fill
+            if series.hasnans:
+                series = series.fillna(fill)
+                changed = True
+
+        if changed:
+            clean_df[col] = series
+
+    for name, required, build in DERIVED_FEATURES:
+        if name in early_features:
+            clean_df[name] = early_features[name]
+        elif set(required) <= set(clean_df.columns):
+            clean_df[name] = build(clean_df)
+
+    clean_df.attrs['fill_values'] = used_fills
+
+    if verbose:
+        if converted:
+            print(f"🔧 Converted columns: {', '.join(converted)}")
+        print(f"✅ Data cleaning complete. Final shape: {clean_df.shape}")
+    return clean_df
+
+
+def _fits(series, dtype):
+    """True when a column has no missing or fractional values and its range fits integer ``dtype``"""
+    if series.hasnans:
+        return False
+    if pd.api.types.is_float_dtype(series) and not (series % 1 == 0).all():
+        return False
+    info = np.iinfo(dtype)
+    return series.empty or (series.min() >= info.min and series.max() <= info.max)
+
+
+def compact_frame(df):
+    """Store the served frame compactly: categoricals for low-cardinality strings and
+    the small integer types declared in the schema.
+
+    Columns whose values do not fit the declared type are left as they are, and an
+    already compact frame is returned unchanged.
+    """
+    serving_dtypes = {col: spec['serve'] for col, spec in COLUMN_SCHEMA.items() if 'serve' in spec}
+    serving_dtypes.update(DERIVED_SERVING_DTYPES)
+
+    conversions = {}
+    for col, dtype in serving_dtypes.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        series = df[col]
+        if dtype == 'category':
+            conversions[col] = 'category'
+        elif dtype.startswith('int') and pd.api.types.is_numeric_dtype(series) and _fits(series, dtype):
+            conversions[col] = dtype
+        elif dtype.startswith('float') and pd.api.types.is_numeric_dtype(series):
+            conversions[col] = dtype
+
+    if not conversions:
+        return df
+
+    compact_df = df.astype(conversions)
+    compact_df.attrs = dict(df.attrs)
+    return compact_df
+
+
+def memory_report(df):
+    """Bytes used by each column of ``df`` (strings counted deeply)"""
+    usage = df.memory_usage(deep=True, index=False)
+    return {
+        'columns': {
+            col: {'dtype': str(df[col].dtype), 'bytes': int(usage[col])}
+            for col in df.columns
+        },
+        'index_bytes': int(df.index.memory_usage(deep=True)),
+        'total_bytes': int(usage.sum() + df.index.memory_usage(deep=True)),
+        'rows': len(df)
+    }
@@ -0,0 +1,99 @@
+# data_export.py
+import io
+import os
+
+from response_formats import FormatNotAvailable
+
+# Rows serialized per chunk of a streamed export; memory stays bounded by one chunk
+EXPORT_CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', 10000))
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _chunks(df, positions, chunk_rows):
+    """Frames of at most ``chunk_rows`` rows, of all rows or of ``positions`` in that order"""
+    total = len(df) if positions is None else len(positions)
+    for start in range(0, total, chunk_rows):
+        stop = min(start + chunk_rows, total)
+        yield df.iloc[start:stop] if positions is None else df.iloc[positions[start:stop]]
+
+
+def _ndjson(rows, positions, chunk_rows):
+    # Lines are cut from the pre-serialized row block, nothing is serialized again
+    total = len(rows) if positions is None else len(positions)
+    for start in range(0, total, chunk_rows):
+        stop = min(start + chunk_rows, total)
+        if positions is None:
+            yield rows.lines(start, stop)
+        else:
+            yield rows.take(positions[start:stop], b'\n') + b'\n'
+
+
+def _csv(chunks):
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header, lineterminator='\n').encode()
+        header = False
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file that hands out what was written so far, so Parquet can be streamed"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _parquet(chunks, schema_frame):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(schema_frame, preserve_index=False)
+    sink = _DrainableSink()
+    # One row group per chunk; everything written so far is sent before the next chunk is read
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export_stream(df, export_format, rows, positions=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Generator of the encoded export of ``df`` (or of its rows at ``positions``), chunk by chunk.
+
+    ``rows`` is the RowBlock of ``df``'s rows in frame order, the source of the ndjson lines.
+    Raises FormatNotAvailable before the first chunk when the format cannot be written.
+    """
+    if export_format == 'ndjson':
+        return _ndjson(rows, positions, chunk_rows)
+    chunks = _chunks(df, positions, chunk_rows)
+    if export_format == 'csv':
+        return _csv(chunks)
+    if export_format == 'parquet':
+        # Checked here, since the generator body only runs once the response is streaming
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise FormatNotAvailable('The parquet export needs pyarrow installed')
+        return _parquet(chunks, df.iloc[:0])
+    raise ValueError(f"Unknown export format '{export_format}', expected one of {', '.join(EXPORT_FORMATS)}")
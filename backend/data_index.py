@@ -0,0 +1,228 @@
+# data_index.py
+import re
+import time
+from urllib.parse import unquote_plus
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality columns answered from one bitmap per value
+BITMAP_COLUMNS = ('Survived', 'Pclass', 'Sex', 'SibSp', 'Parch', 'Embarked', 'Title', 'FamilySize', 'IsAlone')
+# Continuous columns answered (and sorted) from a presorted permutation of the rows
+SORTED_COLUMNS = ('PassengerId', 'Age', 'Fare')
+
+# Query parameters of /api/data that are not filters
+RESERVED_PARAMS = {'page', 'per_page', 'cursor', 'format', 'sort', 'q'}
+
+_FILTER = re.compile(r'^([A-Za-z_]\w*)(>=|<=|!=|=|>|<)(.*)$')
+_NAME = re.compile(r'[^=<>!]*')
+
+
+class DataQuery:
+    """Filters, sort and search of one /api/data request.
+
+    filters are (column, op, value) with op one of = != < <= > >=; '=' and '!='
+    accept comma separated values. sort is (column, descending) or None.
+    """
+
+    def __init__(self, filters=(), sort=None, search=None):
+        self.filters = list(filters)
+        self.sort = sort
+        self.search = search
+
+    def __bool__(self):
+        return bool(self.filters or self.sort or self.search)
+
+    @classmethod
+    def parse(cls, query_string, columns=None):
+        """Query from a raw query string such as 'Sex=female&Age>=18&sort=-Fare'.
+
+        The raw string is parsed because Flask's args would read 'Age>=18' as the key 'Age>'.
+        With ``columns`` given, only parameters naming one of them are filters; any other
+        parameter (a cache-buster like '_=123', ...) is ignored.
+        """
+        filters, sort, search = [], None, None
+        for part in query_string.split('&'):
+            part = unquote_plus(part)
+            if not part:
+                continue
+            match = _FILTER.match(part)
+            name = match.group(1) if match else _NAME.match(part).group(0)
+            is_filter = name not in RESERVED_PARAMS and (columns is None or name in columns)
+            if not is_filter and name not in ('sort', 'q'):
+                continue
+            if match is None:
+                raise ValueError(f"Cannot parse filter '{part}', expected e.g. Sex=female or Age>=18")
+            column, op, value = match.groups()
+
+            if column == 'sort':
+                if op != '=' or not value.lstrip('-'):
+                    raise ValueError("sort expects a column, e.g. sort=Fare or sort=-Fare")
+                sort = (value.lstrip('-'), value.startswith('-'))
+            elif column == 'q':
+                search = value.strip() or None
+            else:
+                filters.append((column, op, value))
+        return cls(filters, sort, search)
+
+
+def _parse_number(column, value):
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"'{value}' is not a number (filter on {column})")
+
+
+class DataIndex:
+    """Bitmap and sorted indexes over the rows of one dataset version.
+
+    Each BITMAP_COLUMNS value has a packed bitmap of its rows; each SORTED_COLUMNS column
+    has its rows presorted ascending and descending (missing values last). Filters resolve
+    to bitmaps that are ANDed together, so the frame itself is never scanned.
+    """
+
+    def __init__(self, rows, labels, bitmaps, orders, sorted_values):
+        self.rows = rows
+        self.labels = labels
+        self.bitmaps = bitmaps
+        self.orders = orders
+        self.sorted_values = sorted_values
+
+    @classmethod
+    def from_frame(cls, df):
+        start = time.perf_counter()
+        labels, bitmaps, orders, sorted_values = {}, {}, {}, {}
+
+        for column in BITMAP_COLUMNS:
+            if column not in df.columns:
+                continue
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values, codes = series.cat.categories, series.cat.codes.to_numpy()
+            else:
+                codes, values = pd.factorize(series, sort=True)
+            labels[column] = [value.item() if isinstance(value, np.generic) else value for value in values]
+            bitmaps[column] = [np.packbits(codes == code) for code in range(len(values))]
+
+        for column in SORTED_COLUMNS:
+            if column not in df.columns:
+                continue
+            values = df[column].to_numpy(dtype=np.float64)
+            ascending = np.argsort(values, kind='stable')
+            # Descending by value, ties and missing values still in row order
+            descending = np.argsort(-values, kind='stable')
+            orders[column] = (ascending, descending)
+            sorted_values[column] = values[ascending]
+
+        index = cls(len(df), labels, bitmaps, orders, sorted_values)
+        print(f"🔎 Data index built: {len(bitmaps)} bitmap and {len(orders)} sorted columns "
+              f"({index.nbytes()} bytes) in {time.perf_counter() - start:.3f}s")
+        return index
+
+    def nbytes(self):
+        bitmap_bytes = sum(bitmap.nbytes for bitmaps in self.bitmaps.values() for bitmap in bitmaps)
+        order_bytes = sum(a.nbytes + d.nbytes for a, d in self.orders.values())
+        return bitmap_bytes + order_bytes + sum(values.nbytes for values in self.sorted_values.values())
+
+    def columns(self):
+        return {'filter': list(self.bitmaps) + list(self.orders), 'sort': list(self.orders)}
+
+    def _empty(self):
+        return np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+
+    def _full(self):
+        return np.packbits(np.ones(self.rows, dtype=bool))
+
+    def _union(self, bitmaps):
+        result = self._empty()
+        for bitmap in bitmaps:
+            result |= bitmap
+        return result
+
+    def _label_bitmap(self, column, op, value):
+        labels = self.labels[column]
+        numeric = all(isinstance(label, (int, float)) and not isinstance(label, bool) for label in labels)
+        if op in ('=', '!=') and numeric:
+            # Compared as numbers: Survived turns float (labels 0.0, 1.0) once unlabelled rows sync in
+            wanted = [_parse_number(column, item.strip()) for item in value.split(',')]
+            matched = [i for i, label in enumerate(labels) if label in wanted]
+        elif op in ('=', '!='):
+            wanted = {item.strip().lower() for item in value.split(',')}
+            matched = [i for i, label in enumerate(labels) if str(label).lower() in wanted]
+        else:
+            bound = _parse_number(column, value)
+            if not numeric:
+                raise ValueError(f"{column} is not numeric, use {column}=value")
+            compare = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal}[op]
+            matched = [i for i, label in enumerate(labels) if compare(label, bound)]
+        bitmap = self._union(self.bitmaps[column][i] for i in matched)
+        return ~bitmap & self._full() if op == '!=' else bitmap
+
+    def _range_bitmap(self, column, op, value):
+        values = self.sorted_values[column]
+        ascending = self.orders[column][0]
+        present = len(values) - int(np.isnan(values).sum())
+        if op in ('=', '!='):
+            ranges = []
+            for item in value.split(','):
+                bound = _parse_number(column, item.strip())
+                ranges.append((np.searchsorted(values[:present], bound, 'left'),
+                               np.searchsorted(values[:present], bound, 'right')))
+        else:
+            bound = _parse_number(column, value)
+            side = 'left' if op in ('<', '>=') else 'right'
+            split = np.searchsorted(values[:present], bound, side)
+            ranges = [(0, split)] if op in ('<', '<=') else [(split, present)]
+
+        mask = np.zeros(self.rows, dtype=bool)
+        for lo, hi in ranges:
+            mask[ascending[lo:hi]] = True
+        bitmap = np.packbits(mask)
+        return ~bitmap & self._full() if op == '!=' else bitmap
+
+    def select(self, query):
+        """Packed bitmap of the rows matching every filter and the search text (None = all rows)"""
+        bitmaps = []
+        for column, op, value in query.filters:
+            if column in self.bitmaps:
+                bitmaps.append(self._label_bitmap(column, op, value))
+            elif column in self.orders:
+                bitmaps.append(self._range_bitmap(column, op, value))
+            else:
+                raise ValueError(f"Cannot filter on '{column}', filterable columns: {', '.join(self.columns()['filter'])}")
+
+        if query.search:
+            # Rows with any text label (Sex, Embarked, Title) containing the search text
+            needle = query.search.lower()
+            bitmaps.append(self._union(
+                self.bitmaps[column][i]
+                for column, labels in self.labels.items()
+                for i, label in enumerate(labels)
+                if isinstance(label, str) and needle in label.lower()
+            ))
+
+        if not bitmaps:
+            return None
+        return np.bitwise_and.reduce(bitmaps)
+
+    def positions(self, query, order_by=None):
+        """Row positions matching ``query``, in the query's sort order.
+
+        Without a sort the rows stay in frame order, or in ``order_by`` order when given
+        (the column the cursors walk).
+        """
+        if query.sort is not None:
+            column, descending = query.sort
+            if column not in self.orders:
+                raise ValueError(f"Cannot sort by '{column}', sortable columns: {', '.join(self.orders)}")
+            order = self.orders[column][1 if descending else 0]
+        elif order_by is not None:
+            order = self.orders[order_by][0]
+        else:
+            order = None
+
+        bitmap = self.select(query)
+        if bitmap is None:
+            return np.arange(self.rows) if order is None else order
+        mask = np.unpackbits(bitmap, count=self.rows).view(bool)
+        return np.flatnonzero(mask) if order is None else order[mask[order]]
@@ -0,0 +1,327 @@
+# data_sources.py
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from snapshot import file_fingerprint
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Which backend serves the tables: supabase, csv, parquet or sqlite
+DATA_SOURCE = os.getenv('DATA_SOURCE', 'supabase')
+DATA_DIR = os.getenv('DATA_DIR', BACKEND_DIR)
+SQLITE_PATH = os.getenv('SQLITE_PATH', os.path.join(BACKEND_DIR, 'titanic.db'))
+
+PASSENGER_TABLE = 'Project_1'
+
+# Columns holding JSON documents (jsonb in Supabase)
+JSON_COLUMNS = {'predictions': ['passenger_data']}
+
+
+class DataSource:
+    """The table operations the app needs, independent of where the tables live.
+
+    Records go in and come out as plain dicts; whole tables come out as DataFrames.
+    """
+
+    name = 'base'
+
+    def load_table(self, table):
+        """Every row of ``table`` as a DataFrame"""
+        raise NotImplementedError
+
+    def load_after(self, table, column, value):
+        """Rows of ``table`` whose ``column`` is greater than ``value`` (a delta)"""
+        raise NotImplementedError
+
+    def fingerprint(self, table):
+        """Cheap identity of the table contents, used to key snapshots"""
+        raise NotImplementedError
+
+    def count(self, table):
+        raise NotImplementedError
+
+    def select(self, table, order_by=None, desc=False, limit=None):
+        """Rows of ``table`` as a list of dicts"""
+        raise NotImplementedError
+
+    def insert(self, table, record):
+        """Insert one record and return it as stored"""
+        raise NotImplementedError
+
+
+class SupabaseSource(DataSource):
+    """Tables in Supabase: bulk reads through the paged PostgREST loader, writes through the client"""
+
+    name = 'supabase'
+
+    def __init__(self, url=None, key=None):
+        from supabase_client import SUPABASE_URL, SUPABASE_KEY
+        self.url = url or SUPABASE_URL
+        self.key = key or SUPABASE_KEY
+
+    def _loader(self, table, order_column='id'):
+        from supabase_loader import PagedTableLoader
+        return PagedTableLoader(self.url, self.key, table, order_column=order_column)
+
+    def _client(self):
+        from supabase_client import get_supabase
+        return get_supabase()
+
+    def load_table(self, table):
+        return self._loader(table).load()
+
+    def load_after(self, table, column, value):
+        return self._loader(table, order_column=column).load_after(value)
+
+    def fingerprint(self, table):
+        return self._loader(table).fingerprint()
+
+    def count(self, table):
+        return self._loader(table).count_rows()
+
+    def select(self, table, order_by=None, desc=False, limit=None):
+        query = self._client().table(table).select('*')
+        if order_by:
+            query = query.order(order_by, desc=desc)
+        if limit:
+            query = query.limit(limit)
+        return query.execute().data
+
+    def insert(self, table, record):
+        return self._client().table(table).insert(record).execute().data[0]
+
+
+class FileSource(DataSource):
+    """Tables stored as one file each in a directory (the passenger table is train.csv)"""
+
+    extension = None
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+
+    def path(self, table):
+        if table == PASSENGER_TABLE:
+            return os.path.join(self.data_dir, f'train{self.extension}')
+        return os.path.join(self.data_dir, f'{table}{self.extension}')
+
+    def _read(self, path):
+        raise NotImplementedError
+
+    def _write(self, df, path):
+        raise NotImplementedError
+
+    def load_table(self, table):
+        return self._read(self.path(table))
+
+    def load_after(self, table, column, value):
+        df = self.load_table(table)
+        if column not in df.columns:
+            return df.iloc[0:0]
+        return df[df[column] > value].reset_index(drop=True)
+
+    def fingerprint(self, table):
+        return file_fingerprint(self.path(table))
+
+    def count(self, table):
+        path = self.path(table)
+        return len(self._read(path)) if os.path.exists(path) else 0
+
+    def select(self, table, order_by=None, desc=False, limit=None):
+        path = self.path(table)
+        if not os.path.exists(path):
+            return []
+        df = self._read(path)
+        if order_by and order_by in df.columns:
+            df = df.sort_values(order_by, ascending=not desc)
+        if limit:
+            df = df.head(limit)
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        for col in JSON_COLUMNS.get(table, []):
+            for record in records:
+                if isinstance(record.get(col), str):
+                    record[col] = json.loads(record[col])
+        return records
+
+    def insert(self, table, record):
+        path = self.path(table)
+        with self._lock:
+            existing = self._read(path) if os.path.exists(path) else pd.DataFrame()
+            stored = {'id': len(existing) + 1, 'created_at': datetime.now().isoformat(), **record}
+            row = {
+                key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                for key, value in stored.items()
+            }
+            self._write(pd.concat([existing, pd.DataFrame([row])], ignore_index=True), path)
+        return stored
+
+
+class CSVSource(FileSource):
+    name = 'csv'
+    extension = '.csv'
+
+    def _read(self, path):
+        return pd.read_csv(path)
+
+    def _write(self, df, path):
+        df.to_csv(path, index=False)
+
+
+class ParquetSource(FileSource):
+    """Parquet files (needs pyarrow or fastparquet installed)"""
+
+    name = 'parquet'
+    extension = '.parquet'
+
+    def _read(self, path):
+        return pd.read_parquet(path)
+
+    def _write(self, df, path):
+        df.to_parquet(path, index=False)
+
+
+SQLITE_SCHEMA = {
+    PASSENGER_TABLE: '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        "PassengerId" INTEGER, "Survived" INTEGER, "Pclass" INTEGER, "Name" TEXT,
+        "Sex" TEXT, "Age" REAL, "SibSp" INTEGER, "Parch" INTEGER, "Ticket" TEXT,
+        "Fare" REAL, "Cabin" TEXT, "Embarked" TEXT
+    ''',
+    'predictions': '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        passenger_data TEXT, predicted_survival INTEGER, survival_probability REAL,
+        actual_survival INTEGER, prediction_correct INTEGER, model_type TEXT
+    ''',
+    'model_logs': '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        accuracy REAL, training_samples INTEGER, testing_samples INTEGER,
+        feature_count INTEGER, model_type TEXT
+    ''',
+}
+
+
+class SQLiteSource(DataSource):
+    """Local SQLite stand-in for the Supabase tables (Project_1, predictions, model_logs).
+
+    Creates the tables on first use and seeds Project_1 from train.csv when it is empty,
+    so the whole app runs offline against a real database file.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path=SQLITE_PATH, seed_csv=os.path.join(BACKEND_DIR, 'train.csv')):
+        self.path = path
+        self.seed_csv = seed_csv
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps this safe across request threads;
+        # it is committed (rolled back on error) and closed when the block ends
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.row_factory = sqlite3.Row
+            if not self._initialized:
+                self._initialize(connection)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _initialize(self, connection):
+        with self._init_lock:
+            if self._initialized:
+                return
+            connection.execute('PRAGMA journal_mode=WAL')
+            for table, columns in SQLITE_SCHEMA.items():
+                connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+            empty = connection.execute(f'SELECT COUNT(*) FROM "{PASSENGER_TABLE}"').fetchone()[0] == 0
+            if empty and self.seed_csv and os.path.exists(self.seed_csv):
+                seed = pd.read_csv(self.seed_csv)
+                seed.to_sql(PASSENGER_TABLE, connection, if_exists='append', index=False)
+                print(f"🌱 Seeded SQLite {PASSENGER_TABLE} with {len(seed)} rows from {self.seed_csv}")
+            connection.commit()
+            self._initialized = True
+
+    def _decode(self, table, rows):
+        records = [dict(row) for row in rows]
+        for col in JSON_COLUMNS.get(table, []):
+            for record in records:
+                if isinstance(record.get(col), str):
+                    record[col] = json.loads(record[col])
+        return records
+
+    def load_table(self, table):
+        with self._connect() as connection:
+            return pd.read_sql_query(f'SELECT * FROM "{table}" ORDER BY id', connection)
+
+    def load_after(self, table, column, value):
+        with self._connect() as connection:
+            return pd.read_sql_query(
+                f'SELECT * FROM "{table}" WHERE "{column}" > ? ORDER BY "{column}"',
+                connection, params=(value,)
+            )
+
+    def fingerprint(self, table):
+        with self._connect() as connection:
+            count = connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            newest = connection.execute(f'SELECT * FROM "{table}" ORDER BY id DESC LIMIT 1').fetchone()
+        hasher = hashlib.sha256(f'{table}:{count}'.encode())
+        hasher.update(json.dumps(dict(newest) if newest else None, default=str).encode())
+        return hasher.hexdigest()[:16]
+
+    def count(self, table):
+        with self._connect() as connection:
+            return connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+    def select(self, table, order_by=None, desc=False, limit=None):
+        sql = f'SELECT * FROM "{table}"'
+        if order_by:
+            sql += f' ORDER BY "{order_by}" {"DESC" if desc else "ASC"}'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        with self._connect() as connection:
+            return self._decode(table, connection.execute(sql).fetchall())
+
+    def insert(self, table, record):
+        values = {
+            key: json.dumps(value) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()
+        }
+        columns = ', '.join(f'"{col}"' for col in values)
+        placeholders = ', '.join('?' for _ in values)
+        with self._connect() as connection:
+            cursor = connection.execute(
+                f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})', list(values.values())
+            )
+            row = connection.execute(f'SELECT * FROM "{table}" WHERE id = ?', (cursor.lastrowid,)).fetchone()
+        return self._decode(table, [row])[0]
+
+
+DATA_SOURCES = {
+    'supabase': SupabaseSource,
+    'csv': CSVSource,
+    'parquet': ParquetSource,
+    'sqlite': SQLiteSource,
+}
+
+
+def get_data_source(name=DATA_SOURCE):
+    """Build the data source selected by DATA_SOURCE"""
+    try:
+        source_class = DATA_SOURCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown DATA_SOURCE '{name}', expected one of {sorted(DATA_SOURCES)}")
+    print(f"🗄️ Data source: {name}")
+    return source_class()
@@ -0,0 +1,166 @@
+# dataset_store.py
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from data_cleaning import fill_values
+from model_registry import dataset_fingerprint
+
+# Seconds between delta syncs of new passenger rows (0 disables the background sync)
+SYNC_INTERVAL_SECONDS = float(os.getenv('SYNC_INTERVAL_SECONDS', 60))
+
+
+class DatasetVersion:
+    """One immutable published version of the cleaned dataset.
+
+    Requests grab a version once and use only its frame, so a publish that happens
+    mid-request never mixes rows from two versions.
+    """
+
+    __slots__ = ('version', 'sequence', 'df', 'watermark', 'created_at', 'appended_rows',
+                 '_derived', '_derived_lock', '_parent_derived')
+
+    def __init__(self, df, sequence, watermark=None, parent=None, appended_rows=None):
+        self.df = df
+        self.sequence = sequence
+        self.version = dataset_fingerprint(df)
+        self.watermark = watermark
+        self.created_at = datetime.now().isoformat()
+        # Set when this version is the parent's rows plus appended_rows new rows at the end
+        self.appended_rows = appended_rows
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+        # Only the parent's derived structures are kept, never its frame
+        self._parent_derived = parent._derived if parent is not None and appended_rows else None
+
+    def derived(self, name, build, extend=None):
+        """Structure derived from this version's frame (cube, index, ...), built once by ``build(df)``.
+
+        When this version only appended rows and ``extend(parent_value, new_rows)`` is given, the
+        parent's structure is extended with the new rows instead of rebuilt from every row.
+        It lives as long as the version, so it can never be paired with another version's rows.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    parent_value = self._parent_derived.get(name) if self._parent_derived else None
+                    if extend is not None and parent_value is not None:
+                        value = extend(parent_value, self.df.iloc[-self.appended_rows:])
+                    else:
+                        value = build(self.df)
+                    self._derived[name] = value
+        return value
+
+    def info(self):
+        return {
+            'version': self.version,
+            'sequence': self.sequence,
+            'rows': len(self.df),
+            'watermark': self.watermark,
+            'created_at': self.created_at
+        }
+
+
+class DatasetStore:
+    """Holds the current dataset version and swaps in new ones atomically"""
+
+    def __init__(self, df, watermark=None, prepare=None):
+        # prepare(df) -> df normalises every published frame (e.g. compact dtypes)
+        self.prepare = prepare or (lambda frame: frame)
+        self._current = DatasetVersion(self.prepare(df), sequence=1, watermark=watermark)
+        self._publish_lock = threading.Lock()
+        self._subscribers = []
+
+    def current(self):
+        # A single attribute read: always a complete version, never a half-built one
+        return self._current
+
+    def subscribe(self, callback):
+        """Register ``callback(version)``, called after every publish"""
+        self._subscribers.append(callback)
+
+    def publish(self, df, watermark=None):
+        """Publish a new immutable version and tell every derived cache about it"""
+        return self._publish(lambda current: df, watermark, appended_rows=None)
+
+    def append_delta(self, delta_df, watermark):
+        """Publish the current rows plus an already-cleaned delta"""
+        def build(current):
+            df = pd.concat([current.df, delta_df], ignore_index=True)
+            # concat drops attrs that differ between its inputs; the dataset's (fill values, ...) carry over
+            df.attrs = dict(current.df.attrs)
+            return df
+
+        return self._publish(build, watermark, appended_rows=len(delta_df))
+
+    def _publish(self, build, watermark, appended_rows):
+        with self._publish_lock:
+            parent = self._current
+            df = self.prepare(build(parent))
+            version = DatasetVersion(df, parent.sequence + 1, watermark, parent, appended_rows)
+            self._current = version
+
+        print(f"📦 Published dataset version {version.version} ({len(df)} rows, watermark {watermark})")
+        for callback in self._subscribers:
+            try:
+                callback(version)
+            except Exception as e:
+                print(f"❌ Dataset subscriber failed for version {version.version}: {e}")
+        return version
+
+
+class DeltaSync:
+    """Background thread pulling only rows past the watermark and publishing them"""
+
+    def __init__(self, store, fetch_delta, clean, watermark_column='id', interval=SYNC_INTERVAL_SECONDS):
+        self.store = store
+        self.fetch_delta = fetch_delta
+        self.clean = clean
+        self.watermark_column = watermark_column
+        self.interval = interval
+        self.last_run = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sync_once(self):
+        """Fetch and publish one delta; returns the new version or None when nothing changed"""
+        with self._lock:
+            current = self.store.current()
+            start = time.perf_counter()
+            delta = self.fetch_delta(current.watermark)
+            self.last_run = {'at': datetime.now().isoformat(), 'rows': len(delta)}
+
+            if delta.empty:
+                return None
+
+            watermark = delta[self.watermark_column].max()
+            watermark = watermark.item() if hasattr(watermark, 'item') else watermark
+            # The delta is filled with the dataset's fill values, as a full re-clean would fill it
+            fills = current.df.attrs.get('fill_values') or fill_values(current.df)
+            version = self.store.append_delta(self.clean(delta, fill_values=fills), watermark)
+            self.last_run['seconds'] = round(time.perf_counter() - start, 4)
+            print(f"🔄 Delta sync: {len(delta)} new rows in {self.last_run['seconds']}s")
+            return version
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sync_once()
+            except Exception as e:
+                print(f"❌ Delta sync failed: {e}")
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"🔄 Delta sync running every {self.interval:g}s")
+
+    def stop(self):
+        self._stop.set()
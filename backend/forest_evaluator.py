@@ -0,0 +1,109 @@
+# forest_evaluator.py
+import os
+import weakref
+
+import numpy as np
+
+# Rows walked through the forest at a time; bounds the (rows x trees) node arrays
+FOREST_EVAL_CHUNK_ROWS = int(os.getenv('FOREST_EVAL_CHUNK_ROWS', 8192))
+# Largest batch scored with the node arrays; sklearn's compiled traversal wins on bigger
+# batches once its fixed per-call cost is spread out (crossover ~800 rows for the default forest)
+FOREST_EVAL_MAX_ROWS = int(os.getenv('FOREST_EVAL_MAX_ROWS', 512))
+
+_TREE_LEAF = -1
+
+
+class CompiledForest:
+    """A fitted RandomForestClassifier flattened into contiguous node arrays.
+
+    Every tree's nodes are concatenated, with children renumbered into the shared arrays.
+    Leaves point to themselves, so all trees are walked together for a fixed number of
+    steps (the deepest tree's depth) without branching. Inputs are cast to float32 and
+    compared with ``<=`` against the float64 thresholds, and tree probabilities are summed
+    in tree order before dividing, exactly like sklearn, so the probabilities are identical.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.classes_ = classes
+
+    @classmethod
+    def from_model(cls, model):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        n_classes = len(model.classes_)
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+
+        parts = {'feature': [], 'threshold': [], 'left': [], 'right': [], 'missing_left': [], 'value': []}
+        for tree, offset in zip(trees, offsets):
+            leaf = tree.children_left == _TREE_LEAF
+            nodes = np.arange(tree.node_count) + offset
+            parts['feature'].append(np.where(leaf, 0, tree.feature))
+            parts['threshold'].append(np.where(leaf, np.inf, tree.threshold))
+            parts['left'].append(np.where(leaf, nodes, tree.children_left + offset))
+            parts['right'].append(np.where(leaf, nodes, tree.children_right + offset))
+            missing_left = getattr(tree, 'missing_go_to_left', None)
+            parts['missing_left'].append(np.zeros(tree.node_count, dtype=bool) if missing_left is None
+                                         else np.asarray(missing_left, dtype=bool))
+            parts['value'].append(tree.value[:, 0, :n_classes])
+
+        arrays = {name: np.ascontiguousarray(np.concatenate(values)) for name, values in parts.items()}
+        return cls(
+            arrays['feature'].astype(np.intp), arrays['threshold'].astype(np.float64),
+            arrays['left'].astype(np.intp), arrays['right'].astype(np.intp),
+            arrays['missing_left'], arrays['value'].astype(np.float64),
+            offsets.astype(np.intp), max(tree.max_depth for tree in trees), model.classes_
+        )
+
+    def leaves(self, X):
+        """Leaf node reached in every tree, shape (rows, trees), for a float32 feature matrix"""
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+        for _ in range(self.depth):
+            values = flat[row_offsets + self.feature[nodes]]
+            go_left = values <= self.threshold[nodes]
+            missing = np.isnan(values)
+            if missing.any():
+                go_left = np.where(missing, self.missing_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X, chunk_rows=FOREST_EVAL_CHUNK_ROWS):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        probabilities = np.empty((len(X), self.value.shape[1]))
+        for start in range(0, len(X), chunk_rows):
+            leaves = self.leaves(X[start:start + chunk_rows])
+            # cumsum adds the trees one after another, the same order sklearn accumulates them in
+            probabilities[start:start + chunk_rows] = self.value[leaves].cumsum(axis=1)[:, -1] / len(self.roots)
+        return probabilities
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in (self.feature, self.threshold, self.left, self.right,
+                                              self.missing_left, self.value, self.roots))
+
+
+_compiled = weakref.WeakKeyDictionary()
+
+
+def compiled_forest(model):
+    """CompiledForest of a fitted forest, flattened once per model object (None for other models)"""
+    if not hasattr(model, 'estimators_') or not all(hasattr(tree, 'tree_') for tree in model.estimators_):
+        return None
+    forest = _compiled.get(model)
+    if forest is None:
+        forest = _compiled[model] = CompiledForest.from_model(model)
+    return forest
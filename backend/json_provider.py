@@ -0,0 +1,104 @@
+# json_provider.py
+import math
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+
+def column_values(values):
+    """Native Python list of a Series/array column, converted in one vectorized pass (NaN -> None)"""
+    if isinstance(values, pd.Series):
+        values = values.array
+    if isinstance(values, pd.arrays.NumpyExtensionArray):
+        values = values.to_numpy()
+    dtype = values.dtype
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Convert the few categories once and look every row up by its code (-1 = missing)
+        labels = np.array(column_values(values.categories) + [None], dtype=object)
+        return labels[values.codes].tolist()
+    # Nullable extension columns (Int64, boolean, ...) take the object path below
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+        return values.tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+        array = np.asarray(values, dtype=np.float64)
+        result = array.tolist()
+        for i in np.flatnonzero(np.isnan(array)):
+            result[i] = None
+        return result
+    if dtype.kind == 'M':
+        return [None if pd.isna(value) else value.isoformat() for value in pd.DatetimeIndex(values)]
+
+    # Object and nullable extension columns: missing values to None, anything numpy-typed to native
+    array = np.asarray(values, dtype=object)
+    result = array.tolist()
+    for i in np.flatnonzero(pd.isna(array)):
+        result[i] = None
+    if any(isinstance(value, (np.generic, pd.Timestamp)) for value in result):
+        result = [to_builtin(value) for value in result]
+    return result
+
+
+def frame_records(df):
+    """df.to_dict('records') with native values, built column by column"""
+    columns = [str(name) for name in df.columns]
+    values = [column_values(df[name]) for name in df.columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _key(key):
+    if isinstance(key, np.generic):
+        return key.item()
+    if isinstance(key, pd.Timestamp):
+        return key.isoformat()
+    return key
+
+
+def to_builtin(obj):
+    """``obj`` with every DataFrame, Series, NumPy and pandas value replaced by native JSON types.
+
+    Frames become lists of records, Series become {index: value} and pandas arrays become
+    lists; their columns are converted column-wise, only the containers around them are walked.
+    """
+    if isinstance(obj, dict):
+        return {_key(key): to_builtin(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_builtin(item) for item in obj]
+    if isinstance(obj, pd.DataFrame):
+        return frame_records(obj)
+    if isinstance(obj, pd.Series):
+        return dict(zip([_key(key) for key in obj.index], column_values(obj)))
+    if isinstance(obj, pd.api.extensions.ExtensionArray):
+        return column_values(obj)
+    if isinstance(obj, np.ndarray):
+        if obj.ndim == 1:
+            return column_values(obj)
+        return [to_builtin(row) for row in obj]
+    if isinstance(obj, float):
+        return None if math.isnan(obj) else float(obj)
+    if isinstance(obj, np.generic):
+        return to_builtin(obj.item())
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    return obj
+
+
+class FrameJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes pandas and NumPy values (NaN as null).
+
+    Installed as app.json, so jsonify() accepts frames, Series, arrays and NumPy scalars
+    anywhere in the payload.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return super().dumps(to_builtin(obj), **kwargs)
+
+    def dumps_rows(self, df, **kwargs):
+        """One JSON object (bytes) per row of ``df``"""
+        kwargs.setdefault('separators', (',', ':'))
+        # The records are native already, so skip the to_builtin walk of dumps()
+        dumps = super().dumps
+        return [dumps(record, **kwargs).encode() for record in frame_records(df)]
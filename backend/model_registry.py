@@ -0,0 +1,319 @@
+# model_registry.py
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# Where fitted models, encoders and metrics are stored between restarts
+MODEL_STORE_DIR = os.getenv('MODEL_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_store'))
+
+# Hyperparameters used by the ML Insights tab
+DEFAULT_MODEL_PARAMS = {
+    'n_estimators': 200,       # More trees
+    'max_depth': 10,           # Deeper trees
+    'min_samples_split': 3,    # More flexible splitting
+    'min_samples_leaf': 1,     # More flexible leaves
+    'max_features': 'sqrt',    # Better feature selection
+    'random_state': 42
+}
+
+# Simple but effective feature set
+DEFAULT_FEATURE_COLUMNS = [
+    'Pclass', 'Age', 'SibSp', 'Parch', 'Fare',
+    'Sex_encoded', 'Embarked_encoded', 'Title_encoded',
+    'FamilySize', 'IsAlone', 'IsChild', 'IsFemale', 'IsRich'  # Additional engineered features
+]
+
+
+def dataset_fingerprint(df):
+    """Content hash of a DataFrame, used as the data version of a model"""
+    hasher = hashlib.sha256()
+    hasher.update(','.join(map(str, df.columns)).encode())
+    hasher.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return hasher.hexdigest()[:16]
+
+
+def validate_training_spec(params=None, feature_columns=None):
+    """Reject hyperparameters or features the survival model does not know about"""
+    unknown_params = set(params or {}) - set(DEFAULT_MODEL_PARAMS)
+    if unknown_params:
+        raise ValueError(f"Unknown model parameters: {sorted(unknown_params)}")
+
+    unknown_features = set(feature_columns or []) - set(DEFAULT_FEATURE_COLUMNS)
+    if unknown_features:
+        raise ValueError(f"Unknown feature columns: {sorted(unknown_features)}")
+
+
+def prepare_features(cleaned_df, encoders=None):
+    """Build the engineered model features from the cleaned dataset.
+
+    Encoders are fitted when none are given, otherwise the fitted ones are reused.
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    features_df = cleaned_df.copy()
+
+    # FORCE CONVERT CRITICAL COLUMNS TO NUMERIC (double safety)
+    critical_numeric_cols = ['Survived', 'Pclass', 'Age', 'SibSp', 'Parch', 'Fare']
+    for col in critical_numeric_cols:
+        if col in features_df.columns:
+            features_df[col] = pd.to_numeric(features_df[col], errors='coerce')
+
+    features_df['FamilySize'] = features_df['SibSp'] + features_df['Parch'] + 1
+    features_df['IsAlone'] = (features_df['FamilySize'] == 1).astype(int)
+    features_df['IsChild'] = (features_df['Age'] < 12).astype(int)
+    features_df['IsFemale'] = (features_df['Sex'] == 'female').astype(int)
+    features_df['IsRich'] = ((features_df['Pclass'] == 1) & (features_df['Fare'] > 50)).astype(int)
+
+    if encoders is None:
+        encoders = {'Sex': LabelEncoder(), 'Embarked': LabelEncoder(), 'Title': LabelEncoder()}
+        features_df['Sex_encoded'] = encoders['Sex'].fit_transform(features_df['Sex'])
+        features_df['Embarked_encoded'] = encoders['Embarked'].fit_transform(features_df['Embarked'].fillna('S'))
+        features_df['Title_encoded'] = encoders['Title'].fit_transform(features_df['Title'])
+    else:
+        features_df['Sex_encoded'] = encoders['Sex'].transform(features_df['Sex'])
+        features_df['Embarked_encoded'] = encoders['Embarked'].transform(features_df['Embarked'].fillna('S'))
+        features_df['Title_encoded'] = encoders['Title'].transform(features_df['Title'])
+
+    return features_df, encoders
+
+
+@contextmanager
+def _timed_phase(name, timings, progress=None):
+    """Time one training phase and report its start/end to an optional progress callback"""
+    if progress:
+        progress(name, 'started', None)
+    start = time.perf_counter()
+    yield
+    timings[name] = round(time.perf_counter() - start, 4)
+    if progress:
+        progress(name, 'finished', timings[name])
+
+
+def train_survival_model(cleaned_df, params=None, feature_columns=None, progress=None):
+    """Fit the survival Random Forest and evaluate it.
+
+    Returns an artifact dict holding the fitted model, its encoders and the metrics
+    served by /api/regression/survival. ``progress(phase, event, seconds)`` is called
+    around the encode, cv, fit and evaluate phases.
+    """
+    from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
+    from sklearn.metrics import accuracy_score
+    from sklearn.ensemble import RandomForestClassifier
+
+    params = {**DEFAULT_MODEL_PARAMS, **(params or {})}
+    feature_columns = list(feature_columns or DEFAULT_FEATURE_COLUMNS)
+
+    print("🚀 RUNNING REAL MODEL WITH ENGINEERED FEATURES")
+
+    timings = {}
+
+    with _timed_phase('encode', timings, progress):
+        # Remove any rows with NaN in Survived (target variable)
+        features_df, encoders = prepare_features(cleaned_df.dropna(subset=['Survived']))
+
+        X = features_df[feature_columns]
+        y = features_df['Survived']
+
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    model = RandomForestClassifier(**params)
+
+    # CROSS-VALIDATION
+    print("📊 RUNNING 5-FOLD CROSS-VALIDATION...")
+    with _timed_phase('cv', timings, progress):
+        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+        cv_scores = cross_val_score(model, X_train, y_train, cv=cv, scoring='accuracy')
+
+    print(f"🎯 CROSS-VALIDATION RESULTS:")
+    print(f"   Fold Scores: {[f'{score:.3f}' for score in cv_scores]}")
+    print(f"   Mean CV Accuracy: {cv_scores.mean():.3f} (+/- {cv_scores.std() * 2:.3f})")
+
+    with _timed_phase('fit', timings, progress):
+        model.fit(X_train, y_train)
+
+    with _timed_phase('evaluate', timings, progress):
+        y_pred = model.predict(X_test)
+
+        accuracy = accuracy_score(y_test, y_pred)
+        train_accuracy = accuracy_score(y_train, model.predict(X_train))
+
+    print(f"🎯 FINAL RESULTS:")
+    print(f"   Test Accuracy: {accuracy:.3f}")
+    print(f"   Train Accuracy: {train_accuracy:.3f}")
+    print(f"   Overfitting Gap: {train_accuracy - accuracy:.3f} (ideal: < 0.05)")
+
+    feature_importance = {col: float(importance) for col, importance in zip(feature_columns, model.feature_importances_)}
+
+    # Sample predictions
+    sample_indices = X_test.index[:6]
+    sample_probabilities = model.predict_proba(X.loc[sample_indices])[:, 1]
+    sample_labels = model.predict(X.loc[sample_indices])
+    sample_predictions = []
+    for idx, prediction, probability in zip(sample_indices, sample_labels, sample_probabilities):
+        sample_predictions.append({
+            'passenger_data': cleaned_df.loc[idx].to_dict(),
+            'predicted_survival': int(prediction),
+            'actual_survival': int(y.loc[idx]),
+            'survival_probability': round(float(probability), 3),
+            'correct': bool(prediction == y.loc[idx])
+        })
+
+    metrics = {
+        'model_performance': {
+            'accuracy': float(accuracy),
+            'training_samples': int(len(X_train)),
+            'testing_samples': int(len(X_test)),
+            'model_type': 'Random Forest Classifier',
+            'feature_count': int(len(feature_columns)),
+            'cv_accuracy_mean': float(cv_scores.mean()),
+            'cv_accuracy_std': float(cv_scores.std()),
+            'train_accuracy': float(train_accuracy)
+        },
+        'feature_importance': feature_importance,
+        'sample_predictions': sample_predictions,
+        'coefficients': feature_importance
+    }
+
+    return {
+        'model': model,
+        'encoders': encoders,
+        'feature_columns': feature_columns,
+        'params': params,
+        'metrics': metrics,
+        'timings': timings
+    }
+
+
+class ModelRegistry:
+    """Trains the survival model once per (data version, params, features) and keeps it on disk"""
+
+    def __init__(self, store_dir=MODEL_STORE_DIR):
+        self.store_dir = store_dir
+        self._artifacts = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    @staticmethod
+    def artifact_key(data_version, params=None, feature_columns=None):
+        """Stable key identifying one trained artifact"""
+        spec = {
+            'data_version': data_version,
+            'params': {**DEFAULT_MODEL_PARAMS, **(params or {})},
+            'feature_columns': list(feature_columns or DEFAULT_FEATURE_COLUMNS)
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _paths(self, key):
+        return os.path.join(self.store_dir, f'{key}.joblib'), os.path.join(self.store_dir, f'{key}.json')
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key):
+        """Return a stored artifact from memory or disk, or None"""
+        artifact = self._artifacts.get(key)
+        if artifact is not None:
+            return artifact
+
+        model_path, _ = self._paths(key)
+        if not os.path.exists(model_path):
+            return None
+
+        try:
+            import joblib
+            artifact = joblib.load(model_path)
+        except Exception as e:
+            print(f"❌ Could not load model artifact {key}: {e}")
+            return None
+
+        self._artifacts[key] = artifact
+        return artifact
+
+    def save(self, key, artifact):
+        """Persist an artifact plus a small JSON sidecar used for listing"""
+        model_path, meta_path = self._paths(key)
+        # A unique temp file per writer: a job and a request may store the same key at once
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, prefix=f'{key}.', suffix='.joblib.tmp')
+        os.close(fd)
+        try:
+            import joblib
+            joblib.dump(artifact, tmp_path)
+            os.replace(tmp_path, model_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with open(meta_path, 'w') as f:
+            json.dump(self._metadata(key, artifact), f, indent=2)
+
+        self._artifacts[key] = artifact
+        return artifact
+
+    def evict(self, key):
+        """Drop an artifact from the in-memory cache so the next get() reloads it from disk"""
+        self._artifacts.pop(key, None)
+
+    def get_or_train(self, cleaned_df, data_version, params=None, feature_columns=None, force=False, progress=None):
+        """Serve the stored artifact for this spec, training it only when missing (or forced)"""
+        key = self.artifact_key(data_version, params, feature_columns)
+
+        if not force:
+            artifact = self.get(key)
+            if artifact is not None:
+                return artifact
+
+        # One trainer per key; concurrent requests wait for it instead of training again
+        with self._key_lock(key):
+            if not force:
+                artifact = self.get(key)
+                if artifact is not None:
+                    return artifact
+
+            artifact = train_survival_model(cleaned_df, params, feature_columns, progress)
+            artifact.update({
+                'key': key,
+                'data_version': data_version,
+                'created_at': datetime.now().isoformat()
+            })
+            self.save(key, artifact)
+            print(f"✅ Model artifact {key} stored for data version {data_version}")
+            return artifact
+
+    def list_artifacts(self):
+        """Metadata of every stored artifact, newest first"""
+        artifacts = []
+        for name in os.listdir(self.store_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.store_dir, name)) as f:
+                    artifacts.append(json.load(f))
+            except Exception as e:
+                print(f"⚠️ Skipping unreadable model metadata {name}: {e}")
+        return sorted(artifacts, key=lambda a: a.get('created_at', ''), reverse=True)
+
+    @staticmethod
+    def _metadata(key, artifact):
+        performance = artifact['metrics']['model_performance']
+        return {
+            'key': key,
+            'data_version': artifact.get('data_version'),
+            'created_at': artifact.get('created_at'),
+            'params': artifact['params'],
+            'feature_columns': artifact['feature_columns'],
+            'accuracy': performance['accuracy'],
+            'cv_accuracy_mean': performance['cv_accuracy_mean'],
+            'training_samples': performance['training_samples'],
+            'testing_samples': performance['testing_samples']
+        }
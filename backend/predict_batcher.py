@@ -0,0 +1,118 @@
+# predict_batcher.py
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from predictor import check_passengers, first_error, prepare_passengers
+
+# Passengers coalesced into one scoring call at most; larger requests are scored on their own
+PREDICT_BATCH_MAX_ROWS = int(os.getenv('PREDICT_BATCH_MAX_ROWS', 256))
+# How long the oldest queued request waits for others to join its batch (0 turns batching off)
+PREDICT_BATCH_WAIT_MS = float(os.getenv('PREDICT_BATCH_WAIT_MS', 2))
+
+
+class PredictBatcher:
+    """Coalesces concurrent predict requests into one scoring call.
+
+    Each request thread queues its passengers and blocks; a dispatcher thread flushes the
+    queue as a single prepare + predict_proba pass once ``max_rows`` passengers are waiting
+    or the oldest request has waited ``max_wait_ms``, then hands every request its own
+    slice of the results. An invalid passenger only fails the request that sent it.
+    """
+
+    def __init__(self, max_rows=PREDICT_BATCH_MAX_ROWS, max_wait_ms=PREDICT_BATCH_WAIT_MS):
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_started(self):
+        # The dispatcher thread is only started once the first request is queued
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name='predict-batcher')
+                self._thread.start()
+
+    def predict_passengers(self, predictor, passengers):
+        """(labels, probabilities) like ``predictor.predict_passengers``, scored together with concurrent requests"""
+        if self.max_wait <= 0 or len(passengers) >= self.max_rows:
+            return predictor.predict_passengers(passengers)
+        check_passengers(passengers)
+
+        future = Future()
+        self._ensure_started()
+        self._queue.put((predictor, passengers, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            rows = len(pending[0][1])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_rows:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                rows += len(item[1])
+            self._flush(pending)
+
+    def _flush(self, pending):
+        # Requests that raced a model switch are scored per model
+        groups = {}
+        for item in pending:
+            groups.setdefault(item[0].key, []).append(item)
+
+        for group in groups.values():
+            try:
+                self._score(group)
+            except Exception as e:
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+
+        self.batches += 1
+        self.requests += len(pending)
+        self.rows += sum(len(passengers) for _, passengers, _ in pending)
+
+    @staticmethod
+    def _score(group):
+        predictor = group[0][0]
+        frame, errors = prepare_passengers(pd.DataFrame.from_records(
+            [passenger for _, passengers, _ in group for passenger in passengers]
+        ))
+        # Field errors are reported before unknown labels, as predict_passengers does
+        field_errors = errors.copy()
+        labels, probabilities, errors = predictor.score_rows(frame, errors)
+
+        start = 0
+        for _, passengers, future in group:
+            stop = start + len(passengers)
+            message = first_error(field_errors.iloc[start:stop]) or first_error(errors.iloc[start:stop])
+            if message is not None:
+                future.set_exception(ValueError(message))
+            else:
+                future.set_result((labels[start:stop], probabilities[start:stop]))
+            start = stop
+
+    def stats(self):
+        return {
+            'max_rows': self.max_rows,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'requests': self.requests,
+            'rows': self.rows,
+            'mean_batch_requests': round(self.requests / self.batches, 2) if self.batches else None
+        }
@@ -0,0 +1,196 @@
+# prediction_table.py
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Serve predictions from a precomputed table of the registered model (off by default)
+PREDICT_LOOKUP = os.getenv('PREDICT_LOOKUP', 'false').lower() == 'true'
+
+# Grid of the table; passengers outside it are scored by the model itself
+LOOKUP_AGE_STEP = float(os.getenv('LOOKUP_AGE_STEP', 2))
+LOOKUP_AGE_MAX = float(os.getenv('LOOKUP_AGE_MAX', 90))
+LOOKUP_FARE_EDGES = [float(edge) for edge in os.getenv(
+    'LOOKUP_FARE_EDGES', '0,5,7.5,8,9,10,12,15,20,25,30,40,50,60,75,100,150,250,520'
+).split(',')]
+LOOKUP_MAX_SIBSP = int(os.getenv('LOOKUP_MAX_SIBSP', 5))
+LOOKUP_MAX_PARCH = int(os.getenv('LOOKUP_MAX_PARCH', 4))
+PCLASSES = (1, 2, 3)
+
+# Cut points of the engineered features (IsChild: Age < 12, IsRich: Fare > 50); they are
+# always bucket edges so every passenger of a bucket gets the same engineered flags
+AGE_CUTS = (12,)
+FARE_CUTS = (50,)
+
+# Cells scored per predict_proba call while building, and threads scoring them
+LOOKUP_BUILD_CHUNK = int(os.getenv('LOOKUP_BUILD_CHUNK', 100000))
+LOOKUP_WORKERS = int(os.getenv('LOOKUP_WORKERS', os.cpu_count() or 1))
+
+
+def default_grid():
+    """Axis values of the table: categories and counts as they are, Age and Fare as bucket edges"""
+    return {
+        'Pclass': list(PCLASSES),
+        'SibSp': list(range(LOOKUP_MAX_SIBSP + 1)),
+        'Parch': list(range(LOOKUP_MAX_PARCH + 1)),
+        'Age': np.union1d(np.arange(0, LOOKUP_AGE_MAX + LOOKUP_AGE_STEP, LOOKUP_AGE_STEP), AGE_CUTS).tolist(),
+        'Fare': np.union1d(LOOKUP_FARE_EDGES, FARE_CUTS).tolist(),
+    }
+
+
+class PredictionTable:
+    """Survival probabilities of one model over a discretized passenger grid.
+
+    Axes are Pclass, Sex, Embarked, Title (the encoder classes), SibSp, Parch, and Age and
+    Fare buckets. Age buckets are [a, b) like IsChild's Age < 12; Fare buckets are (a, b]
+    like IsRich's Fare > 50. Each cell holds the model's probability at the bucket midpoint,
+    so a lookup is one fancy-indexing read of a dense float32 array.
+    """
+
+    AXES = ('Pclass', 'Sex', 'Embarked', 'Title', 'SibSp', 'Parch', 'Age', 'Fare')
+
+    def __init__(self, key, grid, probabilities):
+        self.key = key
+        self.grid = grid
+        self.probabilities = probabilities
+
+    @staticmethod
+    def axes(grid, encoders):
+        """Representative value of every index along each axis"""
+        age, fare = np.asarray(grid['Age']), np.asarray(grid['Fare'])
+        return {
+            'Pclass': np.asarray(grid['Pclass']),
+            'Sex': encoders['Sex'].classes_,
+            'Embarked': encoders['Embarked'].classes_,
+            'Title': encoders['Title'].classes_,
+            'SibSp': np.asarray(grid['SibSp']),
+            'Parch': np.asarray(grid['Parch']),
+            'Age': (age[:-1] + age[1:]) / 2,
+            'Fare': (fare[:-1] + fare[1:]) / 2,
+        }
+
+    @classmethod
+    def build(cls, predictor, grid=None, workers=LOOKUP_WORKERS, chunk=LOOKUP_BUILD_CHUNK):
+        """Score every cell with ``predictor``; chunks run in a thread pool (tree traversal releases the GIL)"""
+        grid = grid or default_grid()
+        axes = cls.axes(grid, predictor.encoders)
+        shape = tuple(len(axes[name]) for name in cls.AXES)
+        size = int(np.prod(shape))
+
+        def score(start):
+            cells = np.unravel_index(np.arange(start, min(start + chunk, size)), shape)
+            frame = pd.DataFrame({name: axes[name][index] for name, index in zip(cls.AXES, cells)})
+            return predictor.model_probabilities(frame)
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            probabilities = np.concatenate(list(pool.map(score, range(0, size, chunk))))
+        return cls(predictor.key, grid, probabilities.astype(np.float32).reshape(shape))
+
+    def lookup(self, frame, encoders):
+        """(probabilities, hit) for a prepared passenger frame; rows with hit False are off the grid"""
+        axes = self.axes(self.grid, encoders)
+        hit = np.ones(len(frame), dtype=bool)
+        index = []
+        for name in self.AXES:
+            if name in ('Age', 'Fare'):
+                edges = np.asarray(self.grid[name])
+                values = frame[name].to_numpy(dtype=float)
+                if name == 'Age':
+                    position = np.searchsorted(edges, values, side='right') - 1
+                    hit &= (values >= edges[0]) & (values < edges[-1])
+                else:
+                    position = np.searchsorted(edges, values, side='left') - 1
+                    hit &= (values >= edges[0]) & (values <= edges[-1])
+                position = np.clip(position, 0, len(edges) - 2)
+            else:
+                position = pd.Index(axes[name]).get_indexer(frame[name])
+                hit &= position >= 0
+            index.append(np.where(hit, position, 0))
+
+        probabilities = self.probabilities[tuple(index)].astype(float)
+        probabilities[~hit] = np.nan
+        return probabilities, hit
+
+    @property
+    def nbytes(self):
+        return self.probabilities.nbytes
+
+    def info(self):
+        return {
+            'model_version': self.key,
+            'shape': dict(zip(self.AXES, self.probabilities.shape)),
+            'cells': int(self.probabilities.size),
+            'bytes': int(self.nbytes),
+            'grid': self.grid
+        }
+
+    def save(self, path):
+        tmp_path = f'{path}.tmp.npz'
+        np.savez(tmp_path, probabilities=self.probabilities,
+                 **{f'grid_{name}': np.asarray(values) for name, values in self.grid.items()})
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, key):
+        with np.load(path) as stored:
+            grid = {name[len('grid_'):]: stored[name].tolist() for name in stored.files if name.startswith('grid_')}
+            return cls(key, grid, stored['probabilities'])
+
+
+class PredictionTables:
+    """Tables of registered models, built once per model in the background and kept on disk"""
+
+    def __init__(self, store_dir, grid=None):
+        self.store_dir = store_dir
+        self.grid = grid or default_grid()
+        self._tables = {}
+        self._building = set()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.store_dir, f'{key}.lookup.npz')
+
+    def get(self, predictor):
+        """The ready table of ``predictor``'s model, or None while it is being built"""
+        table = self._tables.get(predictor.key)
+        if table is not None:
+            return table
+
+        with self._lock:
+            if predictor.key in self._building:
+                return None
+            path = self._path(predictor.key)
+            if os.path.exists(path):
+                try:
+                    table = PredictionTable.load(path, predictor.key)
+                    if table.grid == self.grid:
+                        self._tables[predictor.key] = table
+                        return table
+                except Exception as e:
+                    print(f"⚠️ Rebuilding unreadable prediction table {predictor.key}: {e}")
+            self._building.add(predictor.key)
+
+        threading.Thread(target=self._build, args=(predictor,), daemon=True, name='prediction-table').start()
+        return None
+
+    def _build(self, predictor):
+        try:
+            table = PredictionTable.build(predictor, self.grid)
+            table.save(self._path(predictor.key))
+            self._tables[predictor.key] = table
+            print(f"🧮 Prediction table {predictor.key}: {table.probabilities.size:,} cells, "
+                  f"{table.nbytes / 2**20:.1f}MB")
+        except Exception as e:
+            print(f"❌ Prediction table {predictor.key} failed: {e}")
+        finally:
+            with self._lock:
+                self._building.discard(predictor.key)
+
+    def stats(self):
+        return {
+            'enabled': PREDICT_LOOKUP,
+            'ready': [table.info() for table in self._tables.values()],
+            'building': sorted(self._building)
+        }
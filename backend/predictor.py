@@ -0,0 +1,194 @@
+# predictor.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import TITLE_MAPPING
+from forest_evaluator import FOREST_EVAL_MAX_ROWS, compiled_forest
+from model_registry import prepare_features
+
+# Fields a predict request may leave out, filled like clean_titanic_data fills train.csv
+# (medians of Age and Fare, mode of Embarked); Title is inferred from Sex and Age
+PASSENGER_DEFAULTS = {'Age': 28.0, 'SibSp': 0, 'Parch': 0, 'Fare': 14.4542, 'Embarked': 'S'}
+REQUIRED_FIELDS = ('Sex', 'Pclass')
+NUMERIC_FIELDS = ('Pclass', 'Age', 'SibSp', 'Parch', 'Fare')
+PCLASSES = (1, 2, 3)
+# Largest value each numeric field may take; far above anyone aboard, but keeps
+# values like 1e308 from reaching the model
+NUMERIC_MAX = {'Age': 120, 'SibSp': 20, 'Parch': 20, 'Fare': 10000}
+
+# Largest number of passengers one /api/regression/predict call may score
+PREDICT_MAX_BATCH = int(os.getenv('PREDICT_MAX_BATCH', 100000))
+
+TITLE_GROUPS = set(TITLE_MAPPING.values())
+
+
+def _infer_title(frame):
+    """Title for passengers sent without one: Master/Mr for boys/men, Miss/Mrs for girls/women"""
+    female = frame['Sex'] == 'female'
+    young = frame['Age'] < np.where(female, 18, 13)
+    return pd.Series(
+        np.where(female, np.where(young, 'Miss', 'Mrs'), np.where(young, 'Master', 'Mr')),
+        index=frame.index
+    )
+
+
+def _flag(errors, invalid, message):
+    """Record ``message(row)`` for the invalid rows that have no error yet"""
+    rows = np.flatnonzero(invalid.to_numpy() & errors.isna().to_numpy())
+    for row in rows:
+        errors.iloc[row] = message(row)
+
+
+def _raw(series, row):
+    """Value of ``row`` as sent, for error messages (numpy scalars as plain Python values)"""
+    value = series.iloc[row]
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def prepare_passengers(frame):
+    """(frame, errors) for passengers with the cleaned dataset's columns.
+
+    Missing optional fields get PASSENGER_DEFAULTS and titles outside the cleaned groups
+    are inferred. ``errors`` holds the first problem of each invalid row (None when valid);
+    those rows keep placeholder values and must not be scored.
+    """
+    frame = frame.reset_index(drop=True)
+    errors = pd.Series(None, index=frame.index, dtype=object)
+
+    for field in REQUIRED_FIELDS:
+        if field not in frame.columns:
+            frame[field] = None
+        _flag(errors, frame[field].isna(), lambda row, field=field: f"'{field}' is required")
+
+    for field, default in PASSENGER_DEFAULTS.items():
+        if field not in frame.columns:
+            frame[field] = default
+        elif field not in NUMERIC_FIELDS:
+            frame[field] = frame[field].fillna(default)
+
+    for field in NUMERIC_FIELDS:
+        raw = frame[field]
+        if pd.api.types.is_bool_dtype(raw) or raw.dtype == object:
+            # to_numeric reads true/false as 1/0
+            boolean = raw.map(lambda value: isinstance(value, (bool, np.bool_))).astype(bool)
+            _flag(errors, boolean, lambda row, field=field: f"'{field}' must be a number, got {_raw(raw, row)!r}")
+        # Nulls (JSON null, empty cells) get the default once the column is numeric
+        values = pd.to_numeric(raw, errors='coerce')
+        if pd.api.types.is_bool_dtype(values):
+            values = values.astype(float)
+        _flag(errors, (values.isna() | (values < 0)) & raw.notna(),
+              lambda row, field=field: f"'{field}' must be a non-negative number, got {_raw(raw, row)!r}")
+        if field == 'Pclass':
+            _flag(errors, values.notna() & ~values.isin(PCLASSES),
+                  lambda row: f"'Pclass' must be 1, 2 or 3, got {_raw(raw, row)!r}")
+        else:
+            _flag(errors, values > NUMERIC_MAX[field],
+                  lambda row, field=field: f"'{field}' must be at most {NUMERIC_MAX[field]}, got {_raw(raw, row)!r}")
+        default = PASSENGER_DEFAULTS.get(field, 1)
+        frame[field] = values.where(errors.isna(), default).fillna(default)
+
+    frame['Sex'] = frame['Sex'].astype(str).str.lower()
+    inferred = _infer_title(frame)
+    if 'Title' in frame.columns:
+        # Raw titles (Dr, Mlle, ...) are grouped like clean_titanic_data groups them
+        titles = frame['Title'].map(lambda title: TITLE_MAPPING.get(title, title) if isinstance(title, str) else None)
+        frame['Title'] = titles.where(titles.isin(TITLE_GROUPS), inferred)
+    else:
+        frame['Title'] = inferred
+    return frame, errors
+
+
+def check_passengers(passengers):
+    if not passengers:
+        raise ValueError('No passengers to score')
+    if not all(isinstance(passenger, dict) for passenger in passengers):
+        raise ValueError('Every passenger must be a JSON object')
+
+
+def passengers_frame(passengers):
+    """Frame for a list of passenger dicts; raises ValueError naming the first invalid passenger"""
+    check_passengers(passengers)
+    frame, errors = prepare_passengers(pd.DataFrame.from_records(passengers))
+    _raise_first(errors)
+    return frame
+
+
+def first_error(errors):
+    """'Passenger i: problem' for the first invalid row of ``errors`` (positions count from 0), or None"""
+    invalid = np.flatnonzero(errors.notna().to_numpy())
+    return f"Passenger {int(invalid[0])}: {errors.iloc[invalid[0]]}" if len(invalid) else None
+
+
+def _raise_first(errors):
+    message = first_error(errors)
+    if message is not None:
+        raise ValueError(message)
+
+
+class SurvivalPredictor:
+    """Scores passengers with a registered model artifact and its fitted encoders"""
+
+    def __init__(self, artifact, table=None):
+        self.model = artifact['model']
+        self.encoders = artifact['encoders']
+        self.feature_columns = artifact['feature_columns']
+        self.key = artifact.get('key')
+        self.data_version = artifact.get('data_version')
+        # Optional PredictionTable of this model; passengers on its grid skip the model
+        self.table = table
+        # Node arrays of the forest for small batches, walked without sklearn's per-call
+        # validation and dispatch
+        self.forest = compiled_forest(self.model)
+
+    def label_errors(self, frame, errors=None):
+        """Add an error for every label the encoders were not fitted on (transform would fail)"""
+        errors = pd.Series(None, index=frame.index, dtype=object) if errors is None else errors
+        for column, encoder in self.encoders.items():
+            _flag(errors, ~frame[column].isin(encoder.classes_),
+                  lambda row, column=column, encoder=encoder: f"unknown {column} {frame[column].iloc[row]!r}, "
+                                                              f"expected one of {', '.join(map(str, encoder.classes_))}")
+        return errors
+
+    def _model_scores(self, frame):
+        features, _ = prepare_features(frame, self.encoders)
+        scorer = self.forest if self.forest is not None and len(features) <= FOREST_EVAL_MAX_ROWS else self.model
+        probabilities = scorer.predict_proba(features[self.feature_columns])
+        labels = self.model.classes_[np.argmax(probabilities, axis=1)].astype(int)
+        survived = probabilities[:, list(self.model.classes_).index(1)]
+        return labels, survived
+
+    def model_probabilities(self, frame):
+        """Survival probability of every row from the model itself, never the table"""
+        return self._model_scores(frame)[1]
+
+    def _score(self, frame):
+        if self.table is None:
+            return self._model_scores(frame)
+        survived, hit = self.table.lookup(frame, self.encoders)
+        labels = (survived > 0.5).astype(int)
+        if not hit.all():
+            labels[~hit], survived[~hit] = self._model_scores(frame[~hit])
+        return labels, survived
+
+    def predict(self, frame):
+        """(predicted labels, survival probabilities) of every row, from one predict_proba call"""
+        _raise_first(self.label_errors(frame))
+        return self._score(frame)
+
+    def predict_passengers(self, passengers):
+        return self.predict(passengers_frame(passengers))
+
+    def score_rows(self, frame, errors):
+        """Score the valid rows of a prepared frame in one call.
+
+        Returns (labels, probabilities, errors); invalid rows get label -1 and probability NaN.
+        """
+        errors = self.label_errors(frame, errors)
+        valid = errors.isna().to_numpy()
+        labels = np.full(len(frame), -1, dtype=int)
+        probabilities = np.full(len(frame), np.nan)
+        if valid.any():
+            labels[valid], probabilities[valid] = self._score(frame[valid])
+        return labels, probabilities, errors
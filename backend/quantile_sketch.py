@@ -0,0 +1,209 @@
+# quantile_sketch.py
+import math
+import os
+import time
+
+import numpy as np
+
+# Target rank error of the approximate percentiles (0.01 = within 1% of the rank)
+SUMMARY_SKETCH_ERROR = float(os.getenv('SUMMARY_SKETCH_ERROR', 0.01))
+# Rows per partition when a summary sketch is built from a large frame
+SUMMARY_SKETCH_CHUNK_ROWS = int(os.getenv('SUMMARY_SKETCH_CHUNK_ROWS', 100_000))
+
+# /api/summary mode: 'exact' (describe()), 'sketch', or 'auto' (sketch from SUMMARY_SKETCH_MIN_ROWS rows)
+SUMMARY_MODE = os.getenv('SUMMARY_MODE', 'auto')
+SUMMARY_SKETCH_MIN_ROWS = int(os.getenv('SUMMARY_SKETCH_MIN_ROWS', 100_000))
+SUMMARY_MODES = ('exact', 'sketch')
+
+# Percentiles reported by describe()
+DESCRIBE_PERCENTILES = {'25%': 0.25, '50%': 0.5, '75%': 0.75}
+
+
+def summary_mode(rows, requested=None):
+    """Summary mode for a dataset of ``rows`` rows ('exact' or 'sketch')"""
+    mode = requested or SUMMARY_MODE
+    if mode == 'auto':
+        return 'sketch' if rows >= SUMMARY_SKETCH_MIN_ROWS else 'exact'
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode '{mode}', expected one of {['auto', *SUMMARY_MODES]}")
+    return mode
+
+
+def k_for_error(error):
+    """KLL size parameter whose rank error stays below ``error`` (empirically ~1.7/k)"""
+    return max(16, math.ceil(1.7 / error))
+
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch (Karnin, Lang, Liberty).
+
+    Level h holds items standing for 2**h values each. A full level is sorted and every
+    other item is promoted to the next level, so memory stays O(k) however many values
+    arrive and a quantile's rank is off by about error * n at most.
+    Sketches are never modified after they are returned: update() and merge() build new ones.
+    """
+
+    CAPACITY_DECAY = 2 / 3
+
+    def __init__(self, k, levels=None, n=0, seed=0):
+        self.k = k
+        self.levels = levels if levels is not None else [np.empty(0)]
+        self.n = n
+        self._rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.CAPACITY_DECAY ** depth)))
+
+    def update(self, values):
+        """Sketch with ``values`` (NaN skipped) added"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        levels = list(self.levels)
+        levels[0] = np.concatenate([levels[0], values])
+        sketch = KLLSketch(self.k, levels, self.n + len(values), seed=self.n + len(values))
+        sketch._compress()
+        return sketch
+
+    def merge(self, other):
+        """Sketch of both inputs' values"""
+        depth = max(len(self.levels), len(other.levels))
+        pad = lambda levels: list(levels) + [np.empty(0)] * (depth - len(levels))
+        levels = [np.concatenate(pair) for pair in zip(pad(self.levels), pad(other.levels))]
+        sketch = KLLSketch(max(self.k, other.k), levels, self.n + other.n, seed=self.n + other.n)
+        sketch._compress()
+        return sketch
+
+    def _compress(self):
+        while sum(len(level) for level in self.levels) > sum(self.capacity(h) for h in range(len(self.levels))):
+            for h, level in enumerate(self.levels):
+                if len(level) >= self.capacity(h):
+                    break
+            if h == len(self.levels) - 1:
+                self.levels.append(np.empty(0))
+
+            items = np.sort(self.levels[h])
+            # An odd item out stays at this level; a random offset keeps the halving unbiased
+            keep, items = items[:len(items) % 2], items[len(items) % 2:]
+            promoted = items[self._rng.integers(2)::2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def quantiles(self, qs):
+        """Approximate values at the fractions ``qs`` of the sorted data"""
+        if not self.n:
+            return [np.nan for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        # Weight of the item at rank q * (n - 1), the rank describe() interpolates around
+        targets = np.asarray(qs) * (cumulative[-1] - 1) + 1
+        positions = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(items) - 1)
+        return [float(value) for value in items[positions]]
+
+    def size(self):
+        return sum(len(level) for level in self.levels)
+
+
+class ColumnSummary:
+    """Exact count/mean/M2/min/max plus a KLL sketch of one column"""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'sketch')
+
+    def __init__(self, count, mean, m2, minimum, maximum, sketch):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = minimum
+        self.max = maximum
+        self.sketch = sketch
+
+    @classmethod
+    def from_values(cls, values, k):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return cls(0, 0.0, 0.0, np.inf, -np.inf, KLLSketch(k))
+        mean = values.mean()
+        deviations = values - mean
+        return cls(len(values), float(mean), float(deviations @ deviations),
+                   float(values.min()), float(values.max()), KLLSketch(k).update(values))
+
+    def merge(self, other):
+        count = self.count + other.count
+        if not count:
+            return self
+        delta = other.mean - self.mean
+        return ColumnSummary(
+            count,
+            self.mean + delta * other.count / count,
+            self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min(self.min, other.min),
+            max(self.max, other.max),
+            self.sketch.merge(other.sketch)
+        )
+
+    def describe(self):
+        """The describe() statistics: exact moments and extremes, sketched percentiles"""
+        if not self.count:
+            return {stat: (0.0 if stat == 'count' else np.nan)
+                    for stat in ['count', 'mean', 'std', 'min', *DESCRIBE_PERCENTILES, 'max']}
+        percentiles = self.sketch.quantiles(list(DESCRIBE_PERCENTILES.values()))
+        return {
+            'count': float(self.count),
+            'mean': self.mean,
+            'std': math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan,
+            'min': self.min,
+            **dict(zip(DESCRIBE_PERCENTILES, percentiles)),
+            'max': self.max
+        }
+
+
+class SummarySketch:
+    """describe()-style summary of the numeric columns that is maintained incrementally.
+
+    count/mean/std/min/max are exact; 25%/50%/75% come from KLL sketches within the
+    configured rank error. Summaries of partitions merge, and appended rows are folded
+    in without rescanning, so serving a summary costs the same at any dataset size.
+    """
+
+    def __init__(self, columns, summaries, error):
+        self.columns = list(columns)
+        self.summaries = summaries
+        self.error = error
+
+    @classmethod
+    def from_frame(cls, df, error=SUMMARY_SKETCH_ERROR, chunk_rows=SUMMARY_SKETCH_CHUNK_ROWS):
+        start = time.perf_counter()
+        columns = list(df.select_dtypes(include=[np.number]).columns)
+        sketch = None
+        for lo in range(0, max(len(df), 1), chunk_rows):
+            part = cls.from_partition(df.iloc[lo:lo + chunk_rows], columns, error)
+            sketch = part if sketch is None else sketch.merge(part)
+        print(f"📏 Summary sketch of {len(columns)} columns over {len(df)} rows "
+              f"(rank error {error:g}) in {time.perf_counter() - start:.3f}s")
+        return sketch
+
+    @classmethod
+    def from_partition(cls, df, columns, error=SUMMARY_SKETCH_ERROR):
+        k = k_for_error(error)
+        return cls(columns, {col: ColumnSummary.from_values(df[col].to_numpy(dtype=np.float64), k) for col in columns}, error)
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError(f"Cannot merge summaries of {other.columns} into {self.columns}")
+        return SummarySketch(
+            self.columns,
+            {col: self.summaries[col].merge(other.summaries[col]) for col in self.columns},
+            self.error
+        )
+
+    def update(self, df):
+        """Summary with the rows of ``df`` appended"""
+        return self.merge(SummarySketch.from_partition(df, self.columns, self.error))
+
+    def describe(self):
+        """{column: {statistic: value}}, the shape of DataFrame.describe().to_dict()"""
+        return {col: self.summaries[col].describe() for col in self.columns}
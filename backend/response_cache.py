@@ -0,0 +1,81 @@
+# response_cache.py
+import hashlib
+import threading
+
+from compression import COMPRESS_MIN_BYTES, compress
+
+
+class CachedResponse:
+    """Serialized response body, its strong ETag and its compressed variants"""
+
+    __slots__ = ('body', 'etag', 'variants')
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {}
+
+    def variant(self, encoding):
+        """(body, etag) to send for ``encoding``; compressed on first use, then kept with the entry.
+
+        Small bodies and ``encoding`` None get the identity body.
+        """
+        if encoding is None or len(self.body) < COMPRESS_MIN_BYTES:
+            return self.body, self.etag
+        body = self.variants.get(encoding)
+        if body is None:
+            # Concurrent first requests may both compress; the results are identical
+            body = compress(self.body, encoding)
+            self.variants[encoding] = body
+        # Each representation needs its own strong ETag
+        return body, f'{self.etag}-{encoding}'
+
+
+class ResponseCache:
+    """Serialized JSON of the aggregate endpoints, keyed by (endpoint, dataset version).
+
+    Aggregates only change when a new dataset version is published, so entries never
+    expire on their own; invalidate() drops the old versions (and their compressed
+    variants) after a publish.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, name, version, build):
+        """Cached response for ``name`` at ``version``, serialized by ``build()`` on a miss"""
+        key = (name, version)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        # Concurrent misses may both build; the results are identical and the last one wins
+        entry = CachedResponse(build())
+        with self._lock:
+            self._entries[key] = entry
+            self.misses += 1
+        return entry
+
+    def invalidate(self, current_version):
+        """Drop every entry that does not belong to ``current_version``"""
+        with self._lock:
+            stale = [key for key in self._entries if key[1] != current_version]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': sum(len(entry.body) for entry in self._entries.values()),
+            'compressed_bytes': {
+                encoding: sum(len(entry.variants[encoding]) for entry in self._entries.values() if encoding in entry.variants)
+                for encoding in ('br', 'gzip')
+            },
+            'hits': self.hits,
+            'misses': self.misses
+        }
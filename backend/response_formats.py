@@ -0,0 +1,69 @@
+# response_formats.py
+import json
+
+import pandas as pd
+
+# Response formats of the data endpoints: ?format=<name> or the matching Accept type
+FORMATS = {
+    'json': 'application/json',
+    'columns': 'application/vnd.titanic.columns+json',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+
+class FormatNotAvailable(Exception):
+    """The requested format cannot be produced here (e.g. pyarrow is not installed)"""
+
+
+def negotiate_format(request, default='json'):
+    """Format named by ?format=, else the best match of the Accept header, else ``default``"""
+    name = request.args.get('format')
+    if name:
+        if name not in FORMATS:
+            raise ValueError(f"Unknown format '{name}', expected one of {', '.join(FORMATS)}")
+        return name
+
+    mimetypes = {mimetype: name for name, mimetype in FORMATS.items()}
+    # Browsers send */*, which keeps the default row JSON
+    best = request.accept_mimetypes.best_match([FORMATS[default], *mimetypes], default=FORMATS[default])
+    return mimetypes[best]
+
+
+def columnar(df):
+    """{columns: [...], data: {column: [...]}} with every column left as an array for the JSON provider"""
+    return {
+        'columns': [str(name) for name in df.columns],
+        'data': {str(name): df[name].array for name in df.columns}
+    }
+
+
+def records_frame(records, columns):
+    """Frame of a list of records (e.g. aggregate groups) with ``columns`` in that order"""
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def arrow_stream(df, metadata=None):
+    """Arrow IPC stream of ``df``.
+
+    Numeric columns and category codes are handed to Arrow without copying; only
+    string columns are converted. ``metadata`` is stored on the schema, non-string values as JSON.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise FormatNotAvailable('The arrow format needs pyarrow installed')
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            **{
+                str(key).encode(): (value if isinstance(value, str) else json.dumps(value)).encode()
+                for key, value in metadata.items()
+            }
+        })
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,148 @@
+# row_blocks.py
+import base64
+import time
+
+import numpy as np
+
+
+class RowBlock:
+    """Rows serialized to JSON once, stored back to back in one buffer.
+
+    offsets[i] is where row i starts; every row is followed by a comma, so the rows
+    start..stop are a single slice of the buffer however deep the page is.
+    """
+
+    __slots__ = ('buffer', 'offsets')
+
+    def __init__(self, buffer, offsets):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Block of ``rows``, an iterable of serialized JSON objects (bytes)"""
+        rows = [row + b',' for row in rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=offsets[1:])
+        return cls(b''.join(rows), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def slice(self, start, stop):
+        """JSON of rows start..stop, comma separated (without the enclosing brackets)"""
+        if stop <= start:
+            return b''
+        return self.buffer[self.offsets[start]:self.offsets[stop] - 1]
+
+    def take(self, positions, separator=b','):
+        """JSON of the rows at ``positions`` in that order, comma separated"""
+        return separator.join(self.slice(i, i + 1) for i in positions)
+
+    def lines(self, start, stop):
+        """Rows start..stop as newline-delimited JSON, each line ending in a newline"""
+        if stop <= start:
+            return b''
+        base = self.offsets[start]
+        chunk = bytearray(self.buffer[base:self.offsets[stop]])
+        # Every row is followed by a comma; turn those into newlines in one vectorized store
+        np.frombuffer(chunk, dtype=np.uint8)[self.offsets[start + 1:stop + 1] - base - 1] = ord('\n')
+        return bytes(chunk)
+
+    def append(self, rows):
+        """New block with ``rows`` added at the end"""
+        tail = RowBlock.from_rows(rows)
+        return RowBlock(self.buffer + tail.buffer, np.concatenate([self.offsets, tail.offsets[1:] + self.offsets[-1]]))
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(f'after:{key}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Key encoded in ``cursor`` (None for an empty cursor, the first page)"""
+    if not cursor:
+        return None
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        prefix, key = text.split(':', 1)
+        if prefix != 'after':
+            raise ValueError
+        return int(key)
+    except ValueError:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+class DataPages:
+    """Serialized rows of one dataset version, for offset pages and keyset cursors.
+
+    ``by_position`` follows the frame's row order (page/per_page and /api/head);
+    cursors walk ``by_key`` in key order, which is the same block when the frame is
+    already sorted by the key. ``serialize(df)`` returns one JSON object (bytes) per row.
+    """
+
+    def __init__(self, by_position, position_keys, key, serialize):
+        self.by_position = by_position
+        self.position_keys = position_keys
+        self.key = key
+        self.serialize = serialize
+
+        if len(position_keys) < 2 or np.all(np.diff(position_keys) > 0):
+            self.order = None
+            self.keys = position_keys
+            self.by_key = by_position
+        else:
+            # Reorder the already serialized rows instead of serializing them again
+            self.order = np.argsort(position_keys, kind='stable')
+            self.keys = position_keys[self.order]
+            self.by_key = RowBlock.from_rows(by_position.slice(i, i + 1) for i in self.order)
+
+    @classmethod
+    def from_frame(cls, df, serialize, key='PassengerId'):
+        start = time.perf_counter()
+        pages = cls(RowBlock.from_rows(serialize(df)), df[key].to_numpy(dtype=np.int64), key, serialize)
+        print(f"🧱 Serialized {len(df)} rows into row blocks ({pages.nbytes()} bytes) in {time.perf_counter() - start:.3f}s")
+        return pages
+
+    def extend(self, rows):
+        """Pages with ``rows`` appended at the end; only the new rows are serialized"""
+        return DataPages(
+            self.by_position.append(self.serialize(rows)),
+            np.concatenate([self.position_keys, rows[self.key].to_numpy(dtype=np.int64)]),
+            self.key,
+            self.serialize
+        )
+
+    def __len__(self):
+        return len(self.by_position)
+
+    def page(self, start, stop):
+        return self.by_position.slice(start, stop)
+
+    def key_range(self, key, limit, keys=None):
+        """Key-order range start..stop of the ``limit`` rows after ``key``, and the cursor of the next page.
+
+        ``keys`` (sorted) walks a subset of the rows, e.g. the matches of a filter, instead of all of them.
+        """
+        keys = self.keys if keys is None else keys
+        start = 0 if key is None else int(np.searchsorted(keys, key, side='right'))
+        stop = min(start + limit, len(keys))
+        next_cursor = encode_cursor(int(keys[stop - 1])) if stop < len(keys) else None
+        return start, stop, next_cursor
+
+    def positions(self, start, stop):
+        """Frame row positions of the key-order range start..stop (a slice when the frame is sorted)"""
+        if self.order is None:
+            return slice(start, stop)
+        return self.order[start:stop]
+
+    def after(self, key, limit):
+        """Up to ``limit`` rows with a key greater than ``key``, and the cursor of the next page"""
+        start, stop, next_cursor = self.key_range(key, limit)
+        return self.by_key.slice(start, stop), next_cursor
+
+    def nbytes(self):
+        total = len(self.by_position.buffer) + self.by_position.offsets.nbytes + self.position_keys.nbytes
+        if self.by_key is not self.by_position:
+            total += len(self.by_key.buffer) + self.by_key.offsets.nbytes + self.keys.nbytes + self.order.nbytes
+        return total
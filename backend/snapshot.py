@@ -0,0 +1,160 @@
+# snapshot.py
+import os
+import json
+import shutil
+import hashlib
+import inspect
+import time
+
+import numpy as np
+import pandas as pd
+
+# Columnar snapshots of the cleaned dataset, one directory per source hash
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+SNAPSHOTS_TO_KEEP = int(os.getenv('SNAPSHOTS_TO_KEEP', 3))
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def file_fingerprint(path):
+    """Content hash of a source file"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()[:16]
+
+
+def source_fingerprint(obj):
+    """Hash of a function's or module's source, so a changed cleaning step invalidates old snapshots"""
+    return hashlib.sha256(inspect.getsource(obj).encode()).hexdigest()[:8]
+
+
+def _snapshot_path(source_hash, snapshot_dir):
+    # Source hashes may carry a prefix such as 'csv:' or 'supabase:'
+    return os.path.join(snapshot_dir, source_hash.replace(':', '-'))
+
+
+def save_snapshot(df, source_hash, snapshot_dir=SNAPSHOT_DIR):
+    """Write every column of ``df`` as its own .npy file plus a meta.json describing them"""
+    final_path = _snapshot_path(source_hash, snapshot_dir)
+    tmp_path = f'{final_path}.tmp-{os.getpid()}'
+    os.makedirs(tmp_path, exist_ok=True)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {'name': col, 'file': f'{i}.npy'}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry['kind'] = 'category'
+            entry['categories'] = series.cat.categories.tolist()
+            entry['ordered'] = bool(series.cat.ordered)
+            np.save(os.path.join(tmp_path, entry['file']), series.cat.codes.to_numpy())
+        elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            # Fixed-width unicode keeps strings memory-mappable; nulls go in a separate mask
+            entry['kind'] = 'string'
+            entry['mask'] = f'{i}.mask.npy'
+            mask = series.isna().to_numpy()
+            values = series.where(~mask, '').astype(str).to_numpy(dtype=str)
+            np.save(os.path.join(tmp_path, entry['file']), values)
+            np.save(os.path.join(tmp_path, entry['mask']), mask)
+        else:
+            entry['kind'] = 'numeric'
+            np.save(os.path.join(tmp_path, entry['file']), series.to_numpy())
+        columns.append(entry)
+
+    index = df.index
+    meta = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'source_hash': source_hash,
+        'rows': len(df),
+        'columns': columns,
+        'attrs': df.attrs,
+        'range_index': isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+    }
+    if not meta['range_index']:
+        np.save(os.path.join(tmp_path, 'index.npy'), index.to_numpy())
+
+    with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    # Publish the finished directory in one rename so readers never see half a snapshot
+    shutil.rmtree(final_path, ignore_errors=True)
+    os.replace(tmp_path, final_path)
+    _prune_snapshots(snapshot_dir, keep=final_path)
+    return final_path
+
+
+def load_snapshot(source_hash, snapshot_dir=SNAPSHOT_DIR):
+    """Load a snapshot, memory-mapping the numeric columns. Returns None when missing or stale."""
+    path = _snapshot_path(source_hash, snapshot_dir)
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION or meta.get('source_hash') != source_hash:
+        return None
+
+    data = {}
+    for entry in meta['columns']:
+        file_path = os.path.join(path, entry['file'])
+        if entry['kind'] == 'numeric':
+            data[entry['name']] = np.load(file_path, mmap_mode='r')
+        elif entry['kind'] == 'category':
+            codes = np.load(file_path, mmap_mode='r')
+            data[entry['name']] = pd.Categorical.from_codes(
+                codes, categories=entry['categories'], ordered=entry['ordered']
+            )
+        else:
+            values = np.load(file_path).astype(object)
+            values[np.load(os.path.join(path, entry['mask']))] = None
+            data[entry['name']] = values
+
+    if meta['range_index']:
+        index = pd.RangeIndex(meta['rows'])
+    else:
+        index = pd.Index(np.load(os.path.join(path, 'index.npy'), allow_pickle=False))
+
+    # copy=False keeps the memory-mapped columns backed by the snapshot files
+    df = pd.DataFrame(data, index=index, copy=False)
+    df.attrs.update(meta.get('attrs', {}))
+    return df
+
+
+def load_or_build(source_hash, build, snapshot_dir=SNAPSHOT_DIR):
+    """Serve the cleaned frame from its snapshot, rebuilding it only when the source hash changed"""
+    start = time.perf_counter()
+    try:
+        df = load_snapshot(source_hash, snapshot_dir)
+    except Exception as e:
+        print(f"⚠️ Snapshot {source_hash} unreadable, rebuilding: {e}")
+        df = None
+
+    if df is not None:
+        print(f"🧊 Warm start: loaded snapshot {source_hash} ({len(df)} rows) in {time.perf_counter() - start:.3f}s")
+        return df
+
+    df = build()
+    built = time.perf_counter()
+    try:
+        save_snapshot(df, source_hash, snapshot_dir)
+        print(f"🔥 Cold start: built dataset in {built - start:.3f}s, "
+              f"wrote snapshot {source_hash} in {time.perf_counter() - built:.3f}s")
+    except Exception as e:
+        print(f"⚠️ Could not write snapshot {source_hash}: {e}")
+    return df
+
+
+def _prune_snapshots(snapshot_dir, keep):
+    """Keep only the most recent snapshots"""
+    entries = [
+        os.path.join(snapshot_dir, name) for name in os.listdir(snapshot_dir)
+        if os.path.isdir(os.path.join(snapshot_dir, name)) and '.tmp-' not in name
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[SNAPSHOTS_TO_KEEP:]:
+        if path != keep:
+            shutil.rmtree(path, ignore_errors=True)
@@ -1,5 +1,4 @@
 import os
-from supabase import create_client, Client
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -27,15 +26,19 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     except:
         raise ValueError("Missing Supabase credentials")
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Supabase client, created on first use (importing the supabase package is slow)
+supabase = None
 
 def get_supabase():
+    global supabase
+    if supabase is None:
+        from supabase import create_client
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
     return supabase
 
 def test_connection():
     try:
-        response = supabase.table('titanic_passengers').select("*").limit(1).execute()
+        response = get_supabase().table('titanic_passengers').select("*").limit(1).execute()
         print("✅ Supabase connection successful!")
         return True
     except Exception as e:
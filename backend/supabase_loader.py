@@ -0,0 +1,184 @@
+# supabase_loader.py
+import os
+import re
+import hashlib
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+import pandas as pd
+
+# PostgREST caps a single response at its max-rows setting (1000 on Supabase)
+SUPABASE_PAGE_SIZE = int(os.getenv('SUPABASE_PAGE_SIZE', 1000))
+SUPABASE_LOAD_WORKERS = int(os.getenv('SUPABASE_LOAD_WORKERS', 4))
+
+
+class PagedTableLoader:
+    """Loads a whole PostgREST table page by page.
+
+    Pages are requested by offset over a bounded thread pool when the row count is
+    known, or one after another by keyset (``order_column > last value``) when it is
+    not. Rows go straight into per-column buffers as each page arrives.
+    """
+
+    def __init__(self, base_url, api_key, table, page_size=SUPABASE_PAGE_SIZE,
+                 max_workers=SUPABASE_LOAD_WORKERS, order_column='id', timeout=30):
+        self.rest_url = f"{base_url.rstrip('/')}/rest/v1/{table}"
+        self.table = table
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.order_column = order_column
+        self.timeout = timeout
+        self.headers = {
+            'apikey': api_key,
+            'Authorization': f'Bearer {api_key}',
+            'Accept': 'application/json'
+        }
+        self.stats = {}
+        self._local = threading.local()
+
+    def _session(self):
+        # requests.Session is not thread-safe, so every pool thread keeps its own
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(self.headers)
+        return session
+
+    def count_rows(self):
+        """Exact row count from the Content-Range header, or None when unavailable"""
+        response = self._session().get(
+            self.rest_url,
+            params={'select': self.order_column, 'limit': 1},
+            headers={'Prefer': 'count=exact'},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        match = re.search(r'/(\d+)$', response.headers.get('Content-Range', ''))
+        return int(match.group(1)) if match else None
+
+    def fingerprint(self):
+        """Cheap identity of the table contents: exact row count plus the newest row.
+
+        Used to key snapshots without downloading the whole table.
+        """
+        response = self._session().get(
+            self.rest_url,
+            params={'select': '*', 'order': f'{self.order_column}.desc', 'limit': 1},
+            headers={'Prefer': 'count=exact'},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        hasher = hashlib.sha256()
+        hasher.update(self.table.encode())
+        hasher.update(response.headers.get('Content-Range', '').encode())
+        hasher.update(response.content)
+        return hasher.hexdigest()[:16]
+
+    def fetch_page(self, offset):
+        response = self._session().get(
+            self.rest_url,
+            params={
+                'select': '*',
+                'order': f'{self.order_column}.asc',
+                'limit': self.page_size,
+                'offset': offset
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_page_after(self, last_value):
+        params = {'select': '*', 'order': f'{self.order_column}.asc', 'limit': self.page_size}
+        if last_value is not None:
+            params[self.order_column] = f'gt.{last_value}'
+        response = self._session().get(self.rest_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _append(buffers, rows, row_count):
+        """Append one page of records to the column buffers"""
+        if not rows:
+            return row_count
+        # PostgREST returns the same keys for every record of a response
+        for col in rows[0].keys() - buffers.keys():
+            # Column first seen on a later page: back-fill the rows before it
+            buffers[col] = [None] * row_count
+        for col, values in buffers.items():
+            values.extend([row.get(col) for row in rows])
+        return row_count + len(rows)
+
+    def _load_by_range(self, total):
+        # The server may cap pages below page_size (max-rows), so the first page tells the
+        # real page size and the remaining offsets step by it
+        first = self.fetch_page(0)
+        buffers = {}
+        row_count = self._append(buffers, first, 0)
+        step = len(first)
+        offsets = range(step, total, step) if step else range(0)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.fetch_page, offset) for offset in offsets]
+            for future in as_completed(futures):
+                row_count = self._append(buffers, future.result(), row_count)
+
+        if row_count != total:
+            raise RuntimeError(f"Loaded {row_count} rows from {self.table} but it has {total} "
+                               f"(pages of {step} rows); the table changed while loading")
+        return buffers, row_count, len(offsets) + 1
+
+    def _load_by_keyset(self, last_value=None):
+        buffers, row_count, pages = {}, 0, 0
+        while True:
+            rows = self.fetch_page_after(last_value)
+            pages += 1
+            if not rows:
+                break
+            row_count = self._append(buffers, rows, row_count)
+            last_value = rows[-1].get(self.order_column)
+            # Only an empty page ends the scan: a short page may just be the server's max-rows cap
+            if last_value is None:
+                break
+        return buffers, row_count, pages
+
+    def load_after(self, last_value):
+        """Fetch only the rows whose ``order_column`` is past ``last_value`` (a delta)"""
+        buffers, row_count, pages = self._load_by_keyset(last_value)
+        return pd.DataFrame(buffers)
+
+    def load(self):
+        """Fetch every row of the table into a DataFrame ordered by ``order_column``"""
+        start = time.perf_counter()
+
+        try:
+            total = self.count_rows()
+        except requests.RequestException as e:
+            print(f"⚠️ Row count unavailable for {self.table}, paging by keyset: {e}")
+            total = None
+
+        if total is None:
+            buffers, row_count, pages = self._load_by_keyset()
+            mode = 'keyset'
+        else:
+            buffers, row_count, pages = self._load_by_range(total)
+            mode = 'range'
+
+        df = pd.DataFrame(buffers)
+        if self.order_column in df.columns:
+            # Pages complete out of order when fetched concurrently
+            df = df.sort_values(self.order_column, kind='stable').reset_index(drop=True)
+
+        elapsed = time.perf_counter() - start
+        self.stats = {
+            'table': self.table,
+            'mode': mode,
+            'rows': row_count,
+            'pages': pages,
+            'seconds': round(elapsed, 4),
+            'rows_per_sec': round(row_count / elapsed, 1) if elapsed > 0 else None
+        }
+        print(f"📥 Loaded {row_count} rows from {self.table} in {pages} {mode} pages "
+              f"({elapsed:.2f}s, {self.stats['rows_per_sec']} rows/sec)")
+        return df
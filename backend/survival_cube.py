@@ -0,0 +1,150 @@
+# survival_cube.py
+import time
+
+import numpy as np
+import pandas as pd
+
+# Bands used for the continuous columns (same bins as /api/regression/feature_analysis)
+AGE_BINS = [0, 12, 18, 35, 60, 100]
+AGE_LABELS = ['Child (0-12)', 'Teen (13-18)', 'Young Adult (19-35)', 'Adult (36-60)', 'Senior (60+)']
+FARE_BINS = [0, 10, 30, 100, 600]
+FARE_LABELS = ['Low (0-10)', 'Medium (10-30)', 'High (30-100)', 'Luxury (100+)']
+
+# Banded dimension -> (source column, bins, labels)
+BANDED_DIMENSIONS = {
+    'Age_group': ('Age', AGE_BINS, AGE_LABELS),
+    'Fare_group': ('Fare', FARE_BINS, FARE_LABELS),
+}
+
+CUBE_DIMENSIONS = ['Pclass', 'Sex', 'Embarked', 'Title', 'Age_group', 'Fare_group', 'FamilySize']
+
+CUBE_METRICS = ['count', 'survived', 'died', 'rate']
+
+
+def dimension_codes(df, name):
+    """Integer codes of ``df`` for dimension ``name`` and the label of each code.
+
+    Rows without a group (missing values, values outside the bands) get code -1.
+    """
+    if name in BANDED_DIMENSIONS:
+        column, bins, labels = BANDED_DIMENSIONS[name]
+        codes = pd.cut(df[column], bins=bins, labels=False)
+        return np.nan_to_num(codes, nan=-1).astype(np.int64), list(labels)
+
+    codes, uniques = pd.factorize(df[name], sort=True)
+    return codes.astype(np.int64), pd.Index(uniques).tolist()
+
+
+class SurvivalCube:
+    """Passenger counts and survivor sums for every combination of the cube dimensions.
+
+    Stored as dense arrays with one axis per dimension; each axis has an extra last slot
+    for rows without a group, so roll-ups over the other dimensions stay exact.
+    Any roll-up is a sum over the remaining axes and never touches the row-level frame.
+    ``counts`` holds every passenger, ``labelled`` only those whose Survived is known;
+    rates are survivors over labelled passengers, like groupby()['Survived'].mean().
+    """
+
+    def __init__(self, dimensions, labels, counts, survived, labelled):
+        self.dimensions = list(dimensions)
+        self.labels = labels
+        self.counts = counts
+        self.survived = survived
+        self.labelled = labelled
+        self.rows = int(counts.sum())
+
+    @classmethod
+    def from_frame(cls, df, dimensions=CUBE_DIMENSIONS):
+        start = time.perf_counter()
+        dimensions = [name for name in dimensions if name in df.columns or name in BANDED_DIMENSIONS]
+
+        labels = {}
+        codes = []
+        for name in dimensions:
+            dim_codes, dim_labels = dimension_codes(df, name)
+            # The missing group goes to the extra last slot
+            dim_codes[dim_codes < 0] = len(dim_labels)
+            codes.append(dim_codes)
+            labels[name] = dim_labels
+
+        shape = tuple(len(labels[name]) + 1 for name in dimensions)
+        cells = int(np.prod(shape))
+        flat = np.ravel_multi_index(codes, shape)
+        counts = np.bincount(flat, minlength=cells).astype(np.int32).reshape(shape)
+        # Rows without a Survived value (e.g. synced test passengers) count as passengers only
+        outcome = df['Survived'].to_numpy(dtype=np.float64)
+        known = ~np.isnan(outcome)
+        labelled = np.bincount(flat[known], minlength=cells).astype(np.int32).reshape(shape)
+        survived = np.bincount(
+            flat[known], weights=outcome[known], minlength=cells
+        ).astype(np.int32).reshape(shape)
+
+        cube = cls(dimensions, labels, counts, survived, labelled)
+        print(f"🧮 Survival cube built: {cells} cells over {len(dimensions)} dimensions "
+              f"({counts.nbytes + survived.nbytes + labelled.nbytes} bytes) in {time.perf_counter() - start:.3f}s")
+        return cube
+
+    def validate(self, by, metrics=()):
+        """Raise ValueError for unknown or repeated dimensions and unknown metrics"""
+        unknown = [name for name in by if name not in self.dimensions]
+        if unknown:
+            raise ValueError(f"Unknown dimensions {unknown}, expected some of {self.dimensions}")
+        if len(set(by)) != len(by):
+            raise ValueError("Each dimension may appear only once in 'by'")
+        unknown = [metric for metric in metrics if metric not in CUBE_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metrics {unknown}, expected some of {CUBE_METRICS}")
+
+    def rollup(self, by):
+        """(counts, survivor sums, labelled counts) per group of ``by``.
+
+        One axis per dimension of ``by``, in its order, with the missing-group slots dropped.
+        """
+        self.validate(by)
+
+        axes = tuple(i for i, name in enumerate(self.dimensions) if name not in by)
+        # Order the remaining axes as requested and drop the missing-group slots
+        kept = [name for name in self.dimensions if name in by]
+        order = [kept.index(name) for name in by]
+        valid = tuple(slice(0, len(self.labels[name])) for name in by)
+        return tuple(array.sum(axis=axes).transpose(order)[valid] for array in (self.counts, self.survived, self.labelled))
+
+    def aggregate(self, by, metrics=('rate',)):
+        """Records of the non-empty groups of ``by`` with the requested metrics"""
+        self.validate(by, metrics)
+        counts, survived, labelled = self.rollup(by)
+        groups = []
+        for index in zip(*np.nonzero(counts)):
+            record = {name: self.labels[name][i] for name, i in zip(by, index)}
+            survivors = int(survived[index])
+            known = int(labelled[index])
+            values = {
+                'count': int(counts[index]),
+                'survived': survivors,
+                'died': known - survivors,
+                'rate': survivors / known if known else None
+            }
+            record.update({metric: values[metric] for metric in metrics})
+            groups.append(record)
+        return groups
+
+    def rates(self, dimension):
+        """{label: survival rate} for one dimension, like groupby(dimension)['Survived'].mean()"""
+        _, survived, labelled = self.rollup([dimension])
+        return {
+            label: survived[i] / labelled[i]
+            for i, label in enumerate(self.labels[dimension]) if labelled[i]
+        }
+
+    def counts_by(self, dimension):
+        counts, _, _ = self.rollup([dimension])
+        return {label: int(counts[i]) for i, label in enumerate(self.labels[dimension])}
+
+    def info(self):
+        return {
+            'dimensions': {name: self.labels[name] for name in self.dimensions},
+            'cells': int(self.counts.size),
+            'rows': self.rows,
+            'bytes': int(self.counts.nbytes + self.survived.nbytes + self.labelled.nbytes),
+            'metrics': CUBE_METRICS
+        }
@@ -0,0 +1,84 @@
+# test_binning.py
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from binning import FEATURE_GROUPS, BinningIndex
+from data_cleaning import clean_titanic_data, compact_frame
+from survival_cube import BANDED_DIMENSIONS
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def cleaned_passengers():
+    return compact_frame(quiet(clean_titanic_data, pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+
+
+def with_unlabelled_rows(df, rows=60):
+    """``df`` with ``rows`` extra passengers whose Survived is unknown"""
+    extra = df.sample(rows, random_state=1).assign(Survived=np.nan)
+    return pd.concat([df.astype({'Survived': float}), extra], ignore_index=True)
+
+
+def grouping(df, feature):
+    group = FEATURE_GROUPS[feature]
+    if group in BANDED_DIMENSIONS:
+        column, bins, labels = BANDED_DIMENSIONS[group]
+        return pd.cut(df[column], bins=bins, labels=labels)
+    return df[group]
+
+
+@pytest.mark.parametrize('unlabelled', [False, True])
+def test_survival_by_group_matches_groupby(unlabelled):
+    df = cleaned_passengers()
+    if unlabelled:
+        df = with_unlabelled_rows(df)
+    index = quiet(BinningIndex.from_frame, df)
+
+    for feature in index.features:
+        expected = df.groupby(grouping(df, feature), observed=True)['Survived'].mean().to_dict()
+        assert index.survival_by_group(feature) == pytest.approx(expected), feature
+
+
+@pytest.mark.parametrize('unlabelled', [False, True])
+def test_mean_survival_matches_groupby(unlabelled):
+    df = cleaned_passengers()
+    if unlabelled:
+        df = with_unlabelled_rows(df)
+    index = quiet(BinningIndex.from_frame, df)
+
+    for feature in ('Age', 'Fare', 'SibSp', 'Parch', 'FamilySize'):
+        means = df.groupby('Survived')[feature].mean()
+        assert index.mean_survival(feature) == pytest.approx({'survived': means[1], 'died': means[0]}), feature
+
+
+def test_empty_bands_are_kept_when_not_observed():
+    df = cleaned_passengers()
+    df = df[df['Age'] > 18].reset_index(drop=True)
+    index = quiet(BinningIndex.from_frame, df)
+
+    observed = index.survival_by_group('Age')
+    everything = index.survival_by_group('Age', observed=False)
+    assert 'Child (0-12)' not in observed
+    assert np.isnan(everything['Child (0-12)'])
+    assert list(everything) == BANDED_DIMENSIONS['Age_group'][2]
+
+
+def test_frame_is_left_untouched():
+    df = cleaned_passengers()
+    before = df.copy()
+    quiet(BinningIndex.from_frame, df)
+    pdt.assert_frame_equal(df, before)
@@ -0,0 +1,81 @@
+# test_comoments.py
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from comoments import CoMomentAccumulator
+from data_cleaning import clean_titanic_data
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def numeric_passengers():
+    df = quiet(clean_titanic_data, pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv')))
+    return df.select_dtypes(include=[np.number])
+
+
+def with_missing_values(df, seed=0):
+    """``df`` as floats with about 10% of every column missing"""
+    df = df.astype(float)
+    rng = np.random.default_rng(seed)
+    return df.mask(rng.random(df.shape) < 0.1)
+
+
+def test_correlation_matches_pandas():
+    df = numeric_passengers()
+    acc = quiet(CoMomentAccumulator.from_frame, df)
+    pdt.assert_frame_equal(acc.correlation(), df.corr(), atol=1e-12, check_dtype=False)
+
+
+def test_correlation_with_missing_values_uses_pairwise_rows():
+    df = with_missing_values(numeric_passengers())
+    acc = quiet(CoMomentAccumulator.from_frame, df)
+    pdt.assert_frame_equal(acc.correlation(), df.corr(), atol=1e-12)
+
+
+@pytest.mark.parametrize('missing', [False, True])
+def test_merged_partitions_match_one_pass(missing):
+    df = numeric_passengers()
+    if missing:
+        df = with_missing_values(df)
+    columns = list(df.columns)
+    values = df.to_numpy(dtype=np.float64)
+
+    whole = CoMomentAccumulator.from_array(values, columns)
+    parts = [CoMomentAccumulator.from_array(values[lo:lo + 100], columns) for lo in range(0, len(values), 100)]
+    merged = CoMomentAccumulator.merge_all(parts)
+
+    for name in ('n', 'mean', 'm2', 'c'):
+        np.testing.assert_allclose(getattr(merged, name), getattr(whole, name), rtol=1e-9, atol=1e-6, err_msg=name)
+    # Merging leaves its inputs as they were
+    np.testing.assert_array_equal(parts[0].n, CoMomentAccumulator.from_array(values[:100], columns).n)
+
+
+def test_chunked_build_and_update_match_pandas():
+    df = with_missing_values(numeric_passengers())
+    chunked = quiet(CoMomentAccumulator.from_frame, df, chunk_rows=128, max_workers=3)
+    pdt.assert_frame_equal(chunked.correlation(), df.corr(), atol=1e-12)
+
+    updated = quiet(CoMomentAccumulator.from_frame, df.iloc[:700]).update(df.iloc[700:])
+    pdt.assert_frame_equal(updated.correlation(), df.corr(), atol=1e-12)
+
+
+def test_merging_different_columns_is_rejected():
+    df = numeric_passengers()
+    left = CoMomentAccumulator.from_array(df[['Age', 'Fare']].to_numpy(), ['Age', 'Fare'])
+    right = CoMomentAccumulator.from_array(df[['Fare', 'Age']].to_numpy(), ['Fare', 'Age'])
+    with pytest.raises(ValueError):
+        left.merge(right)
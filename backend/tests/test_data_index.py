@@ -0,0 +1,114 @@
+# test_data_index.py
+import contextlib
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning import clean_titanic_data, compact_frame
+from data_index import DataIndex, DataQuery
+from dataset_store import DatasetStore, DeltaSync
+from row_blocks import DataPages, decode_cursor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def cleaned_passengers():
+    return compact_frame(quiet(clean_titanic_data, pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))))
+
+
+def synced_with_unlabelled_row():
+    """Dataset after a delta sync adds one passenger without Survived"""
+    raw = pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))
+    raw.insert(0, 'id', np.arange(1, len(raw) + 1))
+    delta = raw.iloc[-1:].copy()
+    delta['id'] = len(raw) + 1
+    delta['PassengerId'] = len(raw) + 1
+    delta['Survived'] = np.nan
+    store = DatasetStore(quiet(clean_titanic_data, raw), watermark=len(raw), prepare=compact_frame)
+    quiet(DeltaSync(store, lambda watermark: delta[delta['id'] > watermark], clean_titanic_data, interval=0).sync_once)
+    return store.current().df
+
+
+def select(df, query_string):
+    index = quiet(DataIndex.from_frame, df)
+    return index.positions(DataQuery.parse(query_string, df.columns))
+
+
+def test_filters_match_pandas():
+    df = cleaned_passengers()
+    cases = {
+        'Sex=female': df['Sex'] == 'female',
+        'Pclass=1,2&Age>=18': df['Pclass'].isin([1, 2]) & (df['Age'] >= 18),
+        'Embarked!=S&Fare>50': (df['Embarked'] != 'S') & (df['Fare'] > 50),
+        'SibSp<2&Survived=1': (df['SibSp'] < 2) & (df['Survived'] == 1),
+        'PassengerId=3,5,7': df['PassengerId'].isin([3, 5, 7]),
+    }
+    for query_string, expected in cases.items():
+        np.testing.assert_array_equal(select(df, query_string), np.flatnonzero(expected), err_msg=query_string)
+
+
+def test_sort_and_search():
+    df = cleaned_passengers()
+    positions = select(df, 'Sex=female&sort=-Fare')
+    fares = df['Fare'].to_numpy()[positions]
+    assert len(positions) == (df['Sex'] == 'female').sum()
+    assert np.all(np.diff(fares) <= 0)
+
+    searched = df.iloc[select(df, 'q=mrs')]
+    assert len(searched) == (df['Title'] == 'Mrs').sum()
+
+
+def test_survived_filter_after_unlabelled_delta():
+    df = synced_with_unlabelled_row()
+    assert df['Survived'].isna().sum() == 1
+
+    survivors = np.flatnonzero(df['Survived'] == 1)
+    assert len(survivors) == 342
+    np.testing.assert_array_equal(select(df, 'Survived=1'), survivors)
+    np.testing.assert_array_equal(select(df, 'Survived=1.0'), survivors)
+    np.testing.assert_array_equal(select(df, 'Survived=0,1'), np.flatnonzero(df['Survived'].notna()))
+    assert len(select(df, 'Survived!=1')) == len(df) - len(survivors)
+
+
+def test_parameters_that_name_no_column_are_ignored():
+    df = cleaned_passengers()
+    query = DataQuery.parse('_=123&page=2&per_page=5&format=json&debug&Sex=female', df.columns)
+    assert query.filters == [('Sex', '=', 'female')]
+    assert not DataQuery.parse('_=1700000000000', df.columns)
+
+
+def test_bad_filters_are_rejected():
+    df = cleaned_passengers()
+    index = quiet(DataIndex.from_frame, df)
+    for query_string in ('Age>=old', 'Sex>1', 'Survived=yes'):
+        with pytest.raises(ValueError):
+            index.positions(DataQuery.parse(query_string, df.columns))
+    with pytest.raises(ValueError):
+        DataQuery.parse('Age', df.columns)
+
+
+def test_cursor_pages_walk_the_filtered_rows():
+    df = cleaned_passengers().sample(frac=1, random_state=0).reset_index(drop=True)
+    pages = quiet(DataPages.from_frame, df, lambda rows: [json.dumps(row).encode() for row in rows[['PassengerId']].to_dict('records')])
+    matches = quiet(DataIndex.from_frame, df).positions(DataQuery.parse('Pclass=1', df.columns), order_by='PassengerId')
+
+    seen, cursor = [], None
+    while True:
+        start, stop, cursor = pages.key_range(decode_cursor(cursor), 50, pages.position_keys[matches])
+        rows = json.loads(b'[' + pages.by_position.take(matches[start:stop]) + b']')
+        seen.extend(row['PassengerId'] for row in rows)
+        if cursor is None:
+            break
+    assert seen == sorted(df.loc[df['Pclass'] == 1, 'PassengerId'])
@@ -0,0 +1,64 @@
+# test_delta_sync.py
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from data_cleaning import clean_titanic_data, compact_frame
+from dataset_store import DatasetStore, DeltaSync
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def raw_passengers():
+    raw = pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))
+    raw.insert(0, 'id', np.arange(1, len(raw) + 1))
+    return raw
+
+
+def sync(base, delta):
+    store = DatasetStore(quiet(clean_titanic_data, base), watermark=int(base['id'].max()), prepare=compact_frame)
+    delta_sync = DeltaSync(store, lambda watermark: delta[delta['id'] > watermark], clean_titanic_data, interval=0)
+    quiet(delta_sync.sync_once)
+    return store.current().df
+
+
+def test_synced_delta_matches_full_clean():
+    raw = raw_passengers()
+    base, delta = raw.iloc[:800], raw.iloc[800:].copy()
+    # Missing values whose delta-only median/mode would differ from the base's
+    delta.loc[delta.index[:20], ['Age', 'Fare', 'Embarked']] = np.nan
+    delta.loc[delta.index[20:40], 'Embarked'] = 'Q'
+
+    synced = sync(base, delta)
+    fills = quiet(clean_titanic_data, base).attrs['fill_values']
+    expected = compact_frame(quiet(clean_titanic_data, pd.concat([base, delta]), fill_values=fills).reset_index(drop=True))
+
+    pdt.assert_frame_equal(synced, expected)
+    assert synced.attrs['fill_values'] == fills
+
+
+def test_one_row_delta_is_filled_from_the_dataset():
+    raw = raw_passengers()
+    base = raw.iloc[:-1]
+    delta = raw.iloc[-1:].copy()
+    delta[['Age', 'Fare', 'Embarked']] = np.nan
+
+    synced = sync(base, delta)
+    fills = quiet(clean_titanic_data, base).attrs['fill_values']
+    last = synced.iloc[-1]
+    assert last['Age'] == fills['Age']
+    assert last['Fare'] == fills['Fare']
+    assert last['Embarked'] == fills['Embarked']
+    assert synced[['Age', 'Fare', 'Embarked']].notna().all().all()
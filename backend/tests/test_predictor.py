@@ -0,0 +1,112 @@
+# test_predictor.py
+import contextlib
+import io
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning import clean_titanic_data
+from model_registry import prepare_features, train_survival_model
+from predictor import PASSENGER_DEFAULTS, SurvivalPredictor, passengers_frame, prepare_passengers
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+@pytest.fixture(scope='module')
+def cleaned():
+    return quiet(clean_titanic_data, pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv')))
+
+
+@pytest.fixture(scope='module')
+def predictor(cleaned):
+    return SurvivalPredictor(quiet(train_survival_model, cleaned))
+
+
+def error_of(passenger):
+    _, errors = prepare_passengers(pd.DataFrame.from_records([passenger]))
+    return errors.iloc[0]
+
+
+@pytest.mark.parametrize('passenger, message', [
+    ({'Pclass': 1}, "'Sex' is required"),
+    ({'Sex': 'male'}, "'Pclass' is required"),
+    ({'Sex': 'male', 'Pclass': 7}, "'Pclass' must be 1, 2 or 3, got 7"),
+    ({'Sex': 'male', 'Pclass': 1.5}, "'Pclass' must be 1, 2 or 3, got 1.5"),
+    ({'Sex': 'male', 'Pclass': True}, "'Pclass' must be a number, got True"),
+    ({'Sex': 'male', 'Pclass': 1, 'SibSp': False}, "'SibSp' must be a number, got False"),
+    ({'Sex': 'male', 'Pclass': 'first'}, "'Pclass' must be a non-negative number, got 'first'"),
+    ({'Sex': 'male', 'Pclass': 1, 'Age': -3}, "'Age' must be a non-negative number, got -3"),
+    ({'Sex': 'male', 'Pclass': 1, 'Age': 1e308}, "'Age' must be at most 120, got 1e+308"),
+    ({'Sex': 'male', 'Pclass': 1, 'Fare': float('inf')}, "'Fare' must be at most 10000, got inf"),
+])
+def test_invalid_passengers_are_flagged(passenger, message):
+    assert error_of(passenger) == message
+
+
+@pytest.mark.parametrize('passenger', [
+    {'Sex': 'male', 'Pclass': 3},
+    {'Sex': 'Female', 'Pclass': '2', 'Age': '30'},
+    {'Sex': 'female', 'Pclass': 1.0, 'Age': 0, 'Fare': 512.33, 'SibSp': 8, 'Parch': 6},
+])
+def test_valid_passengers_have_no_error(passenger):
+    assert pd.isna(error_of(passenger))
+
+
+def test_missing_and_null_fields_get_the_defaults():
+    passengers = [{'Sex': 'male', 'Pclass': 3}, {'Sex': 'male', 'Pclass': 3, 'Age': None, 'Fare': None, 'Embarked': None}]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FutureWarning)
+        frame, errors = prepare_passengers(pd.DataFrame.from_records(passengers))
+    assert errors.isna().all()
+    for field, default in PASSENGER_DEFAULTS.items():
+        assert (frame[field] == default).all(), field
+
+
+def test_titles_are_inferred_or_grouped():
+    frame, _ = prepare_passengers(pd.DataFrame.from_records([
+        {'Sex': 'male', 'Pclass': 1, 'Age': 8},
+        {'Sex': 'female', 'Pclass': 1, 'Age': 40},
+        {'Sex': 'male', 'Pclass': 1, 'Title': 'Dr'},
+        {'Sex': 'female', 'Pclass': 1, 'Title': 'Mlle'},
+    ]))
+    assert frame['Title'].tolist() == ['Master', 'Mrs', 'Officer', 'Miss']
+
+
+def test_first_invalid_passenger_is_named():
+    with pytest.raises(ValueError, match=r"^Passenger 1: 'Pclass' must be 1, 2 or 3, got 4$"):
+        passengers_frame([{'Sex': 'male', 'Pclass': 1}, {'Sex': 'male', 'Pclass': 4}, {'Pclass': 1}])
+
+
+def test_predictions_match_the_model(cleaned, predictor):
+    features, _ = prepare_features(cleaned, predictor.encoders)
+    expected = predictor.model.predict_proba(features[predictor.feature_columns])[:, 1]
+
+    frame, errors = prepare_passengers(cleaned)
+    assert errors.isna().all()
+    labels, probabilities = predictor.predict(frame)
+    np.testing.assert_allclose(probabilities, expected)
+    np.testing.assert_array_equal(labels, (expected > 0.5).astype(int))
+
+
+def test_score_rows_skips_invalid_rows(predictor):
+    frame, errors = prepare_passengers(pd.DataFrame.from_records([
+        {'Sex': 'female', 'Pclass': 1, 'Age': 30},
+        {'Sex': 'male', 'Pclass': 9},
+        {'Sex': 'male', 'Pclass': 3, 'Embarked': 'Z'},
+    ]))
+    labels, probabilities, errors = predictor.score_rows(frame, errors)
+    assert labels[1:].tolist() == [-1, -1]
+    assert np.isnan(probabilities[1:]).all()
+    assert 0 <= probabilities[0] <= 1
+    assert errors.iloc[2] == "unknown Embarked 'Z', expected one of C, Q, S"
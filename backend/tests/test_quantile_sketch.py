@@ -0,0 +1,118 @@
+# test_quantile_sketch.py
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantile_sketch import KLLSketch, SummarySketch, k_for_error, summary_mode
+
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def rank_errors(sketch, values):
+    """How far (as a fraction of n) each sketched quantile's rank is from its target"""
+    ordered = np.sort(values)
+    estimates = np.asarray(sketch.quantiles(QUANTILES))
+    low = np.searchsorted(ordered, estimates, side='left') / len(ordered)
+    high = np.searchsorted(ordered, estimates, side='right') / len(ordered)
+    # Any rank the estimate occupies (ties span a range) counts as hitting the target
+    return np.maximum(np.maximum(low - QUANTILES, QUANTILES - high), 0)
+
+
+@pytest.mark.parametrize('distribution', ['uniform', 'lognormal', 'few_values'])
+def test_rank_error_within_bound(distribution):
+    rng = np.random.default_rng(7)
+    values = {
+        'uniform': lambda: rng.random(200_000),
+        'lognormal': lambda: rng.lognormal(3, 1, 200_000),
+        'few_values': lambda: rng.integers(0, 5, 200_000).astype(float),
+    }[distribution]()
+    error = 0.01
+    sketch = KLLSketch(k_for_error(error)).update(values)
+
+    assert sketch.n == len(values)
+    assert rank_errors(sketch, values).max() <= error
+    # Memory stays O(k), far below the number of values
+    assert sketch.size() < 4 * k_for_error(error)
+
+
+def test_merged_and_updated_sketches_keep_the_bound():
+    rng = np.random.default_rng(11)
+    values = rng.normal(size=150_000)
+    error = 0.01
+    k = k_for_error(error)
+
+    merged = KLLSketch(k)
+    for part in np.array_split(values, 37):
+        merged = merged.merge(KLLSketch(k).update(part))
+    updated = KLLSketch(k)
+    for part in np.array_split(values, 37):
+        updated = updated.update(part)
+
+    for sketch in (merged, updated):
+        assert sketch.n == len(values)
+        assert rank_errors(sketch, values).max() <= error
+
+
+def test_sketches_are_not_modified_by_update_or_merge():
+    sketch = KLLSketch(64).update(np.arange(1000, dtype=float))
+    levels = [level.copy() for level in sketch.levels]
+    sketch.update(np.arange(5000, dtype=float))
+    sketch.merge(KLLSketch(64).update(np.arange(3000, dtype=float)))
+    assert sketch.n == 1000
+    assert all(np.array_equal(a, b) for a, b in zip(levels, sketch.levels))
+
+
+def test_summary_matches_describe():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'Age': np.where(rng.random(50_000) < 0.2, np.nan, rng.normal(30, 14, 50_000)),
+        'Fare': rng.lognormal(2.5, 1, 50_000),
+        'SibSp': rng.integers(0, 6, 50_000),
+    })
+    summary = quiet(SummarySketch.from_frame, df, error=0.01, chunk_rows=7_000)
+    exact = df.describe().to_dict()
+
+    described = summary.describe()
+    for column in df.columns:
+        for stat in ('count', 'mean', 'std', 'min', 'max'):
+            assert described[column][stat] == pytest.approx(exact[column][stat], rel=1e-9), (column, stat)
+        values = np.sort(df[column].dropna().to_numpy())
+        for stat, q in (('25%', 0.25), ('50%', 0.5), ('75%', 0.75)):
+            low = np.searchsorted(values, described[column][stat], side='left') / len(values)
+            high = np.searchsorted(values, described[column][stat], side='right') / len(values)
+            assert low - 0.01 <= q <= high + 0.01, (column, stat)
+
+
+def test_summary_update_matches_build():
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'Fare': rng.lognormal(2.5, 1, 20_000)})
+    built = quiet(SummarySketch.from_frame, df)
+    updated = quiet(SummarySketch.from_frame, df.iloc[:15_000]).update(df.iloc[15_000:])
+    for stat in ('count', 'mean', 'std', 'min', 'max'):
+        assert updated.describe()['Fare'][stat] == pytest.approx(built.describe()['Fare'][stat], rel=1e-9)
+
+
+def test_empty_column():
+    summary = quiet(SummarySketch.from_frame, pd.DataFrame({'Age': [np.nan, np.nan]}))
+    described = summary.describe()['Age']
+    assert described['count'] == 0
+    assert all(np.isnan(value) for stat, value in described.items() if stat != 'count')
+
+
+def test_summary_mode():
+    assert summary_mode(10, 'exact') == 'exact'
+    assert summary_mode(10, 'sketch') == 'sketch'
+    with pytest.raises(ValueError):
+        summary_mode(10, 'fast')
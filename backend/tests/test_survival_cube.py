@@ -0,0 +1,118 @@
+# test_survival_cube.py
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning import clean_titanic_data, compact_frame
+from dataset_store import DatasetStore, DeltaSync
+from survival_cube import AGE_BINS, AGE_LABELS, SurvivalCube
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def raw_passengers():
+    raw = pd.read_csv(os.path.join(BACKEND_DIR, 'train.csv'))
+    raw.insert(0, 'id', np.arange(1, len(raw) + 1))
+    return raw
+
+
+def synced_with_unlabelled_rows(rows=40):
+    """Dataset after a delta sync adds ``rows`` passengers without Survived"""
+    raw = raw_passengers()
+    delta = raw.sample(rows, random_state=0).copy()
+    delta['id'] = np.arange(len(raw) + 1, len(raw) + rows + 1)
+    delta['PassengerId'] = delta['id']
+    delta['Survived'] = np.nan
+    store = DatasetStore(quiet(clean_titanic_data, raw), watermark=len(raw), prepare=compact_frame)
+    quiet(DeltaSync(store, lambda watermark: delta[delta['id'] > watermark], clean_titanic_data, interval=0).sync_once)
+    return store.current().df
+
+
+def expected_groups(df, by):
+    """The cube's aggregate() records computed with pandas"""
+    df = df.assign(Age_group=pd.cut(df['Age'], bins=AGE_BINS, labels=AGE_LABELS))
+    grouped = df.groupby(by, observed=True)['Survived']
+    stats = pd.DataFrame({
+        'count': grouped.size(),
+        'survived': grouped.sum(),
+        'labelled': grouped.count(),
+    }).reset_index()
+    return {
+        tuple(row[name] for name in by): {
+            'count': int(row['count']),
+            'survived': int(row['survived']),
+            'died': int(row['labelled'] - row['survived']),
+            'rate': row['survived'] / row['labelled'] if row['labelled'] else None,
+        }
+        for _, row in stats.iterrows() if row['count']
+    }
+
+
+def check_against_pandas(df, by):
+    cube = quiet(SurvivalCube.from_frame, df)
+    groups = cube.aggregate(by, metrics=('count', 'survived', 'died', 'rate'))
+    actual = {tuple(group[name] for name in by): {m: group[m] for m in ('count', 'survived', 'died', 'rate')}
+              for group in groups}
+    expected = expected_groups(df, by)
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert actual[key]['count'] == values['count'], key
+        assert actual[key]['survived'] == values['survived'], key
+        assert actual[key]['died'] == values['died'], key
+        assert actual[key]['rate'] == pytest.approx(values['rate']), key
+
+
+@pytest.mark.parametrize('by', [['Sex'], ['Pclass', 'Sex'], ['Sex', 'Pclass'], ['Age_group', 'Embarked'], ['Title']])
+def test_aggregate_matches_groupby(by):
+    df = compact_frame(quiet(clean_titanic_data, raw_passengers()))
+    check_against_pandas(df, by)
+
+
+@pytest.mark.parametrize('by', [['Sex'], ['Pclass', 'Title'], ['Age_group']])
+def test_unlabelled_passengers_are_counted_but_not_rated(by):
+    df = synced_with_unlabelled_rows()
+    assert df['Survived'].isna().sum() == 40
+    check_against_pandas(df, by)
+
+
+def test_rates_and_counts_after_unlabelled_delta():
+    df = synced_with_unlabelled_rows()
+    cube = quiet(SurvivalCube.from_frame, df)
+    assert cube.rows == len(df)
+    assert cube.counts_by('Sex') == df['Sex'].value_counts().to_dict()
+    expected = df.groupby('Pclass')['Survived'].mean().to_dict()
+    assert cube.rates('Pclass') == pytest.approx(expected)
+
+
+def test_group_without_labels_has_no_rate():
+    df = compact_frame(quiet(clean_titanic_data, raw_passengers()))
+    df['Survived'] = df['Survived'].astype(float)
+    df.loc[df['Embarked'] == 'Q', 'Survived'] = np.nan
+    cube = quiet(SurvivalCube.from_frame, df)
+
+    queenstown = [group for group in cube.aggregate(['Embarked'], metrics=('count', 'died', 'rate'))
+                  if group['Embarked'] == 'Q']
+    assert queenstown == [{'Embarked': 'Q', 'count': int((df['Embarked'] == 'Q').sum()), 'died': 0, 'rate': None}]
+    assert 'Q' not in cube.rates('Embarked')
+
+
+def test_invalid_queries_are_rejected():
+    cube = quiet(SurvivalCube.from_frame, compact_frame(quiet(clean_titanic_data, raw_passengers())))
+    with pytest.raises(ValueError):
+        cube.aggregate(['Cabin'])
+    with pytest.raises(ValueError):
+        cube.aggregate(['Sex', 'Sex'])
+    with pytest.raises(ValueError):
+        cube.aggregate(['Sex'], metrics=('median',))
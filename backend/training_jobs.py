@@ -0,0 +1,214 @@
+# training_jobs.py
+import os
+import uuid
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from model_registry import ModelRegistry
+
+# Number of worker processes used for model training
+TRAINING_WORKERS = int(os.getenv('TRAINING_WORKERS', 1))
+# Start method of the training processes; spawn behaves the same on Linux, macOS and
+# Windows and does not fork the server's threads
+TRAINING_START_METHOD = os.getenv('TRAINING_START_METHOD', 'spawn')
+# Finished jobs kept for /api/training/jobs; older ones are dropped
+TRAINING_JOBS_KEPT = int(os.getenv('TRAINING_JOBS_KEPT', 100))
+
+TRAINING_PHASES = ['encode', 'cv', 'fit', 'evaluate']
+
+# How long a request waits for a model that is still being trained before answering 202
+MODEL_WAIT_SECONDS = float(os.getenv('MODEL_WAIT_SECONDS', 30))
+
+
+class ModelNotReady(Exception):
+    """The requested model is still being trained by a background job"""
+
+    def __init__(self, job):
+        super().__init__(f"Model is still training in job {job['job_id']}")
+        self.job = job
+
+
+def _run_training_job(job_id, cleaned_df, data_version, params, feature_columns, store_dir, events):
+    """Worker-process entry point: train, store the artifact and report phase events.
+
+    Spawned workers import this module by name, so it must stay free of import-time setup.
+    """
+    def progress(phase, event, seconds):
+        events.put((job_id, phase, event, seconds))
+
+    registry = ModelRegistry(store_dir)
+    artifact = registry.get_or_train(cleaned_df, data_version, params, feature_columns, force=True, progress=progress)
+    return {'key': artifact['key'], 'timings': artifact['timings']}
+
+
+class TrainingJobQueue:
+    """Runs model training in a process pool and tracks each job's progress"""
+
+    def __init__(self, registry, max_workers=TRAINING_WORKERS, start_method=TRAINING_START_METHOD,
+                 jobs_kept=TRAINING_JOBS_KEPT):
+        self.registry = registry
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.jobs_kept = jobs_kept
+        self.jobs = {}
+        self._done = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._events = None
+
+    def _ensure_started(self):
+        # The pool and the progress channel are only created once the first job arrives
+        if self._executor is not None:
+            return
+        context = multiprocessing.get_context(self.start_method)
+        self._manager = context.Manager()
+        self._events = self._manager.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        threading.Thread(target=self._consume_events, daemon=True).start()
+
+    def _consume_events(self):
+        while True:
+            try:
+                job_id, phase, event, seconds = self._events.get()
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                job = self.jobs.get(job_id)
+                # Late events for a job that already finished are ignored
+                if job is None or job['finished_at']:
+                    continue
+                if event == 'started':
+                    job['status'] = 'running'
+                    job['current_phase'] = phase
+                    job['started_at'] = job['started_at'] or datetime.now().isoformat()
+                else:
+                    job['phases'][phase] = seconds
+                    job['progress'] = round(len(job['phases']) / len(TRAINING_PHASES), 2)
+
+    def _active_job(self, key):
+        for job in self.jobs.values():
+            if job['model_key'] == key and job['finished_at'] is None:
+                return job['job_id']
+        return None
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond ``jobs_kept`` (called with the lock held)"""
+        finished = [job_id for job_id, job in self.jobs.items() if job['finished_at']]
+        for job_id in finished[:max(len(finished) - self.jobs_kept, 0)]:
+            del self.jobs[job_id]
+            del self._done[job_id]
+
+    def submit(self, cleaned_df, data_version, params=None, feature_columns=None):
+        """Queue a training job and return its id.
+
+        A job already queued or running for the same model is joined instead, so one
+        model is never fitted twice at once.
+        """
+        key = ModelRegistry.artifact_key(data_version, params, feature_columns)
+        with self._lock:
+            active = self._active_job(key)
+            if active is not None:
+                return active
+
+            self._ensure_started()
+            self._prune()
+            job_id = uuid.uuid4().hex[:12]
+            self._done[job_id] = threading.Event()
+            self.jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'model_key': key,
+                'data_version': data_version,
+                'params': params,
+                'features': feature_columns,
+                'current_phase': None,
+                'progress': 0.0,
+                'phases': {},
+                'submitted_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'model_version': None,
+                'error': None
+            }
+
+        future = self._executor.submit(
+            _run_training_job, job_id, cleaned_df, data_version, params, feature_columns,
+            self.registry.store_dir, self._events
+        )
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        print(f"🧵 Training job {job_id} queued")
+        return job_id
+
+    def _finish(self, job_id, future):
+        done = self._done[job_id]
+        try:
+            self._record_result(job_id, future)
+        finally:
+            done.set()
+
+    def _record_result(self, job_id, future):
+        with self._lock:
+            job = self.jobs[job_id]
+            job['finished_at'] = datetime.now().isoformat()
+            job['current_phase'] = None
+            try:
+                result = future.result()
+            except Exception as e:
+                job['status'] = 'failed'
+                job['error'] = str(e)
+                print(f"❌ Training job {job_id} failed: {e}")
+                return
+
+            # The worker wrote the artifact to disk; drop any stale copy held in this process
+            self.registry.evict(result['key'])
+            job['status'] = 'completed'
+            job['progress'] = 1.0
+            job['phases'] = result['timings']
+            job['model_version'] = result['key']
+            print(f"✅ Training job {job_id} completed: model {result['key']}")
+
+    def wait(self, job_id, timeout=None):
+        """Wait up to ``timeout`` seconds for a job to finish and return its state (None once pruned)"""
+        done = self._done.get(job_id)
+        if done is not None:
+            done.wait(timeout)
+        return self.get(job_id)
+
+    def get_or_submit(self, cleaned_df, data_version, params=None, feature_columns=None, timeout=MODEL_WAIT_SECONDS):
+        """Stored artifact of a model, trained by a background job when missing.
+
+        Joins the job already training it if there is one, and waits up to ``timeout``
+        seconds. Raises ModelNotReady while the job is still running and RuntimeError
+        when it failed; the model is never fitted on the caller's thread.
+        """
+        key = ModelRegistry.artifact_key(data_version, params, feature_columns)
+        artifact = self.registry.get(key)
+        if artifact is not None:
+            return artifact
+
+        job_id = self.submit(cleaned_df, data_version, params, feature_columns)
+        job = self.wait(job_id, timeout)
+        if job is not None and job['status'] == 'failed':
+            raise RuntimeError(f"Training job {job_id} failed: {job['error']}")
+        artifact = self.registry.get(key)
+        if artifact is None:
+            if job is None:
+                raise RuntimeError(f"Training job {job_id} finished without storing model {key}")
+            raise ModelNotReady(job)
+        return artifact
+
+    def get(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job, phases=dict(job['phases'])) if job else None
+
+    def list_jobs(self):
+        with self._lock:
+            return sorted(
+                (dict(job, phases=dict(job['phases'])) for job in self.jobs.values()),
+                key=lambda job: job['submitted_at'],
+                reverse=True
+            )
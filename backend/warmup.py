@@ -0,0 +1,74 @@
+# warmup.py
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 'eager' loads the dataset while the app module is imported (the previous behaviour),
+# 'background' lets the server bind right away and warms up in a thread
+STARTUP_MODE = os.getenv('STARTUP_MODE', 'eager')
+
+
+class WarmUp:
+    """Tracks the startup work (data load, copilot init) and whether the app is ready"""
+
+    def __init__(self):
+        self.status = 'starting'
+        self.error = None
+        self.phases = {}
+        self.started_at = None
+        self.ready_at = None
+        self._ready = threading.Event()
+        self._start = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        yield
+        self.phases[name] = round(time.perf_counter() - start, 4)
+        print(f"⏱️ Warm-up {name}: {self.phases[name]:.3f}s")
+
+    def run(self, target):
+        """Run ``target(self)`` and mark the app ready once it returns"""
+        self.status = 'warming_up'
+        self.started_at = datetime.now().isoformat()
+        self._start = time.perf_counter()
+        try:
+            target(self)
+        except Exception as e:
+            self.status = 'failed'
+            self.error = str(e)
+            print(f"❌ Warm-up failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+        self.status = 'ready'
+        self.ready_at = datetime.now().isoformat()
+        self.phases['total'] = round(time.perf_counter() - self._start, 4)
+        self._ready.set()
+        print(f"✅ App ready after {self.phases['total']:.3f}s of warm-up")
+
+    def start(self, target, background=True):
+        if not background:
+            self.run(target)
+            return
+        threading.Thread(target=self.run, args=(target,), daemon=True, name='warm-up').start()
+
+    def info(self):
+        return {
+            'status': self.status,
+            'ready': self.ready,
+            'mode': STARTUP_MODE,
+            'phases': dict(self.phases),
+            'started_at': self.started_at,
+            'ready_at': self.ready_at,
+            'error': self.error
+        }